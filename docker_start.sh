@@ -16,6 +16,16 @@ mountpoint=${SUBPATH:-/}
 # wait for required services
 ${SCRIPTPATH}/wait_for_db.sh
 
+# create the indexes of the list filters
+python -m src.create_indexes
+
+# track the changes of the tables for conditional requests
+python -m src.create_triggers
+
+# create the zaken read model when ZAKEN_PROJECTION is set, and drop its
+# triggers otherwise; `python -m src.backfill_projection` fills it
+python -m src.create_projection
+
 # Start server
 >&2 echo "Starting server"
 exec uvicorn src.main:app --host 0.0.0.0 --port "${UVICORN_PORT:-8000}" --workers "${UVICORN_WORKERS:-4}"
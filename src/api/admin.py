@@ -0,0 +1,101 @@
+import secrets
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, Response
+
+from src.core.config import settings
+from src.core.database import engine
+from src.core.pool import get_pool_metrics
+from src.core.profiling import ProfileFormat, profile_store
+from src.core.replicas import replica_set
+
+admin_router = APIRouter()
+
+
+def require_admin_token(x_admin_token: Annotated[str, Header()] = "") -> None:
+    """
+    Let requests through with the `X-Admin-Token` header set to `ADMIN_TOKEN`
+    only. Without one configured the admin routes are not found.
+    """
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not secrets.compare_digest(
+        x_admin_token.encode(), settings.ADMIN_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token"
+        )
+
+
+def require_profiling() -> None:
+    """
+    The profile routes are not found when no request is ever profiled.
+    """
+    if not settings.PROFILE_SAMPLE_RATE and not settings.PROFILE_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+
+@admin_router.get(
+    "/pool", name="pool-metrics", dependencies=[Depends(require_admin_token)]
+)
+async def pool_metrics() -> dict[str, Any]:
+    """
+    Connection pool metrics of the worker process answering the request, of
+    the primary and of every replica.
+    """
+    return {
+        **get_pool_metrics(engine.pool),
+        "replicas": [
+            {
+                "url": replica.engine.url.render_as_string(hide_password=True),
+                "healthy": replica.healthy,
+                "lag": replica.lag,
+                **get_pool_metrics(replica.engine.pool),
+            }
+            for replica in replica_set.replicas
+        ],
+    }
+
+
+@admin_router.get(
+    "/profiles",
+    name="profiles",
+    dependencies=[Depends(require_admin_token), Depends(require_profiling)],
+)
+async def profiles() -> list[dict[str, Any]]:
+    """
+    The request profiles kept by the worker process answering the request,
+    newest first.
+    """
+    return [profile.summary() for profile in profile_store.list()]
+
+
+@admin_router.get(
+    "/profiles/{profile_id}",
+    name="profile",
+    dependencies=[Depends(require_admin_token), Depends(require_profiling)],
+)
+async def profile(
+    profile_id: str, profile_format: ProfileFormat = Query("html", alias="format")
+) -> Response:
+    """
+    A request profile as an HTML page, or as a speedscope file to open in
+    https://www.speedscope.app.
+    """
+    stored = profile_store.get(profile_id)
+    if stored is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found"
+        )
+
+    content = await run_in_threadpool(stored.render, profile_format)
+    if profile_format == "html":
+        return HTMLResponse(content)
+    filename = f"{profile_id}.speedscope.json"
+    return Response(
+        content,
+        media_type="application/json",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
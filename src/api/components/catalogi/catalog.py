@@ -0,0 +1,126 @@
+import asyncio
+import logging
+from collections.abc import Iterable
+from typing import Any, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.components.catalogi.models.zaaktype import ZaakType
+from src.core.changes import change_listener
+from src.core.config import settings
+from src.core.database import async_session
+
+logger = logging.getLogger(__name__)
+
+
+class ZaakTypeCatalog:
+    """
+    In-memory copy of `catalogi_zaaktype`, indexed by id and UUID.
+
+    It is loaded by `start`, and reloaded in the background when the table
+    changes, when an unknown id is looked up and every `ttl` seconds. Zaaktypen
+    change rarely, so zaken resolve their `_zaaktype_id` here instead of
+    loading the zaaktype of every page.
+
+    Validators cannot await, so the ids of a page are passed to `ensure` before
+    it is validated: the ones missing from the catalog, created since the last
+    refresh or not loaded as the refresh failed, are loaded with one query on
+    the session of the request and added to the catalog.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.by_id: dict[int, ZaakType] = {}
+        self.by_uuid: dict[UUID, ZaakType] = {}
+        self.wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        change_listener.subscribe(self.request_refresh, tables=[ZaakType.__tablename__])
+
+    def request_refresh(self) -> None:
+        if self.wakeup is not None:
+            self.wakeup.set()
+
+    async def refresh(self) -> None:
+        async with async_session() as session:
+            result = await session.execute(select(ZaakType.id, ZaakType.uuid))
+            zaaktypen = [ZaakType(id=id, uuid=uuid) for id, uuid in result]
+        # replaced at once, so lookups never see a partial catalog
+        self.by_id = {zaaktype.id: zaaktype for zaaktype in zaaktypen}
+        self.by_uuid = {zaaktype.uuid: zaaktype for zaaktype in zaaktypen}
+
+    async def start(self) -> None:
+        self.wakeup = asyncio.Event()
+        try:
+            await self.refresh()
+        except Exception:
+            logger.exception("Cannot load %s", ZaakType.__tablename__)
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), self.ttl)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Cannot refresh %s", ZaakType.__tablename__)
+
+    def get(self, id: Optional[int]) -> Optional[ZaakType]:
+        if id is None:
+            return None
+        return self.by_id.get(id)
+
+    async def ensure(self, session: AsyncSession, ids: Iterable[Optional[int]]) -> None:
+        """
+        Load the zaaktypen of `ids` missing from the catalog. Ids without a
+        zaaktype, deleted or not visible to `session` yet, are left out.
+        """
+        missing = {id for id in ids if id is not None and id not in self.by_id}
+        if not missing:
+            return
+        result = await session.execute(
+            select(ZaakType.id, ZaakType.uuid).where(ZaakType.id.in_(missing))
+        )
+        for id, uuid in result:
+            zaaktype = ZaakType(id=id, uuid=uuid)
+            self.by_id[id] = zaaktype
+            self.by_uuid[uuid] = zaaktype
+        self.request_refresh()
+
+    def resolve(self, value: Any) -> Any:
+        """
+        Validator replacing a zaaktype id by its `ZaakType`.
+        """
+        if isinstance(value, int):
+            return self.get(value)
+        return value
+
+    async def get_by_uuid(
+        self, session: AsyncSession, uuid: UUID
+    ) -> Optional[ZaakType]:
+        zaaktype = self.by_uuid.get(uuid)
+        if zaaktype is None:
+            zaaktype = await session.scalar(
+                select(ZaakType).where(ZaakType.uuid == uuid)
+            )
+            if zaaktype is not None:
+                self.request_refresh()
+        return zaaktype
+
+
+zaaktype_catalog = ZaakTypeCatalog(settings.ZAAKTYPE_CATALOG_TTL)
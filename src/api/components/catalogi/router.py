@@ -1,12 +1,27 @@
 from typing import Any
+from uuid import UUID
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, status
 
-from src.core.deps import SessionDep
+from src.api.components.catalogi.catalog import zaaktype_catalog
+from src.api.components.catalogi.schemas import ZaakTypeSchema
+from src.core.admission import Admission
+from src.core.deps import ReadSessionDep
+from src.core.responses import PydanticResponse
 
 catalogi_router = APIRouter()
 
 
-@catalogi_router.get("/zaaktypen/{uuid}", name="zaaktype-detail")
-async def detail_zaaktype(uuid: str, session: SessionDep) -> Any:
-    return []
+@catalogi_router.get(
+    "/zaaktypen/{uuid}",
+    name="zaaktype-detail",
+    response_model=ZaakTypeSchema,
+    dependencies=[Depends(Admission("zaaktype-detail"))],
+)
+async def detail_zaaktype(uuid: UUID, session: ReadSessionDep) -> Any:
+    zaaktype = await zaaktype_catalog.get_by_uuid(session, uuid)
+    if zaaktype is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"ZaakType not found: {uuid}"
+        )
+    return PydanticResponse(ZaakTypeSchema.model_validate(zaaktype))
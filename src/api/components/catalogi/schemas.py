@@ -0,0 +1,20 @@
+from typing import Optional
+from uuid import UUID
+
+from pydantic import computed_field
+
+from src.api.fields import HyperlinkedRelatedField
+from src.api.mixins import BaseMixin
+
+ZAAKTYPE_URL_FIELD = HyperlinkedRelatedField(
+    view_name="zaaktype-detail", lookup_field="uuid"
+)
+
+
+class ZaakTypeSchema(BaseMixin):
+    uuid: UUID
+
+    @computed_field
+    @property
+    def url(self) -> Optional[str]:
+        return ZAAKTYPE_URL_FIELD.serialize_field(self)
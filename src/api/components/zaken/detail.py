@@ -0,0 +1,101 @@
+from collections.abc import Sequence
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import and_, any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.components.zaken.models.zaken import Zaak
+from src.api.components.zaken.projection import projection, render_query
+from src.api.components.zaken.queries import BASE_QUERY
+from src.api.geometry import DEFAULT_SRID, Geometry
+from src.core.cache import TTLCache
+from src.core.changes import change_listener
+from src.core.config import settings
+
+# rendered documents by (uuid, srid), see `src.api.components.zaken.projection`
+zaak_cache = TTLCache(maxsize=settings.ZAAK_CACHE_SIZE, ttl=settings.ZAAK_CACHE_TTL)
+change_listener.subscribe(zaak_cache.clear)
+
+
+def _uuid_in(uuids: Sequence[UUID]):
+    # one array parameter, so every number of UUIDs shares a prepared statement
+    return Zaak.uuid == any_(
+        bindparam("uuids", list(uuids), type_=ARRAY(Zaak.uuid.type))
+    )
+
+
+async def load_documents(
+    session: AsyncSession, uuids: Sequence[UUID], geometry: Geometry
+) -> dict[UUID, str]:
+    """
+    The rendered `ZaakSchema` of the zaken with `uuids` by UUID, looked up by
+    the index on `Zaak.uuid`. Unknown UUIDs are left out.
+
+    They are read from the projection when that is enabled and the documents
+    are fresh, and rendered with one query for the zaken and their children
+    otherwise.
+    """
+    documents = {}
+    if settings.ZAKEN_PROJECTION and geometry.srid == DEFAULT_SRID:
+        result = await session.execute(
+            select(Zaak.uuid, projection.c.document)
+            .join(
+                projection,
+                and_(
+                    projection.c.zaak_id == Zaak.identificatie_ptr_id,
+                    ~projection.c.stale,
+                ),
+            )
+            .where(_uuid_in(uuids))
+        )
+        documents.update(result.tuples().all())
+
+    missing = [uuid for uuid in uuids if uuid not in documents]
+    if missing:
+        documents.update(
+            await render_query(
+                session,
+                BASE_QUERY.where(_uuid_in(missing)),
+                len(missing),
+                geometry,
+                key="uuid",
+            )
+        )
+    return documents
+
+
+async def get_documents(
+    session: AsyncSession, uuids: Sequence[UUID], geometry: Geometry
+) -> dict[UUID, str]:
+    """
+    `load_documents` behind `zaak_cache`, which every write to the tables of the
+    API clears. The cache is bypassed while those writes cannot be noticed.
+    """
+    uuids = list(dict.fromkeys(uuids))
+    cacheable = change_listener.connected
+    documents = {}
+    if cacheable:
+        for uuid in uuids:
+            document = zaak_cache.get((uuid, geometry.srid))
+            if document is not None:
+                documents[uuid] = document
+
+    missing = [uuid for uuid in uuids if uuid not in documents]
+    if not missing:
+        return documents
+
+    version = zaak_cache.version
+    loaded = await load_documents(session, missing, geometry)
+    if cacheable and zaak_cache.version == version:
+        for uuid, document in loaded.items():
+            zaak_cache.set((uuid, geometry.srid), document)
+    return documents | loaded
+
+
+async def get_document(
+    session: AsyncSession, uuid: UUID, geometry: Geometry
+) -> Optional[str]:
+    documents = await get_documents(session, [uuid], geometry)
+    return documents.get(uuid)
@@ -0,0 +1,84 @@
+from functools import lru_cache
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from src.api.components.catalogi.schemas import ZaakTypeSchema
+from src.api.components.zaken.loaders import ensure_zaaktypen
+from src.api.components.zaken.models.zaken import (
+    Resultaat,
+    Rol,
+    Status,
+    Zaak,
+    ZaakEigenschap,
+    ZaakInformatieObject,
+    ZaakObject,
+)
+from src.api.components.zaken.queries import QUERY, with_geometry
+from src.api.components.zaken.schemas import (
+    ResultaatSchema,
+    RolSchema,
+    StatusSchema,
+    ZaakEigenschapSchema,
+    ZaakInformatieObjectSchema,
+    ZaakObjectSchema,
+    ZaakSchema,
+)
+from src.api.expand import Expansion
+from src.api.geometry import Geometry
+
+ZAAK_QUERY = QUERY.order_by(None)
+
+EXPANSIONS = {
+    # the zaken hold their zaaktype from the catalog
+    "zaaktype": Expansion("zaaktype", ZaakTypeSchema, None),
+    "hoofdzaak": Expansion(
+        "hoofdzaak", ZaakSchema, ZAAK_QUERY, prepare=ensure_zaaktypen
+    ),
+    "deelzaken": Expansion(
+        "deelzaken", ZaakSchema, ZAAK_QUERY, many=True, prepare=ensure_zaaktypen
+    ),
+    "rollen": Expansion("rollen", RolSchema, select(Rol), many=True),
+    "status": Expansion("current_status_uuid", StatusSchema, select(Status)),
+    "resultaat": Expansion(
+        "current_resultaat_uuid", ResultaatSchema, select(Resultaat)
+    ),
+    "eigenschappen": Expansion(
+        "eigenschappen",
+        ZaakEigenschapSchema,
+        select(ZaakEigenschap).options(
+            selectinload(ZaakEigenschap.zaak).load_only(Zaak.uuid)
+        ),
+        many=True,
+    ),
+    "zaakinformatieobjecten": Expansion(
+        "zaakinformatieobjecten",
+        ZaakInformatieObjectSchema,
+        select(ZaakInformatieObject),
+        many=True,
+    ),
+    "zaakobjecten": Expansion(
+        "zaakobjecten", ZaakObjectSchema, select(ZaakObject), many=True
+    ),
+}
+
+
+@lru_cache(maxsize=16)
+def get_zaak_query(geometry: Geometry):
+    return with_geometry(ZAAK_QUERY, geometry)
+
+
+def with_geometry_expansions(
+    expand: dict[str, Expansion], geometry: Geometry
+) -> dict[str, Expansion]:
+    """
+    `expand` with the expanded zaken rendered with `geometry`, like the listed
+    ones. The zaken expansions keep sharing one query, so they load in one batch.
+    """
+    query = get_zaak_query(geometry)
+    return {
+        name: expansion._replace(query=query)
+        if expansion.query is ZAAK_QUERY
+        else expansion
+        for name, expansion in expand.items()
+    }
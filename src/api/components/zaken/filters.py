@@ -0,0 +1,76 @@
+from datetime import date
+from typing import Optional
+from urllib.parse import urlparse
+from uuid import UUID
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import select
+
+from src.api.components.catalogi.models.zaaktype import ZaakType
+from src.api.components.zaken.models.constants import Archiefnominatie, Archiefstatus
+from src.api.components.zaken.models.identification import ZaakIdentificatie
+from src.api.components.zaken.models.zaken import Zaak
+
+
+def get_uuid_from_url(url: str, name: str) -> UUID:
+    try:
+        return UUID(urlparse(url).path.rstrip("/").rsplit("/", 1)[-1])
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid {name}: {url}",
+        )
+
+
+def get_filters(
+    startdatum__gte: Optional[date] = Query(None),
+    startdatum__lte: Optional[date] = Query(None),
+    archiefstatus: Optional[Archiefstatus] = Query(None),
+    archiefnominatie: Optional[Archiefnominatie] = Query(None),
+    archiefactiedatum__lt: Optional[date] = Query(None),
+    zaaktype: Optional[str] = Query(None),
+    bronorganisatie: Optional[str] = Query(None),
+    identificatie: Optional[str] = Query(None),
+) -> list:
+    """
+    Translate the Open Zaak filter parameters into WHERE clauses.
+
+    The clauses compare columns of `zaken_zaak` with constants, so they can be
+    answered from the indexes on `Zaak`: the zaaktype is resolved in a scalar
+    subquery that Postgres runs once before scanning, and the identification
+    filters become a semi-join on the primary key instead of a join in the
+    (count) query.
+    """
+    clauses = []
+    if startdatum__gte is not None:
+        clauses.append(Zaak.startdatum >= startdatum__gte)
+    if startdatum__lte is not None:
+        clauses.append(Zaak.startdatum <= startdatum__lte)
+    if archiefstatus is not None:
+        clauses.append(Zaak.archiefstatus == archiefstatus.value)
+    if archiefnominatie is not None:
+        clauses.append(Zaak.archiefnominatie == archiefnominatie.value)
+    if archiefactiedatum__lt is not None:
+        clauses.append(Zaak.archiefactiedatum < archiefactiedatum__lt)
+
+    if zaaktype:
+        zaaktype_uuid = get_uuid_from_url(zaaktype, "zaaktype")
+        clauses.append(
+            Zaak.zaaktype_id
+            == select(ZaakType.id)
+            .where(ZaakType.uuid == zaaktype_uuid)
+            .scalar_subquery()
+        )
+
+    identification = []
+    if bronorganisatie:
+        identification.append(ZaakIdentificatie.bronorganisatie == bronorganisatie)
+    if identificatie:
+        identification.append(ZaakIdentificatie.identificatie == identificatie)
+    if identification:
+        clauses.append(
+            Zaak.identificatie_ptr_id.in_(
+                select(ZaakIdentificatie.id).where(*identification)
+            )
+        )
+    return clauses
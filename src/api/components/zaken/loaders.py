@@ -0,0 +1,386 @@
+from collections.abc import Mapping, Sequence
+from enum import Enum
+from functools import cache
+from typing import Any, Optional
+from uuid import UUID
+
+from sqlalchemy import JSON, RowMapping, desc, func, inspect, literal_column, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql import Select
+
+from src.api.components.catalogi.catalog import zaaktype_catalog
+from src.api.components.zaken.models.identification import ZaakIdentificatie
+from src.api.components.zaken.models.zaken import (
+    RelevanteZaakRelatie,
+    Resultaat,
+    Rol,
+    Status,
+    Zaak,
+    ZaakEigenschap,
+    ZaakInformatieObject,
+    ZaakKenmerk,
+    ZaakObject,
+)
+from src.api.components.zaken.queries import (
+    GEOMETRY_COLUMN,
+    get_column_loader,
+    with_geometry,
+)
+from src.api.components.zaken.schemas import ZaakSchema
+from src.api.geometry import Geometry
+
+
+class LoadStrategy(str, Enum):
+    SELECTIN = "selectin"
+    AGGREGATED = "aggregated"
+    CORE = "core"
+    # served from `zaken_zaak_projection`, see `projection.py`
+    PROJECTION = "projection"
+
+
+def _array_agg(*args, **kwargs):
+    return func.coalesce(func.array_agg(*args, **kwargs), literal_column("'{}'"))
+
+
+def _json_agg(*args, **kwargs):
+    return func.coalesce(func.json_agg(*args, **kwargs), literal_column("'[]'"))
+
+
+def _child_uuids(model):
+    return (
+        select(_array_agg(aggregate_order_by(model.uuid, model.id)))
+        .where(model.zaak_id == Zaak.identificatie_ptr_id)
+        .scalar_subquery()
+    )
+
+
+def _first_uuid(model, *order_by):
+    return (
+        select(model.uuid)
+        .where(model.zaak_id == Zaak.identificatie_ptr_id)
+        .order_by(*order_by)
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+@cache
+def get_aggregates() -> tuple:
+    hoofdzaak = aliased(Zaak)
+    deelzaak = aliased(Zaak)
+    relevant_zaak = aliased(Zaak)
+
+    return (
+        _child_uuids(Rol).label("rollen"),
+        select(
+            _json_agg(
+                aggregate_order_by(
+                    func.json_build_object(
+                        "uuid", ZaakEigenschap.uuid, "zaak_uuid", Zaak.uuid
+                    ),
+                    ZaakEigenschap.id,
+                ),
+                type_=JSON,
+            )
+        )
+        .where(ZaakEigenschap.zaak_id == Zaak.identificatie_ptr_id)
+        .scalar_subquery()
+        .label("eigenschappen"),
+        _child_uuids(ZaakInformatieObject).label("zaakinformatieobjecten"),
+        _child_uuids(ZaakObject).label("zaakobjecten"),
+        _first_uuid(Status, desc(Status.datum_status_gezet)).label(
+            "current_status_uuid"
+        ),
+        _first_uuid(Resultaat, Resultaat.id).label("current_resultaat_uuid"),
+        select(hoofdzaak.uuid)
+        .where(hoofdzaak.identificatie_ptr_id == Zaak.hoofdzaak_id)
+        .scalar_subquery()
+        .label("hoofdzaak"),
+        select(
+            _array_agg(aggregate_order_by(deelzaak.uuid, deelzaak.identificatie_ptr_id))
+        )
+        .where(deelzaak.hoofdzaak_id == Zaak.identificatie_ptr_id)
+        .scalar_subquery()
+        .label("deelzaken"),
+        select(
+            _json_agg(
+                aggregate_order_by(
+                    func.json_build_object(
+                        "kenmerk", ZaakKenmerk.kenmerk, "bron", ZaakKenmerk.bron
+                    ),
+                    ZaakKenmerk.id,
+                ),
+                type_=JSON,
+            )
+        )
+        .where(ZaakKenmerk.zaak_id == Zaak.identificatie_ptr_id)
+        .scalar_subquery()
+        .label("kenmerken"),
+        select(
+            _json_agg(
+                aggregate_order_by(
+                    func.json_build_object(
+                        "aard_relatie",
+                        RelevanteZaakRelatie.aard_relatie,
+                        "overige_relatie",
+                        RelevanteZaakRelatie.overige_relatie,
+                        "toelichting",
+                        RelevanteZaakRelatie.toelichting,
+                        "relevant_zaak",
+                        relevant_zaak.uuid,
+                    ),
+                    RelevanteZaakRelatie.id,
+                ),
+                type_=JSON,
+            )
+        )
+        .select_from(RelevanteZaakRelatie)
+        .outerjoin(
+            relevant_zaak,
+            relevant_zaak.identificatie_ptr_id == RelevanteZaakRelatie.relevant_zaak_id,
+        )
+        .where(RelevanteZaakRelatie.zaak_id == Zaak.identificatie_ptr_id)
+        .scalar_subquery()
+        .label("relevante_andere_zaken"),
+    )
+
+
+def _page_subquery(query: Select, limit: int, offset: int):
+    return (
+        query.with_only_columns(Zaak.identificatie_ptr_id)
+        .limit(limit)
+        .offset(offset)
+        .subquery("page")
+    )
+
+
+def _select_aggregates(names: Optional[frozenset[str]]) -> list:
+    return [
+        aggregate
+        for aggregate in get_aggregates()
+        if names is None or aggregate.key in names
+    ]
+
+
+def build_aggregated_query(
+    query: Select,
+    limit: int,
+    offset: int,
+    names: Optional[frozenset[str]] = None,
+    geometry: Optional[Geometry] = None,
+) -> Select:
+    """
+    Build the statement loading one page of `query` with all of its children.
+
+    The page is selected in a subquery first, so the aggregates only run for
+    the rows of the page and not for the rows skipped by OFFSET. With `names`,
+    only the columns and children of those `ZaakSchema` fields are loaded.
+    """
+    page = _page_subquery(query, limit, offset)
+    query = query.add_columns(*_select_aggregates(names)).join(
+        page, page.c.identificatie_ptr_id == Zaak.identificatie_ptr_id
+    )
+    if names is not None:
+        query = query.options(get_column_loader(names))
+    if names is None or "zaak_identificatie" in names:
+        query = query.options(joinedload(Zaak.zaak_identificatie))
+    return with_geometry(query, geometry, names)
+
+
+def _zaak(uuid: Optional[UUID]) -> Optional[Zaak]:
+    return Zaak(uuid=uuid) if uuid else None
+
+
+def _children(model):
+    def build(uuids, zaak: Zaak) -> list:
+        return [model(uuid=uuid) for uuid in uuids or ()]
+
+    return build
+
+
+def _current(model):
+    def build(uuid: Optional[UUID], zaak: Zaak):
+        return model(uuid=uuid) if uuid else None
+
+    return build
+
+
+def _eigenschappen(eigenschappen, zaak: Zaak) -> list[ZaakEigenschap]:
+    children = [
+        ZaakEigenschap(uuid=UUID(eigenschap["uuid"]))
+        for eigenschap in eigenschappen or ()
+    ]
+    for eigenschap in children:
+        set_committed_value(eigenschap, "zaak", zaak)
+    return children
+
+
+def _hoofdzaak(uuid: Optional[UUID], zaak: Zaak) -> Optional[Zaak]:
+    return _zaak(uuid)
+
+
+def _deelzaken(uuids, zaak: Zaak) -> list[Zaak]:
+    return [_zaak(uuid) for uuid in uuids or ()]
+
+
+def _kenmerken(kenmerken, zaak: Zaak) -> list[ZaakKenmerk]:
+    return [ZaakKenmerk(**kenmerk) for kenmerk in kenmerken or ()]
+
+
+def _relevante_andere_zaken(relaties, zaak: Zaak) -> list[RelevanteZaakRelatie]:
+    return [
+        RelevanteZaakRelatie(
+            aard_relatie=relatie["aard_relatie"],
+            overige_relatie=relatie["overige_relatie"],
+            toelichting=relatie["toelichting"],
+            relevant_zaak=_zaak(
+                relatie["relevant_zaak"] and UUID(relatie["relevant_zaak"])
+            ),
+        )
+        for relatie in relaties or ()
+    ]
+
+
+# aggregate label: (relationship of `Zaak`, builder of its value)
+CHILDREN = {
+    "eigenschappen": ("eigenschappen", _eigenschappen),
+    "rollen": ("rollen", _children(Rol)),
+    "zaakinformatieobjecten": (
+        "zaakinformatieobjecten",
+        _children(ZaakInformatieObject),
+    ),
+    "zaakobjecten": ("zaakobjecten", _children(ZaakObject)),
+    "current_status_uuid": ("current_status", _current(Status)),
+    "current_resultaat_uuid": ("current_resultaat", _current(Resultaat)),
+    "hoofdzaak": ("hoofdzaak", _hoofdzaak),
+    "deelzaken": ("deelzaken", _deelzaken),
+    "kenmerken": ("kenmerken", _kenmerken),
+    "relevante_andere_zaken": ("relevante_andere_zaken", _relevante_andere_zaken),
+}
+
+
+def hydrate(row) -> Zaak:
+    """
+    Attach the aggregated children of `row` to its `Zaak`, without triggering
+    relationship loads or change events. Children that were not selected are
+    left unloaded.
+    """
+    zaak = row.Zaak
+    values = row._mapping
+    for key, (attribute, build) in CHILDREN.items():
+        if key in values:
+            set_committed_value(zaak, attribute, build(values[key], zaak))
+    return zaak
+
+
+def _zaaktype_id(zaak: Zaak | Mapping[str, Any]) -> Optional[int]:
+    # loaded values only: a deferred `zaaktype_id` is not serialized either
+    if isinstance(zaak, Mapping):
+        return zaak.get("zaaktype_id")
+    return vars(zaak).get("zaaktype_id")
+
+
+async def ensure_zaaktypen(
+    session: AsyncSession, zaken: Sequence[Zaak | Mapping[str, Any]]
+) -> Sequence[Zaak | Mapping[str, Any]]:
+    """
+    Load the zaaktypen of `zaken` missing from `zaaktype_catalog` before they
+    are validated, as `ZaakSchema` resolves their zaaktype there.
+    """
+    await zaaktype_catalog.ensure(session, {_zaaktype_id(zaak) for zaak in zaken})
+    return zaken
+
+
+async def load_aggregated(
+    session: AsyncSession,
+    query: Select,
+    limit: int,
+    offset: int,
+    names: Optional[frozenset[str]] = None,
+    geometry: Optional[Geometry] = None,
+) -> list[Zaak]:
+    result = await session.execute(
+        build_aggregated_query(query, limit, offset, names, geometry)
+    )
+    zaken = [hydrate(row) for row in result]
+    return await ensure_zaaktypen(session, zaken)
+
+
+@cache
+def get_columns() -> tuple:
+    """
+    The `Zaak` columns serialized by `ZaakSchema`.
+    """
+    return tuple(
+        attr.class_attribute
+        for attr in inspect(Zaak).column_attrs
+        if attr.key in ZaakSchema.model_fields
+    )
+
+
+def build_core_query(
+    query: Select,
+    limit: int,
+    offset: int,
+    names: Optional[frozenset[str]] = None,
+    geometry: Optional[Geometry] = None,
+) -> Select:
+    """
+    Like `build_aggregated_query`, but select only the serialized columns, so
+    rows come back as plain mappings without constructing ORM instances.
+
+    With `names`, only the columns and aggregates of those `ZaakSchema` fields
+    are selected.
+    """
+    page = _page_subquery(query, limit, offset)
+    columns = [
+        column for column in get_columns() if names is None or column.key in names
+    ]
+    if geometry is not None:
+        columns = [
+            geometry.select(GEOMETRY_COLUMN).label(column.key)
+            if column is Zaak.zaakgeometrie
+            else column
+            for column in columns
+        ]
+    columns.extend(_select_aggregates(names))
+    query = query.with_only_columns(*columns, maintain_column_froms=True).join(
+        page, page.c.identificatie_ptr_id == Zaak.identificatie_ptr_id
+    )
+
+    if names is None or "zaak_identificatie" in names:
+        query = query.add_columns(
+            func.json_build_object(
+                "identificatie",
+                ZaakIdentificatie.identificatie,
+                "bronorganisatie",
+                ZaakIdentificatie.bronorganisatie,
+                type_=JSON,
+            ).label("zaak_identificatie")
+        ).join(ZaakIdentificatie, ZaakIdentificatie.id == Zaak.identificatie_ptr_id)
+    if names is None or "zaaktype" in names:
+        query = query.add_columns(Zaak.zaaktype_id.label("zaaktype_id"))
+    return query
+
+
+async def load_rows(
+    session: AsyncSession,
+    query: Select,
+    limit: int,
+    offset: int,
+    names: Optional[frozenset[str]] = None,
+    geometry: Optional[Geometry] = None,
+) -> Sequence[RowMapping]:
+    result = await session.execute(
+        build_core_query(query, limit, offset, names, geometry)
+    )
+    return await ensure_zaaktypen(session, result.mappings().all())
+
+
+LOADERS = {
+    LoadStrategy.AGGREGATED: load_aggregated,
+    LoadStrategy.CORE: load_rows,
+}
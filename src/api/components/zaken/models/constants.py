@@ -16,3 +16,15 @@ class BetalingsIndicatie(str, Enum):
             self.GEHEEL: "De met de zaak gemoeide kosten zijn geheel betaald.",
         }
         return labels[self.value] if self.value in labels else ""
+
+
+class Archiefnominatie(str, Enum):
+    BLIJVEND_BEWAREN = "blijvend_bewaren"
+    VERNIETIGEN = "vernietigen"
+
+
+class Archiefstatus(str, Enum):
+    NOG_TE_ARCHIVEREN = "nog_te_archiveren"
+    GEARCHIVEERD = "gearchiveerd"
+    GEARCHIVEERD_PROCESTERMIJN_ONBEKEND = "gearchiveerd_procestermijn_onbekend"
+    OVERGEDRAGEN = "overgedragen"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Index, Integer, String
 
 from src.core.database import Base
 
@@ -8,3 +8,13 @@ class ZaakIdentificatie(Base):
     id = Column(Integer, primary_key=True)
     identificatie = Column(String(40))
     bronorganisatie = Column(String(9))
+
+    __table_args__ = (
+        Index(
+            "zaken_zaakidentificatie_identificatie_bronorganisatie_idx",
+            identificatie,
+            bronorganisatie,
+            info={"managed": True},
+            postgresql_concurrently=True,
+        ),
+    )
@@ -9,13 +9,18 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     Interval,
     String,
+    desc,
+    select,
 )
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import aliased, query_expression, relationship
 
+from src.api.components.catalogi.models.zaaktype import ZaakType
+from src.api.components.zaken.models.identification import ZaakIdentificatie
 from src.core.database import Base
 
 
@@ -26,7 +31,7 @@ class Zaak(Base):
         Integer, ForeignKey("zaken_zaakidentificatie.id"), primary_key=True
     )
 
-    zaak_identificatie = relationship("ZaakIdentificatie", backref="zaak")
+    zaak_identificatie = relationship(ZaakIdentificatie, backref="zaak")
 
     uuid = Column(UUID(as_uuid=True), default=uuid4, index=True, nullable=False)
 
@@ -48,7 +53,7 @@ class Zaak(Base):
         ForeignKey("catalogi_zaaktype.id"),
         name="_zaaktype_id",
     )
-    zaaktype = relationship("ZaakType")
+    zaaktype = relationship(ZaakType)
 
     rollen = relationship("Rol", back_populates="zaak")
     eigenschappen = relationship("ZaakEigenschap", back_populates="zaak")
@@ -78,7 +83,15 @@ class Zaak(Base):
     vertrouwelijkheidaanduiding = Column(String, nullable=True)
     betalingsindicatie = Column(String, nullable=True, default=None)
     laatste_betaaldatum = Column(DateTime, nullable=True)
-    zaakgeometrie = Column(Geometry(geometry_type="GEOMETRY", srid=4326), nullable=True)
+    # selected as is unless replaced with `with_expression`, e.g. to be
+    # transformed or rendered as GeoJSON by the database
+    zaakgeometrie = query_expression(
+        default_expr=Column(
+            "zaakgeometrie",
+            Geometry(geometry_type="GEOMETRY", srid=4326),
+            nullable=True,
+        )
+    )
     verlenging_reden = Column(String(200), nullable=True)
     verlenging_duur = Column(Interval, nullable=True)
     opschorting_indicatie = Column(Boolean, default=False, nullable=False)
@@ -100,16 +113,49 @@ class Zaak(Base):
     communicatiekanaal_naam = Column(String(250), nullable=True)
     created_on = Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    # composite indexes for the list filters, each ending in the primary key, so
+    # a filtered page in the default ordering is read in index order
+    __table_args__ = (
+        Index(
+            "zaken_zaak_startdatum_id_idx",
+            startdatum,
+            identificatie_ptr_id,
+            info={"managed": True},
+            postgresql_concurrently=True,
+        ),
+        Index(
+            "zaken_zaak_archiefstatus_id_idx",
+            archiefstatus,
+            identificatie_ptr_id,
+            info={"managed": True},
+            postgresql_concurrently=True,
+        ),
+        Index(
+            "zaken_zaak_archiefnominatie_archiefactiedatum_idx",
+            archiefnominatie,
+            archiefactiedatum,
+            info={"managed": True},
+            postgresql_concurrently=True,
+        ),
+        Index(
+            "zaken_zaak_zaaktype_id_idx",
+            zaaktype_id,
+            identificatie_ptr_id,
+            info={"managed": True},
+            postgresql_concurrently=True,
+        ),
+    )
+
     @property
     def current_status_uuid(self):
-        if self.status:
-            return self.status[0].uuid
+        if self.current_status:
+            return self.current_status.uuid
         return None
 
     @property
     def current_resultaat_uuid(self):
-        if self.resultaat:
-            return self.resultaat[0].uuid
+        if self.current_resultaat:
+            return self.current_resultaat.uuid
         return None
 
 
@@ -189,6 +235,16 @@ class Status(Base):
 
     datum_status_gezet = Column(DateTime, nullable=True, index=True)
 
+    __table_args__ = (
+        Index(
+            "zaken_status_zaak_id_datum_status_gezet_idx",
+            zaak_id,
+            datum_status_gezet.desc(),
+            info={"managed": True},
+            postgresql_concurrently=True,
+        ),
+    )
+
 
 class RelevanteZaakRelatie(Base):
     __tablename__ = "zaken_relevantezaakrelatie"
@@ -211,3 +267,30 @@ class RelevanteZaakRelatie(Base):
     aard_relatie = Column(String(20))
     overige_relatie = Column(String(100))
     toelichting = Column(String(255))
+
+
+def latest(model, *order_by):
+    """
+    `model` reduced to the first row per zaak in `order_by`, with
+    `DISTINCT ON (zaak_id)`.
+    """
+    rows = select(model).distinct(model.zaak_id).order_by(model.zaak_id, *order_by)
+    return aliased(model, rows.subquery(), name=f"latest_{model.__tablename__}")
+
+
+# the current status and resultaat, without loading the history of the zaak
+latest_status = latest(Status, desc(Status.datum_status_gezet))
+Zaak.current_status = relationship(
+    latest_status,
+    primaryjoin=latest_status.zaak_id == Zaak.identificatie_ptr_id,
+    uselist=False,
+    viewonly=True,
+)
+
+latest_resultaat = latest(Resultaat, Resultaat.id)
+Zaak.current_resultaat = relationship(
+    latest_resultaat,
+    primaryjoin=latest_resultaat.zaak_id == Zaak.identificatie_ptr_id,
+    uselist=False,
+    viewonly=True,
+)
@@ -0,0 +1,33 @@
+from typing import Optional
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import asc, desc
+
+from src.api.components.zaken.models.zaken import Zaak
+
+ORDERING_FIELDS = {
+    "startdatum": Zaak.startdatum,
+    "registratiedatum": Zaak.registratiedatum,
+}
+
+
+def get_ordering(ordering: Optional[str] = Query(None)) -> list:
+    """
+    Translate the `ordering` query parameter into ORDER BY clauses.
+
+    The primary key is always appended as a tie-breaker, so the ordering is
+    total and can be used as a keyset for cursor pagination.
+    """
+    clauses = []
+    for name in filter(None, (ordering or "").split(",")):
+        direction = desc if name.startswith("-") else asc
+        column = ORDERING_FIELDS.get(name.lstrip("-"))
+        if column is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid ordering field: {name}",
+            )
+        clauses.append(direction(column))
+
+    clauses.append(desc(Zaak.identificatie_ptr_id))
+    return clauses
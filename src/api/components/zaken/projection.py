@@ -0,0 +1,419 @@
+import asyncio
+import json
+import logging
+from collections.abc import Sequence
+from typing import Any, Optional
+
+from fastapi import Response
+from fastapi_pagination.api import create_page, resolve_params
+from sqlalchemy import (
+    Boolean,
+    Column,
+    ForeignKey,
+    Index,
+    Integer,
+    Table,
+    Text,
+    and_,
+    bindparam,
+    select,
+    text,
+    true,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.expression import TextClause
+from starlette.requests import Request
+
+from src.api.components.catalogi.models.zaaktype import ZaakType
+from src.api.components.zaken.loaders import load_aggregated
+from src.api.components.zaken.models.identification import ZaakIdentificatie
+from src.api.components.zaken.models.zaken import (
+    RelevanteZaakRelatie,
+    Resultaat,
+    Rol,
+    Status,
+    Zaak,
+    ZaakEigenschap,
+    ZaakInformatieObject,
+    ZaakKenmerk,
+    ZaakObject,
+)
+from src.api.components.zaken.queries import BASE_QUERY
+from src.api.components.zaken.schemas import ZaakSchema
+from src.api.geometry import DEFAULT_SRID, Geometry, GeometryRendering
+from src.api.urls import get_base_url
+from src.core.changes import change_listener
+from src.core.config import settings
+from src.core.counting import CountMode, count
+from src.core.database import Base, async_session
+from src.core.middleware import request_contextvar
+from src.core.responses import PydanticResponse
+
+logger = logging.getLogger(__name__)
+
+# the rendered `ZaakSchema` of every zaak, with `stale` set by the triggers of
+# `get_projection_ddl` when its rows change
+projection = Table(
+    "zaken_zaak_projection",
+    Base.metadata,
+    Column(
+        "zaak_id",
+        Integer,
+        ForeignKey("zaken_zaak.identificatie_ptr_id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column("document", Text, nullable=True),
+    Column("stale", Boolean, nullable=False, server_default=true()),
+    Index(
+        "zaken_zaak_projection_stale_idx",
+        "zaak_id",
+        postgresql_where=text("stale"),
+    ),
+    info={"track_changes": False},
+)
+
+# the columns referring to the zaken whose document includes a row of the table
+PROJECTION_SOURCES = {
+    Zaak.__table__: (Zaak.identificatie_ptr_id, Zaak.hoofdzaak_id),
+    ZaakIdentificatie.__table__: (ZaakIdentificatie.id,),
+    Rol.__table__: (Rol.zaak_id,),
+    ZaakEigenschap.__table__: (ZaakEigenschap.zaak_id,),
+    ZaakInformatieObject.__table__: (ZaakInformatieObject.zaak_id,),
+    ZaakObject.__table__: (ZaakObject.zaak_id,),
+    ZaakKenmerk.__table__: (ZaakKenmerk.zaak_id,),
+    Resultaat.__table__: (Resultaat.zaak_id,),
+    Status.__table__: (Status.zaak_id,),
+    RelevanteZaakRelatie.__table__: (RelevanteZaakRelatie.zaak_id,),
+}
+
+# the base URL documents are rendered with: Postgres text cannot contain NUL, so
+# a JSON string starting with its escape `"\u0000` can only be a hyperlink
+URL_MARKER = "\x00"
+ESCAPED_URL_MARKER = '"\\u0000'
+
+DOCUMENT_GEOMETRY = Geometry(GeometryRendering.DATABASE, DEFAULT_SRID)
+
+
+def get_projection_trigger(table: Table) -> str:
+    return f"{table.name}_projection"
+
+
+def get_projection_ddl() -> list[TextClause]:
+    """
+    The statements creating the triggers that mark the documents of the zaken
+    changed by a write as stale, in the writing transaction.
+
+    Zaken without a document yet get a stale row, so the projector renders them.
+    """
+    statements = [
+        text(
+            f"""
+            CREATE OR REPLACE FUNCTION {projection.name}_stale() RETURNS trigger AS $$
+            DECLARE
+                zaak_ids integer[] := '{{}}';
+                column_name text;
+            BEGIN
+                FOREACH column_name IN ARRAY TG_ARGV LOOP
+                    IF TG_OP <> 'DELETE' THEN
+                        zaak_ids := zaak_ids || (to_jsonb(NEW) ->> column_name)::integer;
+                    END IF;
+                    IF TG_OP <> 'INSERT' THEN
+                        zaak_ids := zaak_ids || (to_jsonb(OLD) ->> column_name)::integer;
+                    END IF;
+                END LOOP;
+                INSERT INTO {projection.name} (zaak_id)
+                SELECT identificatie_ptr_id FROM {Zaak.__tablename__}
+                WHERE identificatie_ptr_id = ANY(zaak_ids)
+                ON CONFLICT (zaak_id) DO UPDATE SET stale = true
+                WHERE NOT {projection.name}.stale;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+            """
+        ),
+        # zaken render the UUID of their zaaktype
+        text(
+            f"""
+            CREATE OR REPLACE FUNCTION {projection.name}_zaaktype_stale()
+            RETURNS trigger AS $$
+            BEGIN
+                UPDATE {projection.name} SET stale = true
+                FROM {Zaak.__tablename__}
+                WHERE {Zaak.__tablename__}.identificatie_ptr_id = {projection.name}.zaak_id
+                AND {Zaak.__tablename__}.{Zaak.zaaktype_id.name} = NEW.id
+                AND NOT {projection.name}.stale;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+            """
+        ),
+    ]
+    for table, columns in PROJECTION_SOURCES.items():
+        trigger = get_projection_trigger(table)
+        arguments = ", ".join(f"'{column.name}'" for column in columns)
+        statements += [
+            text(f"DROP TRIGGER IF EXISTS {trigger} ON {table.name}"),
+            text(
+                f"CREATE TRIGGER {trigger} "
+                f"AFTER INSERT OR UPDATE OR DELETE ON {table.name} FOR EACH ROW "
+                f"EXECUTE FUNCTION {projection.name}_stale({arguments})"
+            ),
+        ]
+
+    trigger = get_projection_trigger(ZaakType.__table__)
+    statements += [
+        text(f"DROP TRIGGER IF EXISTS {trigger} ON {ZaakType.__tablename__}"),
+        text(
+            f"CREATE TRIGGER {trigger} "
+            f"AFTER UPDATE OF uuid ON {ZaakType.__tablename__} FOR EACH ROW "
+            f"WHEN (OLD.uuid IS DISTINCT FROM NEW.uuid) "
+            f"EXECUTE FUNCTION {projection.name}_zaaktype_stale()"
+        ),
+    ]
+    return statements
+
+
+def get_projection_drop_ddl() -> list[TextClause]:
+    """
+    The statements dropping the triggers of `get_projection_ddl`, so writes stop
+    marking documents stale once the projection is disabled.
+    """
+    return [
+        text(f"DROP TRIGGER IF EXISTS {get_projection_trigger(table)} ON {table.name}")
+        for table in (*PROJECTION_SOURCES, ZaakType.__table__)
+    ]
+
+
+def _document_request() -> Request:
+    request = Request({"type": "http", "headers": [], "state": {}})
+    request.state.url_base = URL_MARKER
+    return request
+
+
+async def render_query(
+    session: AsyncSession,
+    query: Select,
+    limit: int,
+    geometry: Geometry = DOCUMENT_GEOMETRY,
+    key: str = "identificatie_ptr_id",
+) -> dict[Any, str]:
+    """
+    Render the `ZaakSchema` of the first `limit` zaken of `query` by their `key`
+    attribute, with the hyperlinks relative to `URL_MARKER`.
+    """
+    zaken = await load_aggregated(session, query, limit, 0, geometry=geometry)
+
+    serializer = ZaakSchema.__pydantic_serializer__
+    token = request_contextvar.set(_document_request())
+    try:
+        return {
+            getattr(zaak, key): serializer.to_json(
+                ZaakSchema.model_validate(zaak), by_alias=True
+            ).decode()
+            for zaak in zaken
+        }
+    finally:
+        request_contextvar.reset(token)
+
+
+async def render_documents(
+    session: AsyncSession, zaak_ids: Sequence[int]
+) -> dict[int, str]:
+    if not zaak_ids:
+        return {}
+    return await render_query(
+        session,
+        BASE_QUERY.where(Zaak.identificatie_ptr_id.in_(zaak_ids)),
+        len(zaak_ids),
+    )
+
+
+def with_base_url(documents: str) -> str:
+    """
+    Prefix the hyperlinks of rendered `documents` with the base URL of the
+    request.
+    """
+    base_url = get_base_url(request_contextvar.get()) or ""
+    return documents.replace(
+        ESCAPED_URL_MARKER, '"' + json.dumps(base_url, ensure_ascii=False)[1:-1]
+    )
+
+
+async def write_documents(session: AsyncSession, zaak_ids: Sequence[int]) -> int:
+    """
+    Render and store the documents of `zaak_ids`, whose projection rows must be
+    locked by the transaction of `session`: a write to a zaak while it is being
+    rendered then waits, and marks the new document stale after the commit.
+    """
+    documents = await render_documents(session, zaak_ids)
+    if documents:
+        await session.execute(
+            update(projection)
+            .where(projection.c.zaak_id == bindparam("b_zaak_id"))
+            .values(document=bindparam("b_document"), stale=False),
+            [
+                {"b_zaak_id": zaak_id, "b_document": document}
+                for zaak_id, document in documents.items()
+            ],
+        )
+    return len(documents)
+
+
+async def refresh(session: AsyncSession, zaak_ids: Sequence[int]) -> int:
+    """
+    Render the documents of `zaak_ids`, creating their projection rows if needed.
+    """
+    await session.execute(
+        insert(projection)
+        .from_select(
+            ["zaak_id"],
+            select(Zaak.identificatie_ptr_id).where(
+                Zaak.identificatie_ptr_id.in_(zaak_ids)
+            ),
+        )
+        .on_conflict_do_nothing()
+    )
+    locked = await session.scalars(
+        select(projection.c.zaak_id)
+        .where(projection.c.zaak_id.in_(zaak_ids))
+        .order_by(projection.c.zaak_id)
+        .with_for_update()
+    )
+    written = await write_documents(session, locked.all())
+    await session.commit()
+    return written
+
+
+async def refresh_stale(session: AsyncSession, limit: int) -> int:
+    """
+    Render up to `limit` stale documents that no other projector is rendering.
+    """
+    locked = await session.scalars(
+        select(projection.c.zaak_id)
+        .where(projection.c.stale)
+        .order_by(projection.c.zaak_id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    zaak_ids = locked.all()
+    await write_documents(session, zaak_ids)
+    await session.commit()
+    return len(zaak_ids)
+
+
+class Projector:
+    """
+    Renders the stale documents in batches whenever the tables of the API
+    change, see `src.core.changes.ChangeListener`, and every `interval` seconds
+    in case a notification was missed.
+
+    Every uvicorn worker runs one, the row locks keep them from rendering the
+    same documents.
+    """
+
+    def __init__(self, batch_size: int, interval: float = 60):
+        self.batch_size = batch_size
+        self.interval = interval
+        self.wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        change_listener.subscribe(self.request_refresh)
+
+    def request_refresh(self) -> None:
+        if self.wakeup is not None:
+            self.wakeup.set()
+
+    async def start(self) -> None:
+        self.wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def run(self) -> None:
+        while True:
+            self.wakeup.clear()
+            try:
+                async with async_session() as session:
+                    while await refresh_stale(session, self.batch_size):
+                        pass
+            except Exception:
+                logger.exception("Cannot refresh %s", projection.name)
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+projector = Projector(settings.PROJECTION_BATCH_SIZE)
+
+
+async def load_documents(
+    session: AsyncSession, query: Select, limit: int, offset: int
+) -> list[str]:
+    """
+    The documents of one page of `query`, rendering the stale ones in place.
+    """
+    rows = await session.execute(
+        query.with_only_columns(
+            Zaak.identificatie_ptr_id,
+            projection.c.document,
+            maintain_column_froms=True,
+        )
+        .outerjoin(
+            projection,
+            and_(
+                projection.c.zaak_id == Zaak.identificatie_ptr_id,
+                ~projection.c.stale,
+            ),
+        )
+        .limit(limit)
+        .offset(offset)
+    )
+    rows = rows.all()
+
+    rendered = await render_documents(
+        session, [zaak_id for zaak_id, document in rows if document is None]
+    )
+    documents = (document or rendered.get(zaak_id) for zaak_id, document in rows)
+    # zaken deleted since the page was read are left out
+    return [document for document in documents if document is not None]
+
+
+async def paginate_projection(
+    session: AsyncSession, query: Select, count_mode: CountMode
+) -> tuple[Any, list[str]]:
+    """
+    Like `src.core.pagination.paginate`, but return the page without items and
+    the documents of its items separately.
+    """
+    params = resolve_params()
+    total = await count(session, query, count_mode)
+    raw_params = params.to_raw_params().as_limit_offset()
+    documents = await load_documents(
+        session, query, raw_params.limit, raw_params.offset
+    )
+    return create_page([], params=params, count=total), documents
+
+
+def projection_response(
+    page: Any, documents: list[str], headers: Optional[Any] = None
+) -> Response:
+    """
+    Render `page` with `documents` as its results, prefixed with the base URL of
+    the request.
+    """
+    results = with_base_url(",".join(documents))
+    body = PydanticResponse(page).body.replace(
+        b'"results":[]', b'"results":[' + results.encode() + b"]", 1
+    )
+    return Response(body, media_type="application/json", headers=headers)
@@ -0,0 +1,108 @@
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import desc, inspect, select
+from sqlalchemy.orm import (
+    MappedSQLExpression,
+    joinedload,
+    load_only,
+    selectinload,
+    with_expression,
+)
+from sqlalchemy.sql import Select
+
+from src.api.components.zaken.models.zaken import (
+    RelevanteZaakRelatie,
+    Rol,
+    Zaak,
+    ZaakEigenschap,
+    ZaakInformatieObject,
+    ZaakObject,
+    latest_resultaat,
+    latest_status,
+)
+from src.api.geometry import Geometry
+
+BASE_QUERY = select(Zaak).order_by(desc(Zaak.identificatie_ptr_id))
+
+# eager loads needed to serialize each `ZaakSchema` field
+LOADER_OPTIONS = {
+    "zaak_identificatie": joinedload(Zaak.zaak_identificatie),
+    "kenmerken": selectinload(Zaak.kenmerken),
+    "rollen": selectinload(Zaak.rollen).load_only(Rol.uuid),
+    "eigenschappen": selectinload(Zaak.eigenschappen).selectinload(ZaakEigenschap.zaak),
+    "current_status_uuid": selectinload(Zaak.current_status).load_only(
+        latest_status.uuid
+    ),
+    "relevante_andere_zaken": selectinload(Zaak.relevante_andere_zaken)
+    .selectinload(RelevanteZaakRelatie.relevant_zaak)
+    .load_only(Zaak.uuid),
+    "zaakinformatieobjecten": selectinload(Zaak.zaakinformatieobjecten).load_only(
+        ZaakInformatieObject.uuid
+    ),
+    "zaakobjecten": selectinload(Zaak.zaakobjecten).load_only(ZaakObject.uuid),
+    "current_resultaat_uuid": selectinload(Zaak.current_resultaat).load_only(
+        latest_resultaat.uuid
+    ),
+    "hoofdzaak": selectinload(Zaak.hoofdzaak).load_only(Zaak.uuid),
+    "deelzaken": selectinload(Zaak.deelzaken).load_only(Zaak.uuid),
+}
+
+# columns of `Zaak` the eager loads above read from the parent row
+LOADER_COLUMNS = {
+    "zaaktype": (Zaak.zaaktype_id,),
+    "hoofdzaak": (Zaak.hoofdzaak_id,),
+    "eigenschappen": (Zaak.uuid,),
+}
+
+QUERY = BASE_QUERY.options(*LOADER_OPTIONS.values())
+
+GEOMETRY_COLUMN = Zaak.__table__.c.zaakgeometrie
+
+
+@lru_cache(maxsize=256)
+def get_column_loader(names: frozenset[str]):
+    """
+    Defer every `Zaak` column not needed for the `ZaakSchema` fields in `names`.
+
+    `zaakgeometrie` is left out, it is selected by `with_geometry`.
+    """
+    columns = [
+        attr.class_attribute
+        for attr in inspect(Zaak).column_attrs
+        if (attr.key in names or attr.key == "identificatie_ptr_id")
+        and not isinstance(attr, MappedSQLExpression)
+    ]
+    for name, loader_columns in LOADER_COLUMNS.items():
+        if name in names:
+            columns.extend(
+                column for column in loader_columns if column.key not in names
+            )
+    return load_only(*columns)
+
+
+@lru_cache(maxsize=256)
+def get_sparse_query(names: frozenset[str]) -> Select:
+    """
+    `QUERY` reduced to the columns and eager loads needed for the `ZaakSchema`
+    fields in `names`.
+    """
+    options = [option for name, option in LOADER_OPTIONS.items() if name in names]
+    return with_geometry(
+        BASE_QUERY.options(get_column_loader(names), *options), names=names
+    )
+
+
+def with_geometry(
+    query: Select,
+    geometry: Optional[Geometry] = None,
+    names: Optional[frozenset[str]] = None,
+) -> Select:
+    """
+    Select `Zaak.zaakgeometrie` in `query` as rendered by `geometry`, or as
+    stored without it, unless it is not among the `ZaakSchema` fields in `names`.
+    """
+    if names is not None and "zaakgeometrie" not in names:
+        return query
+    column = geometry.select(GEOMETRY_COLUMN) if geometry else GEOMETRY_COLUMN
+    return query.options(with_expression(Zaak.zaakgeometrie, column))
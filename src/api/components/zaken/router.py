@@ -1,25 +1,56 @@
-from typing import Any, List
+import json
+from functools import partial
+from typing import Any, List, Optional
+from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from fastapi_pagination import Page
 from fastapi_pagination.cursor import CursorPage, CursorParams
 from fastapi_pagination.ext.sqlalchemy import paginate
-from sqlalchemy import desc, select
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload, selectinload
-
-from src.api.components.zaken.models.zaken import (
-    Resultaat,
-    Rol,
-    Status,
-    Zaak,
-    ZaakEigenschap,
-    ZaakInformatieObject,
-    ZaakObject,
+from pydantic import TypeAdapter
+from sqlakeyset import BadBookmark
+
+from src.api.components.zaken.detail import get_document, get_documents
+from src.api.components.zaken.expansions import EXPANSIONS, with_geometry_expansions
+from src.api.components.zaken.filters import get_filters
+from src.api.components.zaken.loaders import LOADERS, LoadStrategy, ensure_zaaktypen
+from src.api.components.zaken.ordering import get_ordering
+from src.api.components.zaken.projection import (
+    paginate_projection,
+    projection_response,
+    with_base_url,
+)
+from src.api.components.zaken.queries import (
+    BASE_QUERY,
+    QUERY,
+    get_sparse_query,
+    with_geometry,
+)
+from src.api.components.zaken.schemas import (
+    ZAAK_FIELD_DEPENDENCIES,
+    BulkZakenRequestSchema,
+    BulkZakenSchema,
+    ZaakSchema,
 )
-from src.api.components.zaken.schemas import ZaakSchema
-from src.core.database import get_session
+from src.api.conditional import check_etag
+from src.api.expand import (
+    Expansion,
+    ExpandParam,
+    check_expand_fields,
+    expanded_response,
+)
+from src.api.export import ExportFormat, export_response
+from src.api.fieldsets import Fieldset, FieldsParam, sparse_page
+from src.api.geometry import DEFAULT_SRID, Geometry, GeometryParam
+from src.core.admission import Admission
+from src.core.config import settings
+from src.core.counting import CountMode, CountModeParam
+from src.core.deps import ReadSessionDep
+from src.core.pagination import KeysetPage
 from src.core.pagination import Page as CustomPage
+from src.core.pagination import paginate as count_paginate
+from src.core.responses import PydanticResponse
 
 
 zaken_router = APIRouter()
@@ -29,68 +60,229 @@ zaken_router = APIRouter()
 # logging.basicConfig()
 # logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
 
-QUERY = (
-    select(Zaak)
-    .options(
-        joinedload(Zaak.zaak_identificatie),
-        selectinload(Zaak.zaaktype),
-        selectinload(Zaak.kenmerken),
-        selectinload(Zaak.rollen).load_only(Rol.uuid),
-        selectinload(Zaak.eigenschappen).selectinload(ZaakEigenschap.zaak),
-        selectinload(Zaak.status).load_only(Status.uuid),
-        selectinload(Zaak.relevante_andere_zaken),
-        selectinload(Zaak.zaakinformatieobjecten).load_only(ZaakInformatieObject.uuid),
-        selectinload(Zaak.zaakobjecten).load_only(ZaakObject.uuid),
-        selectinload(Zaak.resultaat).load_only(Resultaat.uuid),
-        selectinload(Zaak.hoofdzaak).load_only(Zaak.uuid),
-        selectinload(Zaak.deelzaken).load_only(Zaak.uuid),
-    )
-    .order_by(desc(Zaak.identificatie_ptr_id))
-)
+zaak_fields = FieldsParam(ZaakSchema, ZAAK_FIELD_DEPENDENCIES)
+zaak_expand = ExpandParam(EXPANSIONS)
+zaak_geometry = GeometryParam()
+
+zaken_adapter = TypeAdapter(list[ZaakSchema])
 
 
-@zaken_router.get("/zaken", name="zaken-list", response_model=CustomPage[ZaakSchema])
+@zaken_router.get(
+    "/zaken",
+    name="zaken-list",
+    response_model=CustomPage[ZaakSchema],
+    dependencies=[Depends(Admission("zaken-list")), Depends(check_etag)],
+)
 async def list_zaken(
-    session: AsyncSession = Depends(get_session),
+    session: ReadSessionDep,
+    response: Response,
+    filters: list = Depends(get_filters),
+    ordering: list = Depends(get_ordering),
+    count_mode: CountMode = Depends(CountModeParam()),
+    load_strategy: LoadStrategy = Query(
+        LoadStrategy(settings.ZAKEN_LOAD_STRATEGY), alias="loadStrategy"
+    ),
+    fields: Optional[Fieldset] = Depends(zaak_fields),
+    expand: Optional[dict[str, Expansion]] = Depends(zaak_expand),
+    geometry: Geometry = Depends(zaak_geometry),
 ) -> Page[ZaakSchema]:
-    return await paginate(session, QUERY)
+    check_expand_fields(expand, fields)
+    names = fields.names if fields else None
+
+    # the projection holds complete documents in the default CRS, when enabled
+    if (
+        settings.ZAKEN_PROJECTION
+        and load_strategy == LoadStrategy.PROJECTION
+        and not fields
+        and not expand
+        and geometry.srid == DEFAULT_SRID
+    ):
+        page, documents = await paginate_projection(
+            session,
+            BASE_QUERY.where(*filters).order_by(None).order_by(*ordering),
+            count_mode,
+        )
+        return projection_response(page, documents, response.headers)
 
+    with sparse_page(CustomPage, ZaakSchema, fields):
+        if load_strategy in LOADERS:
+            page = await count_paginate(
+                session,
+                BASE_QUERY.where(*filters).order_by(None).order_by(*ordering),
+                count_mode=count_mode,
+                loader=partial(LOADERS[load_strategy], names=names, geometry=geometry),
+            )
+        else:
+            query = get_sparse_query(names) if names else QUERY
+            page = await count_paginate(
+                session,
+                with_geometry(query, geometry, names)
+                .where(*filters)
+                .order_by(None)
+                .order_by(*ordering),
+                count_mode=count_mode,
+                transformer=partial(ensure_zaaktypen, session),
+            )
 
-@zaken_router.get("/zaken-no-page", name="zaken-list", response_model=List[ZaakSchema])
+    if expand:
+        expand = with_geometry_expansions(expand, geometry)
+        return await expanded_response(session, page, expand, response.headers)
+    return PydanticResponse(page, headers=response.headers)
+
+
+@zaken_router.get(
+    "/zaken-keyset-page",
+    name="zaken-list",
+    response_model=KeysetPage[ZaakSchema],
+    dependencies=[Depends(Admission("zaken-list")), Depends(check_etag)],
+)
+async def list_zaken_keyset(
+    session: ReadSessionDep,
+    response: Response,
+    filters: list = Depends(get_filters),
+    ordering: list = Depends(get_ordering),
+    count_mode: CountMode = Depends(CountModeParam(CountMode.CACHED)),
+    fields: Optional[Fieldset] = Depends(zaak_fields),
+    expand: Optional[dict[str, Expansion]] = Depends(zaak_expand),
+    geometry: Geometry = Depends(zaak_geometry),
+) -> KeysetPage[ZaakSchema]:
+    check_expand_fields(expand, fields)
+    names = fields.names if fields else None
+    query = get_sparse_query(names) if names else QUERY
+    try:
+        with sparse_page(KeysetPage, ZaakSchema, fields):
+            page = await count_paginate(
+                session,
+                with_geometry(query, geometry, names)
+                .where(*filters)
+                .order_by(None)
+                .order_by(*ordering),
+                count_mode=count_mode,
+                transformer=partial(ensure_zaaktypen, session),
+            )
+    except BadBookmark:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor value"
+        )
+
+    if expand:
+        expand = with_geometry_expansions(expand, geometry)
+        return await expanded_response(session, page, expand, response.headers)
+    return PydanticResponse(page, headers=response.headers)
+
+
+@zaken_router.get(
+    "/zaken-no-page",
+    name="zaken-list",
+    response_model=List[ZaakSchema],
+    dependencies=[Depends(Admission("zaken-list"))],
+)
 async def list_zaken_no_page(
-    session: AsyncSession = Depends(get_session),
+    session: ReadSessionDep,
 ) -> list[ZaakSchema]:
     result = await session.execute(QUERY.limit(100).offset(100))
-    zaken = result.scalars().all()
-    return zaken
+    zaken = await ensure_zaaktypen(session, result.scalars().all())
+    zaken = zaken_adapter.validate_python(zaken, from_attributes=True)
+    return PydanticResponse(zaken, zaken_adapter)
+
+
+@zaken_router.get("/zaken-export", name="zaken-export")
+async def export_zaken(
+    response: Response,
+    filters: list = Depends(get_filters),
+    ordering: list = Depends(get_ordering),
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    geometry: Geometry = Depends(zaak_geometry),
+) -> StreamingResponse:
+    """
+    All zaken matching the filters, streamed as NDJSON or a JSON array of
+    `ZaakSchema` objects.
+    """
+    query = with_geometry(QUERY, geometry).where(*filters)
+    return export_response(
+        query.order_by(None).order_by(*ordering),
+        ZaakSchema,
+        export_format,
+        headers=dict(response.headers),
+        prepare=ensure_zaaktypen,
+    )
 
 
 @zaken_router.get(
-    "/zaken-cursor-page", name="zaken-list", response_model=CursorPage[ZaakSchema]
+    "/zaken-cursor-page",
+    name="zaken-list",
+    response_model=CursorPage[ZaakSchema],
+    dependencies=[Depends(Admission("zaken-list"))],
 )
 async def list_zaken_cursor(
+    session: ReadSessionDep,
     params: CursorParams = Depends(),
-    session: AsyncSession = Depends(get_session),
 ) -> CursorPage[ZaakSchema]:
-    return await paginate(session, QUERY, params)
+    transformer = partial(ensure_zaaktypen, session)
+    return PydanticResponse(
+        await paginate(session, QUERY, params, transformer=transformer)
+    )
 
 
 @zaken_router.get(
-    "/zaken-base-page", name="zaken-list", response_model=Page[ZaakSchema]
+    "/zaken-base-page",
+    name="zaken-list",
+    response_model=Page[ZaakSchema],
+    dependencies=[Depends(Admission("zaken-list"))],
 )
 async def list_zaken_base_page(
-    session: AsyncSession = Depends(get_session),
+    session: ReadSessionDep,
 ) -> Page[ZaakSchema]:
-    return await paginate(session, QUERY)
+    transformer = partial(ensure_zaaktypen, session)
+    return PydanticResponse(await paginate(session, QUERY, transformer=transformer))
 
 
-@zaken_router.get("/zaken/{uuid}", name="zaak-detail")
-async def detail_zaken(uuid: str, session: AsyncSession = Depends(get_session)) -> Any:
-    return []
+@zaken_router.post(
+    "/zaken/_bulk",
+    name="zaken-bulk",
+    response_model=BulkZakenSchema,
+    dependencies=[Depends(Admission("zaken-bulk"))],
+)
+async def bulk_zaken(
+    session: ReadSessionDep,
+    response: Response,
+    body: BulkZakenRequestSchema,
+    geometry: Geometry = Depends(zaak_geometry),
+) -> Any:
+    documents = await get_documents(session, body.uuids, geometry)
+    results = ",".join(documents.get(uuid, "null") for uuid in body.uuids)
+    not_found = json.dumps([str(uuid) for uuid in body.uuids if uuid not in documents])
+    return Response(
+        f'{{"results":[{with_base_url(results)}],"notFound":{not_found}}}',
+        media_type="application/json",
+        headers=response.headers,
+    )
+
+
+@zaken_router.get(
+    "/zaken/{uuid}",
+    name="zaak-detail",
+    response_model=ZaakSchema,
+    dependencies=[Depends(Admission("zaak-detail")), Depends(check_etag)],
+)
+async def detail_zaken(
+    session: ReadSessionDep,
+    response: Response,
+    uuid: UUID,
+    geometry: Geometry = Depends(zaak_geometry),
+) -> Any:
+    document = await get_document(session, uuid, geometry)
+    if document is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"Zaak not found: {uuid}"
+        )
+    return Response(
+        with_base_url(document), media_type="application/json", headers=response.headers
+    )
 
 
 @zaken_router.get("/rollen/{uuid}", name="rol-detail")
-async def detail_rol(uuid: str, session: AsyncSession = Depends(get_session)) -> Any:
+async def detail_rol(uuid: str, session: ReadSessionDep) -> Any:
     return []
 
 
@@ -98,34 +290,26 @@ async def detail_rol(uuid: str, session: AsyncSession = Depends(get_session)) ->
     "/zaken/{zaak_uuid}/zaakeigenschappen/{uuid}", name="eigenschappen-detail"
 )
 async def detail_eigenschappen(
-    zaak_uuid: str, uuid: str, session: AsyncSession = Depends(get_session)
+    zaak_uuid: str, uuid: str, session: ReadSessionDep
 ) -> Any:
     return []
 
 
 @zaken_router.get("/resultaten/{uuid}", name="resultaattypen-detail")
-async def detail_resultaattypen(
-    uuid: str, session: AsyncSession = Depends(get_session)
-) -> Any:
+async def detail_resultaattypen(uuid: str, session: ReadSessionDep) -> Any:
     return []
 
 
 @zaken_router.get("/informatieobjecttypen/{uuid}", name="zaakinformatieobject-detail")
-async def detail_informatieobjecttypen(
-    uuid: str, session: AsyncSession = Depends(get_session)
-) -> Any:
+async def detail_informatieobjecttypen(uuid: str, session: ReadSessionDep) -> Any:
     return []
 
 
 @zaken_router.get("/zaakobjecten/{uuid}", name="zaakobjecttypen-detail")
-async def detail_zaakobjecttypen(
-    uuid: str, session: AsyncSession = Depends(get_session)
-) -> Any:
+async def detail_zaakobjecttypen(uuid: str, session: ReadSessionDep) -> Any:
     return []
 
 
 @zaken_router.get("/statussen/{uuid}", name="statustypen-detail")
-async def detail_statustypen(
-    uuid: str, session: AsyncSession = Depends(get_session)
-) -> Any:
+async def detail_statustypen(uuid: str, session: ReadSessionDep) -> Any:
     return []
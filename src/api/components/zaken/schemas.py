@@ -2,13 +2,14 @@ from datetime import date, datetime, timedelta
 from typing import Annotated, List, Optional, Union
 from uuid import UUID
 
-from pydantic import AnyUrl, BaseModel, computed_field
+from pydantic import AnyUrl, BaseModel, BeforeValidator, computed_field
+from pydantic import Field as PydanticField
 from sqlalchemy import JSON
 from sqlmodel import Field
 
+from src.api.components.catalogi.catalog import zaaktype_catalog
 from src.api.components.catalogi.models.zaaktype import ZaakType
 from src.api.components.zaken.models.constants import BetalingsIndicatie
-from src.api.components.zaken.models.identification import ZaakIdentificatie
 from src.api.components.zaken.models.zaken import (
     Rol,
     Zaak,
@@ -22,11 +23,43 @@ from src.api.fields import (
     NestedHyperlinkedRelatedField,
 )
 from src.api.mixins import BaseMixin
+from src.core.config import settings
+
+
+ZAAK_URL_FIELD = HyperlinkedRelatedField(view_name="zaak-detail", lookup_field="uuid")
+STATUS_URL_FIELD = HyperlinkedRelatedField(
+    view_name="statustypen-detail",
+    value_field="current_status_uuid",
+    lookup_field="uuid",
+)
+RESULTAAT_URL_FIELD = HyperlinkedRelatedField(
+    view_name="resultaattypen-detail",
+    value_field="current_resultaat_uuid",
+    lookup_field="uuid",
+)
+ROL_URL_FIELD = HyperlinkedRelatedField(view_name="rol-detail", lookup_field="uuid")
+ZAAKINFORMATIEOBJECT_URL_FIELD = HyperlinkedRelatedField(
+    view_name="zaakinformatieobject-detail", lookup_field="uuid"
+)
+ZAAKOBJECT_URL_FIELD = HyperlinkedRelatedField(
+    view_name="zaakobjecttypen-detail", lookup_field="uuid"
+)
+EIGENSCHAP_URL_FIELD = NestedHyperlinkedRelatedField(
+    view_name="eigenschappen-detail", lookup_fields=("uuid", "zaak_uuid")
+)
 
 
 class UUIDZaakSchema(BaseModel):
     uuid: UUID
 
+    class Config:
+        from_attributes = True
+
+
+class ZaakIdentificatieSchema(BaseMixin):
+    identificatie: Optional[str]
+    bronorganisatie: Optional[str]
+
 
 class RelevanteZaakSchema(BaseMixin):
     aard_relatie: Optional[str]
@@ -36,15 +69,14 @@ class RelevanteZaakSchema(BaseMixin):
     @computed_field
     @property
     def url(self) -> Union[List, str]:
-        field = HyperlinkedRelatedField(view_name="zaak-detail", lookup_field="uuid")
-        return field.serialize_field(self.relevant_zaak)
+        return ZAAK_URL_FIELD.serialize_field(self.relevant_zaak)
 
     class Config:
         from_attributes = True
         arbitrary_types_allowed = True
         validate_by_name = True
         exclude_fields = {
-            "relevant_zaak": UUIDZaakSchema,
+            "relevant_zaak": Optional[Union[UUIDZaakSchema, UUID]],
         }
 
 
@@ -54,7 +86,9 @@ class ZaakKenmerkSchema(BaseMixin):
 
 
 class ZaakSchema(BaseMixin):
-    zaak_identificatie: ZaakIdentificatie = Field(exclude=True, sa_type=JSON)
+    zaak_identificatie: Optional[ZaakIdentificatieSchema] = Field(
+        exclude=True, sa_type=JSON
+    )
 
     uuid: UUID
     omschrijving: str
@@ -85,38 +119,41 @@ class ZaakSchema(BaseMixin):
     relevante_andere_zaken: List[RelevanteZaakSchema]
     kenmerken: List[ZaakKenmerkSchema]
 
+    # resolved from the catalog instead of loading the zaaktype of every zaak
     zaaktype: Annotated[
-        ZaakType,
+        Optional[Union[ZaakType, UUID]],
+        BeforeValidator(zaaktype_catalog.resolve),
         HyperlinkedRelatedField(view_name="zaaktype-detail", lookup_field="uuid"),
+        PydanticField(validation_alias="zaaktype_id"),
     ]
     rollen: Annotated[
-        List[Rol],
+        List[Union[Rol, UUID]],
         HyperlinkedRelatedField(view_name="rol-detail", lookup_field="uuid"),
     ]
     hoofdzaak: Annotated[
-        Optional[Zaak],
+        Optional[Union[Zaak, UUID]],
         HyperlinkedRelatedField(view_name="zaak-detail", lookup_field="uuid"),
     ]
     deelzaken: Annotated[
-        List[Zaak],
+        List[Union[Zaak, UUID]],
         HyperlinkedRelatedField(view_name="zaak-detail", lookup_field="uuid"),
     ]
 
     eigenschappen: Annotated[
-        List[ZaakEigenschap],
+        List[Union[ZaakEigenschap, dict]],
         NestedHyperlinkedRelatedField(
             view_name="eigenschappen-detail", lookup_fields=("uuid", "zaak_uuid")
         ),
     ]
 
     zaakinformatieobjecten: Annotated[
-        List[ZaakInformatieObject],
+        List[Union[ZaakInformatieObject, UUID]],
         HyperlinkedRelatedField(
             view_name="zaakinformatieobject-detail", lookup_field="uuid"
         ),
     ]
     zaakobjecten: Annotated[
-        List[ZaakObject],
+        List[Union[ZaakObject, UUID]],
         HyperlinkedRelatedField(
             view_name="zaakobjecttypen-detail", lookup_field="uuid"
         ),
@@ -140,31 +177,20 @@ class ZaakSchema(BaseMixin):
     @computed_field
     @property
     def url(self) -> Union[List, str]:
-        field = HyperlinkedRelatedField(view_name="zaak-detail", lookup_field="uuid")
-        return field.serialize_field(self)
+        return ZAAK_URL_FIELD.serialize_field(self)
 
     @computed_field
     @property
     def status(self) -> Optional[Union[List, str]]:
         if self.current_status_uuid:
-            field = HyperlinkedRelatedField(
-                view_name="statustypen-detail",
-                value_field="current_status_uuid",
-                lookup_field="uuid",
-            )
-            return field.serialize_field(self)
+            return STATUS_URL_FIELD.serialize_field(self)
         return None
 
     @computed_field
     @property
     def resultaat(self) -> Optional[Union[List, str]]:
         if self.current_resultaat_uuid:
-            field = HyperlinkedRelatedField(
-                view_name="resultaattypen-detail",
-                value_field="current_resultaat_uuid",
-                lookup_field="uuid",
-            )
-            return field.serialize_field(self)
+            return RESULTAAT_URL_FIELD.serialize_field(self)
         return None
 
     @computed_field
@@ -216,3 +242,100 @@ class ZaakSchema(BaseMixin):
             if self.betalingsindicatie in BetalingsIndicatie
             else ""
         )
+
+
+# representations of the related resources in `_expand`
+
+
+class RolSchema(BaseMixin):
+    uuid: UUID
+
+    @computed_field
+    @property
+    def url(self) -> Optional[str]:
+        return ROL_URL_FIELD.serialize_field(self)
+
+
+class StatusSchema(BaseMixin):
+    uuid: UUID
+    datum_status_gezet: Optional[datetime]
+
+    @computed_field
+    @property
+    def url(self) -> Optional[str]:
+        return STATUS_URL_FIELD.serialize_field(self.uuid)
+
+
+class ResultaatSchema(BaseMixin):
+    uuid: UUID
+
+    @computed_field
+    @property
+    def url(self) -> Optional[str]:
+        return RESULTAAT_URL_FIELD.serialize_field(self.uuid)
+
+
+class ZaakEigenschapSchema(BaseMixin):
+    uuid: UUID
+    zaak_uuid: Optional[UUID] = Field(exclude=True)
+
+    @computed_field
+    @property
+    def url(self) -> Optional[str]:
+        return EIGENSCHAP_URL_FIELD.serialize_field(self)
+
+    @computed_field
+    @property
+    def zaak(self) -> Optional[str]:
+        return ZAAK_URL_FIELD.serialize_field(self.zaak_uuid)
+
+
+class ZaakInformatieObjectSchema(BaseMixin):
+    uuid: UUID
+
+    @computed_field
+    @property
+    def url(self) -> Optional[str]:
+        return ZAAKINFORMATIEOBJECT_URL_FIELD.serialize_field(self)
+
+
+class ZaakObjectSchema(BaseMixin):
+    uuid: UUID
+
+    @computed_field
+    @property
+    def url(self) -> Optional[str]:
+        return ZAAKOBJECT_URL_FIELD.serialize_field(self)
+
+
+# hidden fields the computed fields of `ZaakSchema` are derived from
+ZAAK_FIELD_DEPENDENCIES = {
+    "url": ("uuid",),
+    "status": ("current_status_uuid",),
+    "resultaat": ("current_resultaat_uuid",),
+    "identificatie": ("zaak_identificatie",),
+    "bronorganisatie": ("zaak_identificatie",),
+    "processobject": (
+        "processobject_datumkenmerk",
+        "processobject_identificatie",
+        "processobject_objecttype",
+        "processobject_registratie",
+    ),
+    "opschorting": (
+        "opschorting_indicatie",
+        "opschorting_reden",
+        "opschorting_eerdere_opschorting",
+    ),
+    "verlenging": ("verlenging_reden", "verlenging_duur"),
+    "betalingsindicatie_weergave": ("betalingsindicatie",),
+}
+
+
+class BulkZakenRequestSchema(BaseMixin):
+    uuids: List[UUID] = Field(min_length=1, max_length=settings.BULK_MAX_UUIDS)
+
+
+class BulkZakenSchema(BaseMixin):
+    # in the order of the requested UUIDs, `null` for the UUIDs in `not_found`
+    results: List[Optional[ZaakSchema]]
+    not_found: List[UUID]
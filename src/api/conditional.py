@@ -0,0 +1,52 @@
+import hashlib
+
+from fastapi import HTTPException, Request, Response, status
+
+from src.core.changes import get_fingerprint
+from src.core.deps import ReadSessionDep
+
+# request headers changing the representation of the same URL
+VARY = ("Accept-Crs",)
+
+
+def make_etag(fingerprint: int, request: Request) -> str:
+    parts = [str(fingerprint), str(request.url)]
+    parts += [request.headers.get(header, "") for header in VARY]
+    digest = hashlib.blake2b("\n".join(parts).encode(), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+
+def parse_if_none_match(value: str) -> set[str]:
+    """
+    The entity tags of an `If-None-Match` header, compared weakly as GET
+    requests do.
+    """
+    return {tag.strip().removeprefix("W/") for tag in value.split(",")}
+
+
+async def check_etag(
+    session: ReadSessionDep,
+    request: Request,
+    response: Response,
+) -> None:
+    """
+    Dependency answering `If-None-Match` requests whose entity tag still matches
+    with 304 Not Modified, before the resource is queried and serialized.
+
+    The entity tag is derived from the counter of `src.core.changes`, which
+    changes with every write to the tables of the API, so one index-backed
+    lookup decides whether the response can have changed.
+    """
+    etag = make_etag(await get_fingerprint(session), request)
+
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        tags = parse_if_none_match(if_none_match)
+        if "*" in tags or etag.removeprefix("W/") in tags:
+            raise HTTPException(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": etag, "Vary": ", ".join(VARY)},
+            )
+
+    response.headers["ETag"] = etag
+    response.headers["Vary"] = ", ".join(VARY)
@@ -0,0 +1,188 @@
+from collections import defaultdict
+from collections.abc import Awaitable, Iterable, Mapping, Sequence
+from typing import Any, Callable, NamedTuple, Optional
+from uuid import UUID
+
+from fastapi import HTTPException, Query, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from src.api.fieldsets import Fieldset
+from src.api.fields import get_lookup_value
+
+
+class Expansion(NamedTuple):
+    # attribute of the item holding the related object(s) or their UUID(s)
+    field: str
+    schema: type[BaseModel]
+    # unfiltered query of the related model, shared by expansions of one model;
+    # None when the item holds the related objects already
+    query: Optional[Select]
+    many: bool = False
+    # awaited with the loaded objects before they are validated with `schema`
+    prepare: Optional[Callable[[AsyncSession, Sequence[Any]], Awaitable[Any]]] = None
+
+
+def get_uuid(value: Any) -> Optional[UUID]:
+    if value is None or isinstance(value, UUID):
+        return value
+    if isinstance(value, str):
+        return UUID(value)
+    return get_uuid(get_lookup_value(value, "uuid"))
+
+
+class BatchLoader:
+    """
+    Per-request loader of related objects by UUID.
+
+    The UUIDs of all items are collected first and every query then runs once
+    with `uuid = ANY(:uuids)`, so the number of queries does not depend on the
+    number of items and objects referenced by several items are loaded once.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.keys: dict[Select, set[UUID]] = defaultdict(set)
+        self.objects: dict[Select, dict[UUID, Any]] = defaultdict(dict)
+
+    def add(self, query: Select, uuids: Iterable[Optional[UUID]]) -> None:
+        self.keys[query].update(uuid for uuid in uuids if uuid is not None)
+
+    async def load(self) -> None:
+        for query, uuids in self.keys.items():
+            entity = query.column_descriptions[0]["entity"]
+            param = bindparam("uuids", list(uuids), type_=ARRAY(PG_UUID(as_uuid=True)))
+            result = await self.session.execute(query.where(entity.uuid == any_(param)))
+            self.objects[query].update((obj.uuid, obj) for obj in result.scalars())
+        self.keys.clear()
+
+    def get(self, query: Select, uuid: Optional[UUID]) -> Any:
+        return self.objects[query].get(uuid)
+
+
+class ExpandParam:
+    """
+    Dependency parsing the `expand` query parameter into the requested
+    `expansions`.
+    """
+
+    def __init__(self, expansions: Mapping[str, Expansion]):
+        self.expansions = expansions
+
+    def __call__(
+        self, expand: Optional[str] = Query(None)
+    ) -> Optional[dict[str, Expansion]]:
+        if not expand:
+            return None
+
+        requested = [name.strip() for name in expand.split(",") if name.strip()]
+        invalid = sorted(set(requested) - self.expansions.keys())
+        if invalid:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid expand: {', '.join(invalid)}",
+            )
+        return {name: self.expansions[name] for name in requested}
+
+
+def check_expand_fields(
+    expand: Optional[dict[str, Expansion]], fields: Optional[Fieldset]
+) -> None:
+    if not expand or not fields:
+        return
+
+    missing = sorted(
+        name
+        for name, expansion in expand.items()
+        if expansion.field not in fields.names
+    )
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Expanded fields missing from fields: {', '.join(missing)}",
+        )
+
+
+async def expand_items(
+    session: AsyncSession, items: Sequence[Any], expand: dict[str, Expansion]
+) -> list[dict[str, Any]]:
+    """
+    Resolve the `_expand` object of every item with one batch of queries.
+    """
+    loader = BatchLoader(session)
+    # objects held by the items, by expansion name and UUID
+    held: dict[str, dict[UUID, Any]] = defaultdict(dict)
+    keys = []
+    for item in items:
+        item_keys = {}
+        for name, expansion in expand.items():
+            value = getattr(item, expansion.field)
+            objects = value if expansion.many else [value]
+            uuids = [get_uuid(obj) for obj in objects]
+            if expansion.query is None:
+                held[name].update(
+                    (uuid, obj)
+                    for uuid, obj in zip(uuids, objects)
+                    if uuid is not None and not isinstance(obj, (UUID, str))
+                )
+            else:
+                loader.add(expansion.query, uuids)
+            item_keys[name] = uuids
+        keys.append(item_keys)
+
+    await loader.load()
+    for expansion in expand.values():
+        if expansion.query is not None and expansion.prepare is not None:
+            objects = list(loader.objects[expansion.query].values())
+            await expansion.prepare(session, objects)
+
+    # objects shared by items are serialized once
+    rendered = {}
+
+    def render(name: str, uuid: Optional[UUID]) -> Optional[dict]:
+        expansion = expand[name]
+        key = (expansion.schema, uuid)
+        if key not in rendered:
+            if expansion.query is None:
+                obj = held[name].get(uuid)
+            else:
+                obj = loader.get(expansion.query, uuid)
+            rendered[key] = (
+                expansion.schema.model_validate(obj).model_dump(
+                    mode="json", by_alias=True
+                )
+                if obj is not None
+                else None
+            )
+        return rendered[key]
+
+    expanded = []
+    for item_keys in keys:
+        item_expanded = {}
+        for name, uuids in item_keys.items():
+            expansion = expand[name]
+            objects = [render(name, uuid) for uuid in uuids]
+            item_expanded[name] = objects if expansion.many else objects[0]
+        expanded.append(item_expanded)
+    return expanded
+
+
+async def expanded_response(
+    session: AsyncSession,
+    page: BaseModel,
+    expand: dict[str, Expansion],
+    headers: Optional[Mapping[str, str]] = None,
+) -> JSONResponse:
+    """
+    Render `page` with the `_expand` object of every result, as Open Zaak does.
+    """
+    content = page.model_dump(mode="json", by_alias=True)
+    expanded = await expand_items(session, page.items, expand)
+    for result, expanded_result in zip(content["results"], expanded):
+        result["_expand"] = expanded_result
+    return JSONResponse(content, headers=headers)
@@ -0,0 +1,85 @@
+from collections.abc import AsyncIterator, Awaitable, Sequence
+from enum import Enum
+from typing import Any, Callable, Optional
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from src.core.config import settings
+from src.core.database import async_session
+
+
+class ExportFormat(str, Enum):
+    # one JSON object per line
+    NDJSON = "ndjson"
+    # a JSON array, written incrementally
+    JSON = "json"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.JSON: "application/json",
+}
+
+# awaited with every partition of rows before it is serialized
+Prepare = Callable[[AsyncSession, Sequence[Any]], Awaitable[Any]]
+
+
+async def stream_items(
+    query: Select,
+    schema: type[BaseModel],
+    export_format: ExportFormat,
+    partition_size: int,
+    prepare: Optional[Prepare] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Serialize all rows of `query` with `schema`, one chunk per partition of
+    `partition_size` rows.
+
+    The rows are read from a server-side cursor, and the next partition is only
+    fetched once the previous chunk was sent, so memory use does not depend on
+    the number of rows and a slow client slows down the reading.
+
+    The session is opened here rather than taken from a dependency, because the
+    dependencies are closed before a streaming response is sent.
+    """
+    serializer = schema.__pydantic_serializer__
+    separator = b"\n" if export_format == ExportFormat.NDJSON else b","
+
+    if export_format == ExportFormat.JSON:
+        yield b"["
+    async with async_session() as session:
+        result = await session.stream(query.execution_options(yield_per=partition_size))
+        first = True
+        async for partition in result.scalars().partitions():
+            if prepare is not None:
+                await prepare(session, partition)
+            chunk = separator.join(
+                serializer.to_json(schema.model_validate(obj), by_alias=True)
+                for obj in partition
+            )
+            if export_format == ExportFormat.NDJSON:
+                yield chunk + separator
+            else:
+                yield chunk if first else separator + chunk
+            first = False
+    if export_format == ExportFormat.JSON:
+        yield b"]"
+
+
+def export_response(
+    query: Select,
+    schema: type[BaseModel],
+    export_format: ExportFormat,
+    headers: Optional[dict[str, str]] = None,
+    prepare: Optional[Prepare] = None,
+) -> StreamingResponse:
+    return StreamingResponse(
+        stream_items(
+            query, schema, export_format, settings.EXPORT_PARTITION_SIZE, prepare
+        ),
+        media_type=MEDIA_TYPES[export_format],
+        headers=headers,
+    )
@@ -1,14 +1,22 @@
+from collections.abc import Mapping
 from typing import Any, List, Optional, Union
+from uuid import UUID
 
 from geoalchemy2.elements import WKBElement
-from geoalchemy2.shape import to_shape
 from pydantic._internal._generate_schema import GetCoreSchemaHandler
 from pydantic_core import core_schema
-from shapely.geometry import mapping
 
+from src.api.geometry import wkb_to_geojson
+from src.api.urls import url_templates
 from src.core.middleware import request_contextvar
 
 
+def get_lookup_value(obj: Any, field: str) -> Any:
+    if isinstance(obj, Mapping):
+        return obj[field]
+    return getattr(obj, field)
+
+
 class HyperlinkedRelatedField:
     def __init__(
         self,
@@ -23,6 +31,9 @@ class HyperlinkedRelatedField:
     def get_url(self, obj: Any) -> Optional[str]:
         """
         Given an object, return the URL that hyperlinks to the object.
+
+        Rows of the Core read path pass the lookup value itself (e.g. the UUID of
+        the related object) or a mapping instead of an ORM instance.
         """
         if not obj:
             return None
@@ -30,11 +41,13 @@ class HyperlinkedRelatedField:
         if hasattr(obj, "pk") and obj.pk in (None, ""):
             return None
         request = request_contextvar.get()
-        if self.value_field:
-            value = getattr(obj, self.value_field)
+        if isinstance(obj, (UUID, str)):
+            value = obj
         else:
-            value = getattr(obj, self.lookup_field)
-        return str(request.url_for(self.view_name, **{self.lookup_field: value}))
+            value = get_lookup_value(obj, self.value_field or self.lookup_field)
+        return url_templates.reverse(
+            request, self.view_name, **{self.lookup_field: value}
+        )
 
     def serialize_field(self, value: Any) -> Union[List, str]:
         if isinstance(value, list):
@@ -90,26 +103,34 @@ class NestedHyperlinkedRelatedField(HyperlinkedRelatedField):
             return None
 
         try:
-            lookup_values = {field: getattr(obj, field) for field in self.lookup_fields}
-        except AttributeError:
+            lookup_values = {
+                field: get_lookup_value(obj, field) for field in self.lookup_fields
+            }
+        except (AttributeError, KeyError):
             return None
 
         if any(v in (None, "") for v in lookup_values.values()):
             return None
 
         request = request_contextvar.get()
-        return str(request.url_for(self.view_name, **lookup_values))
+        return url_templates.reverse(request, self.view_name, **lookup_values)
 
 
 class GeoJSONGeometry:
-    def __init__(self, value: WKBElement):
-        if not isinstance(value, WKBElement):
-            raise TypeError(f"Expected WKBElement, got {type(value)}")
+    """
+    A geometry loaded as WKB, or as GeoJSON already rendered by the database
+    (see `src.api.geometry.Geometry`), which is passed through as is.
+    """
+
+    def __init__(self, value: Union[WKBElement, dict]):
+        if not isinstance(value, (WKBElement, dict)):
+            raise TypeError(f"Expected WKBElement or dict, got {type(value)}")
         self._value = value
-        self._shape = to_shape(value)
 
     def to_geojson(self) -> dict:
-        return mapping(self._shape)
+        if isinstance(self._value, dict):
+            return self._value
+        return wkb_to_geojson(self._value.data)
 
     @classmethod
     def __get_pydantic_core_schema__(
@@ -0,0 +1,104 @@
+from collections.abc import Iterable, Mapping
+from contextlib import AbstractContextManager, nullcontext
+from functools import lru_cache
+from typing import Any, NamedTuple, Optional
+
+from fastapi import HTTPException, Query, status
+from fastapi_pagination.api import set_page
+from pydantic import BaseModel, Field, computed_field
+
+from src.api.mixins import alias_keys
+
+
+def get_output_fields(schema: type[BaseModel]) -> dict[str, str]:
+    """
+    Map the serialized (camelCase) names of `schema` to its attribute names.
+    """
+    names = [
+        name for name, field in schema.model_fields.items() if not field.exclude
+    ] + list(schema.model_computed_fields)
+    return {alias_keys(name): name for name in names}
+
+
+class Fieldset(NamedTuple):
+    # attribute names of the requested fields
+    requested: frozenset[str]
+    # the requested fields and the fields they are derived from
+    names: frozenset[str]
+
+
+class FieldsParam:
+    """
+    Dependency parsing the `fields` query parameter into a `Fieldset` of `schema`,
+    including the fields listed in `dependencies` that computed fields are
+    derived from.
+
+    Returns `None` when all fields are requested.
+    """
+
+    def __init__(
+        self,
+        schema: type[BaseModel],
+        dependencies: Optional[Mapping[str, Iterable[str]]] = None,
+    ):
+        self.output_fields = get_output_fields(schema)
+        self.dependencies = dependencies or {}
+
+    def __call__(self, fields: Optional[str] = Query(None)) -> Optional[Fieldset]:
+        if not fields:
+            return None
+
+        requested = {field.strip() for field in fields.split(",") if field.strip()}
+        invalid = sorted(requested - self.output_fields.keys())
+        if invalid:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid fields: {', '.join(invalid)}",
+            )
+
+        requested = frozenset(self.output_fields[field] for field in requested)
+        names = set(requested)
+        for name in requested:
+            names.update(self.dependencies.get(name, ()))
+        return Fieldset(requested, frozenset(names))
+
+
+@lru_cache(maxsize=256)
+def get_sparse_schema(schema: type[BaseModel], fieldset: Fieldset) -> type[BaseModel]:
+    """
+    Build a copy of `schema` with only the fields of `fieldset`, so validation
+    and serialization skip everything else.
+    """
+    annotations = {}
+    namespace: dict[str, Any] = {"__module__": schema.__module__}
+    for name, field in schema.model_fields.items():
+        if name in fieldset.names:
+            annotations[name] = field.rebuild_annotation()
+            namespace[name] = Field(
+                validation_alias=field.validation_alias,
+                exclude=field.exclude or name not in fieldset.requested,
+            )
+
+    for name, decorator in schema.__pydantic_decorators__.computed_fields.items():
+        if name in fieldset.requested:
+            namespace[name] = computed_field(
+                decorator.info.wrapped_property,
+                return_type=decorator.info.return_type,
+            )
+
+    namespace["__annotations__"] = annotations
+    name = f"{schema.__name__}[{','.join(sorted(fieldset.requested))}]"
+    return type(name, (schema.__base__,), namespace)
+
+
+def sparse_page(
+    page: type[BaseModel], schema: type[BaseModel], fieldset: Optional[Fieldset]
+) -> AbstractContextManager:
+    """
+    Create pages of the sparse `schema` within the block instead of the page type
+    of the route. Such pages are returned as a `PydanticResponse`, bypassing the
+    full `response_model` of the route.
+    """
+    if fieldset is None:
+        return nullcontext()
+    return set_page(page[get_sparse_schema(schema, fieldset)])
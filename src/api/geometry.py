@@ -0,0 +1,159 @@
+import struct
+from enum import Enum
+from typing import Any, NamedTuple, Optional
+
+from fastapi import HTTPException, Header, Query, Response, status
+from geoalchemy2 import functions
+from sqlalchemy import JSON, cast
+from sqlalchemy.sql import ColumnElement
+
+from src.core.config import settings
+
+# the CRS geometries are stored in
+DEFAULT_SRID = 4326
+SUPPORTED_SRIDS = (4326, 28992)
+
+# decimal places of ST_AsGeoJSON: far below the accuracy of any coordinate in
+# degrees or metres, but not a lossless round trip of a double, as coordinates
+# close to zero need up to 17 significant digits
+MAX_DECIMAL_DIGITS = 15
+
+GEOMETRY_TYPES = {
+    1: "Point",
+    2: "LineString",
+    3: "Polygon",
+    4: "MultiPoint",
+    5: "MultiLineString",
+    6: "MultiPolygon",
+    7: "GeometryCollection",
+}
+
+# EWKB flags of the geometry type
+EWKB_Z = 0x80000000
+EWKB_M = 0x40000000
+EWKB_SRID = 0x20000000
+
+
+class GeometryRendering(str, Enum):
+    # ST_AsGeoJSON in the database, passed through as is
+    DATABASE = "database"
+    # WKB decoded in Python
+    PYTHON = "python"
+
+
+class Geometry(NamedTuple):
+    rendering: GeometryRendering
+    srid: int = DEFAULT_SRID
+
+    def select(self, column: ColumnElement) -> ColumnElement:
+        """
+        The expression selecting the geometry `column` for the response.
+        """
+        if self.srid != column.type.srid:
+            column = functions.ST_Transform(column, self.srid)
+        if self.rendering == GeometryRendering.DATABASE:
+            return cast(functions.ST_AsGeoJSON(column, MAX_DECIMAL_DIGITS, 0), JSON)
+        return column
+
+
+def get_srid(crs: str) -> Optional[int]:
+    authority, _, code = crs.strip().partition(":")
+    if authority.upper() != "EPSG" or not code.isdigit():
+        return None
+    return int(code)
+
+
+class GeometryParam:
+    """
+    Dependency resolving how geometries are rendered: in the CRS of the
+    `Accept-Crs` header (`EPSG:4326` when absent), by the database or in Python
+    as set by the `geometryRendering` query parameter or
+    `settings.GEOMETRY_RENDERING`.
+
+    The CRS of the response is set in its `Content-Crs` header.
+    """
+
+    def __call__(
+        self,
+        response: Response,
+        accept_crs: Optional[str] = Header(None, alias="Accept-Crs"),
+        rendering: Optional[GeometryRendering] = Query(None, alias="geometryRendering"),
+    ) -> Geometry:
+        srid = get_srid(accept_crs) if accept_crs else DEFAULT_SRID
+        if srid not in SUPPORTED_SRIDS:
+            raise HTTPException(
+                status_code=status.HTTP_406_NOT_ACCEPTABLE,
+                detail=f"CRS not supported: {accept_crs}",
+            )
+
+        response.headers["Content-Crs"] = f"EPSG:{srid}"
+        return Geometry(
+            rendering or GeometryRendering(settings.GEOMETRY_RENDERING), srid
+        )
+
+
+class WKBReader:
+    """
+    Decoder of (E)WKB into GeoJSON geometries, giving the same output as
+    `shapely.geometry.mapping` without building Shapely objects. M values are
+    dropped, as GeoJSON has no place for them.
+    """
+
+    def __init__(self, data: bytes):
+        self.data = memoryview(data)
+        self.offset = 0
+
+    def unpack(self, fmt: str) -> tuple:
+        values = struct.unpack_from(fmt, self.data, self.offset)
+        self.offset += struct.calcsize(fmt)
+        return values
+
+    def coordinates(self, order: str, count: int, dims: int, has_m: bool) -> list:
+        size = dims + has_m
+        values = self.unpack(f"{order}{count * size}d")
+        return [values[i : i + dims] for i in range(0, len(values), size)]
+
+    def read(self) -> dict[str, Any]:
+        order = "<" if self.unpack("B")[0] else ">"
+        (code,) = self.unpack(f"{order}I")
+
+        has_z = bool(code & EWKB_Z)
+        has_m = bool(code & EWKB_M)
+        if code & EWKB_SRID:
+            self.unpack(f"{order}I")
+        code &= 0x0FFFFFFF
+        # ISO WKB encodes the dimensions in the thousands
+        dimensions, code = divmod(code, 1000)
+        has_z = has_z or dimensions in (1, 3)
+        has_m = has_m or dimensions in (2, 3)
+        dims = 3 if has_z else 2
+
+        geometry_type = GEOMETRY_TYPES[code]
+        if geometry_type == "Point":
+            (point,) = self.coordinates(order, 1, dims, has_m)
+            # empty points are encoded as NaN
+            coordinates = () if all(c != c for c in point) else point
+        elif geometry_type == "LineString":
+            (count,) = self.unpack(f"{order}I")
+            coordinates = tuple(self.coordinates(order, count, dims, has_m))
+        elif geometry_type == "Polygon":
+            (rings,) = self.unpack(f"{order}I")
+            coordinates = []
+            for _ in range(rings):
+                (count,) = self.unpack(f"{order}I")
+                coordinates.append(tuple(self.coordinates(order, count, dims, has_m)))
+            coordinates = tuple(coordinates)
+        else:
+            (count,) = self.unpack(f"{order}I")
+            parts = [self.read() for _ in range(count)]
+            if geometry_type == "GeometryCollection":
+                return {"type": geometry_type, "geometries": parts}
+            coordinates = tuple(part["coordinates"] for part in parts)
+
+        return {"type": geometry_type, "coordinates": coordinates}
+
+
+def wkb_to_geojson(data: bytes | str) -> dict[str, Any]:
+    if isinstance(data, str):
+        data = bytes.fromhex(data)
+    return WKBReader(data).read()
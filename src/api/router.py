@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 
+from src.api.admin import admin_router
 from src.api.components.catalogi.router import catalogi_router
 from src.api.components.zaken.router import zaken_router
 
@@ -8,3 +9,4 @@ api_router.include_router(router=zaken_router, prefix="/zaken/api/v1", tags=["za
 api_router.include_router(
     router=catalogi_router, prefix="/catalogi/api/v1", tags=["zaken"]
 )
+api_router.include_router(router=admin_router, prefix="/_admin", tags=["admin"])
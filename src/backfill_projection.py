@@ -0,0 +1,89 @@
+import argparse
+import asyncio
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import select
+
+from src.api.components.catalogi.catalog import zaaktype_catalog
+from src.api.components.zaken.models.zaken import Zaak
+from src.api.components.zaken.projection import projection, refresh
+from src.core.config import settings
+from src.core.database import async_session, engine
+from src.main import app  # noqa: F401, compiles the URL templates
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def get_batches(batch_size: int) -> list[list[int]]:
+    async with async_session() as session:
+        zaak_ids = (
+            await session.scalars(
+                select(Zaak.identificatie_ptr_id).order_by(Zaak.identificatie_ptr_id)
+            )
+        ).all()
+    await engine.dispose()
+    return [
+        list(zaak_ids[start : start + batch_size])
+        for start in range(0, len(zaak_ids), batch_size)
+    ]
+
+
+async def refresh_batches(batches: list[list[int]], concurrency: int) -> int:
+    """
+    Refresh `batches` on `concurrency` connections of this process.
+    """
+    await zaaktype_catalog.refresh()
+    queue: asyncio.Queue[list[int]] = asyncio.Queue()
+    for batch in batches:
+        queue.put_nowait(batch)
+
+    async def worker() -> int:
+        written = 0
+        async with async_session() as session:
+            while not queue.empty():
+                written += await refresh(session, queue.get_nowait())
+        return written
+
+    try:
+        return sum(await asyncio.gather(*(worker() for _ in range(concurrency))))
+    finally:
+        await engine.dispose()
+
+
+def run_batches(batches: list[list[int]], concurrency: int) -> int:
+    # the pool of the parent process cannot be shared with this one
+    engine.sync_engine.dispose(close=False)
+    return asyncio.run(refresh_batches(batches, concurrency))
+
+
+def backfill(batch_size: int, processes: int, concurrency: int) -> int:
+    """
+    Rebuild the documents of all zaken, in batches of `batch_size` spread over
+    `processes` processes with `concurrency` connections each: rendering is
+    CPU-bound, loading the batches is not.
+    """
+    batches = asyncio.run(get_batches(batch_size))
+    with ProcessPoolExecutor(processes) as executor:
+        shares = [batches[index::processes] for index in range(processes)]
+        return sum(executor.map(run_batches, shares, [concurrency] * len(shares)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=f"Rebuild {projection.name}")
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.PROJECTION_BATCH_SIZE
+    )
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=2)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    written = backfill(args.batch_size, args.processes, args.concurrency)
+    logger.info("Rendered %d documents in %.1fs", written, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
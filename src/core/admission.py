@@ -0,0 +1,103 @@
+import asyncio
+from collections import deque
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.exc import DBAPIError
+
+from src.core.config import settings
+from src.core.database import statement_timeout
+
+# SQLSTATE of a statement canceled by `statement_timeout`
+QUERY_CANCELED = "57014"
+
+
+class Limiter:
+    """
+    Admits `limit` holders at a time, queueing at most `queue_size` more for
+    `timeout` seconds. Released slots go to the longest waiting holder.
+    """
+
+    def __init__(self, limit: int, queue_size: int, timeout: float):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.active = 0
+        self.waiters: deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> bool:
+        if self.active < self.limit:
+            self.active += 1
+            return True
+        if len(self.waiters) >= self.queue_size:
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.timeout)
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                # the slot was handed over while timing out
+                self.release()
+            elif waiter in self.waiters:
+                self.waiters.remove(waiter)
+            if isinstance(exc, TimeoutError):
+                return False
+            raise
+        return True
+
+    def release(self) -> None:
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+
+class Admission:
+    """
+    Dependency limiting the concurrent requests of the routes named `name` in
+    this worker, and the `statement_timeout` of their queries.
+
+    Requests over the limit wait in a bounded queue. When the queue is full, or
+    the wait exceeds its timeout, they are answered with 503 Service
+    Unavailable and a `Retry-After` header right away. A request whose query is
+    canceled by its statement timeout is answered with 503 as well.
+    """
+
+    limiters: dict[str, Limiter] = {}
+
+    def __init__(self, name: str):
+        self.name = name
+        if name not in self.limiters:
+            self.limiters[name] = Limiter(
+                settings.ADMISSION_LIMITS.get(name, settings.ADMISSION_LIMIT),
+                settings.ADMISSION_QUEUE_SIZE,
+                settings.ADMISSION_QUEUE_TIMEOUT,
+            )
+        self.limiter = self.limiters[name]
+        self.statement_timeout: Optional[int] = settings.STATEMENT_TIMEOUTS.get(
+            name, settings.STATEMENT_TIMEOUT
+        )
+
+    async def __call__(self):
+        if not await self.limiter.acquire():
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Too many concurrent requests for {self.name}",
+                headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER)},
+            )
+        statement_timeout.set(self.statement_timeout)
+        try:
+            yield
+        except DBAPIError as exc:
+            if getattr(exc.orig, "pgcode", None) != QUERY_CANCELED:
+                raise
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Query exceeded the statement timeout of {self.name}",
+            ) from exc
+        finally:
+            self.limiter.release()
@@ -0,0 +1,198 @@
+import asyncio
+import logging
+from collections.abc import Callable, Iterable
+from typing import Optional
+
+import asyncpg
+from sqlalchemy import BigInteger, Column, SmallInteger, Table, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.expression import TextClause
+
+from src.core.config import settings
+from src.core.database import Base, engine
+
+logger = logging.getLogger(__name__)
+
+# counter rows, so concurrent writers rarely wait for each other's counter update
+SHARDS = 16
+
+# notified with the table name on every write, see `ChangeListener`
+CHANNEL = "api_changes"
+
+# counts the write statements on the tables of the API, see `get_tracking_ddl`
+changes = Table(
+    "api_changes",
+    Base.metadata,
+    Column("shard", SmallInteger, primary_key=True, autoincrement=False),
+    Column("counter", BigInteger, nullable=False, server_default="0"),
+    info={"track_changes": False},
+)
+
+
+def get_tracked_tables() -> list[Table]:
+    """
+    The tables of `Base.metadata`, except those derived from the others and
+    declared with `info={"track_changes": False}`.
+    """
+    return [
+        table
+        for table in Base.metadata.sorted_tables
+        if table.info.get("track_changes", True)
+    ]
+
+
+def get_tracking_ddl() -> list[TextClause]:
+    """
+    The statements creating the triggers that count every write statement on
+    the tracked tables and notify `CHANNEL` of it.
+
+    The counter is updated in the writing transaction, so readers see it change
+    exactly when the written rows become visible to them. Notifications are
+    delivered on commit as well, once per table and transaction.
+    """
+    statements = [
+        text(
+            f"INSERT INTO {changes.name} (shard) "
+            f"SELECT generate_series(0, {SHARDS - 1}) ON CONFLICT DO NOTHING"
+        ),
+        text(
+            f"""
+            CREATE OR REPLACE FUNCTION api_count_change() RETURNS trigger AS $$
+            BEGIN
+                UPDATE {changes.name} SET counter = counter + 1
+                WHERE shard = pg_backend_pid() % {SHARDS};
+                PERFORM pg_notify('{CHANNEL}', TG_TABLE_NAME);
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+            """
+        ),
+    ]
+    for table in get_tracked_tables():
+        trigger = f"{table.name}_api_changes"
+        statements += [
+            text(f"DROP TRIGGER IF EXISTS {trigger} ON {table.name}"),
+            text(
+                f"CREATE TRIGGER {trigger} "
+                f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table.name} "
+                f"FOR EACH STATEMENT EXECUTE FUNCTION api_count_change()"
+            ),
+        ]
+    return statements
+
+
+async def get_fingerprint(session: AsyncSession) -> int:
+    """
+    A number that changes with every committed write to the tracked tables.
+    """
+    return await session.scalar(select(func.sum(changes.c.counter)))
+
+
+class ChangeListener:
+    """
+    Listens to `CHANNEL` on a dedicated connection and calls the subscribed
+    callbacks on every committed write to the tracked tables, or to the
+    `tables` they subscribed to.
+
+    The callbacks are also called when the connection is lost and on every
+    (re)connect, as notifications are lost while not listening. A connection
+    which silently dropped is detected by a `SELECT 1` every
+    `keepalive_interval` seconds, unanswered within `keepalive_timeout`. Caches
+    should not be used while `connected` is false. `generation` counts the
+    notifications, so work started before a change can be told apart from work
+    started after it.
+    """
+
+    def __init__(
+        self,
+        retry_interval: float = 1,
+        keepalive_interval: float = 10,
+        keepalive_timeout: float = 5,
+    ):
+        self.retry_interval = retry_interval
+        self.keepalive_interval = keepalive_interval
+        self.keepalive_timeout = keepalive_timeout
+        self.callbacks: list[tuple[Callable[[], None], Optional[frozenset[str]]]] = []
+        self.connected = False
+        self.generation = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(
+        self, callback: Callable[[], None], tables: Optional[Iterable[str]] = None
+    ) -> None:
+        self.callbacks.append((callback, frozenset(tables) if tables else None))
+
+    def notify(self, *args) -> None:
+        # called by asyncpg with (connection, pid, channel, table), and without
+        # arguments when any table may have changed
+        table = args[-1] if args else None
+        self.generation += 1
+        for callback, tables in self.callbacks:
+            if table is None or tables is None or table in tables:
+                callback()
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self.listen())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def listen(self) -> None:
+        dsn = engine.url.set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+        while True:
+            try:
+                connection = await asyncpg.connect(dsn)
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError) as exc:
+                logger.warning("Cannot listen to %s: %s", CHANNEL, exc)
+                await asyncio.sleep(self.retry_interval)
+                continue
+
+            try:
+                await connection.add_listener(CHANNEL, self.notify)
+                self.notify()
+                self.connected = True
+                await self.keepalive(connection)
+                logger.warning("Lost the connection listening to %s", CHANNEL)
+            finally:
+                self.connected = False
+                connection.terminate()
+            self.notify()
+
+    async def keepalive(self, connection: asyncpg.Connection) -> None:
+        """
+        Return when `connection` is closed, or does not answer in time.
+        """
+        terminated = asyncio.Event()
+        connection.add_termination_listener(lambda _: terminated.set())
+        while True:
+            try:
+                await asyncio.wait_for(terminated.wait(), self.keepalive_interval)
+                return
+            except TimeoutError:
+                pass
+            try:
+                async with asyncio.timeout(self.keepalive_timeout):
+                    await connection.fetchval("SELECT 1")
+            except (
+                OSError,
+                TimeoutError,
+                asyncpg.PostgresError,
+                asyncpg.InterfaceError,
+            ) as exc:
+                logger.warning("Keepalive of %s failed: %r", CHANNEL, exc)
+                return
+
+
+change_listener = ChangeListener(
+    keepalive_interval=settings.CHANGE_KEEPALIVE_INTERVAL,
+    keepalive_timeout=settings.CHANGE_KEEPALIVE_TIMEOUT,
+)
@@ -13,6 +13,61 @@ class Settings(BaseSettings):
     DB_USER: str
     DB_PASSWORD: str = ""
     DB_NAME: str = ""
+    # every uvicorn worker has its own pool: keep workers * (DB_POOL_SIZE +
+    # DB_MAX_OVERFLOW + 1 listener connection) below max_connections of Postgres
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = False
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # DSNs of streaming replicas serving the read-only routes, as a JSON list;
+    # their user needs pg_read_all_stats to see whether they are streaming
+    DB_REPLICAS: list[str] = []
+    REPLICA_MAX_LAG: float = 5
+    REPLICA_CHECK_INTERVAL: float = 5
+    # concurrent requests per route name in every worker, by `Admission`; keep
+    # the limits of the routes of a worker around its pool size, so requests
+    # over capacity wait in the admission queue instead of the pool
+    ADMISSION_LIMITS: dict[str, int] = {"zaken-list": 8, "zaken-bulk": 4}
+    ADMISSION_LIMIT: int = 16
+    ADMISSION_QUEUE_SIZE: int = 32
+    ADMISSION_QUEUE_TIMEOUT: float = 2
+    ADMISSION_RETRY_AFTER: int = 1
+    # statement_timeout in milliseconds per route name
+    STATEMENT_TIMEOUTS: dict[str, int] = {"zaak-detail": 2000, "zaaktype-detail": 2000}
+    STATEMENT_TIMEOUT: int = 10000
+    COUNT_MODE: str = "exact"
+    COUNT_CACHE_TTL: int = 60
+    COUNT_CACHE_SIZE: int = 1024
+    ZAKEN_LOAD_STRATEGY: str = "selectin"
+    # "database" renders coordinates with ST_AsGeoJSON, which is faster but
+    # does not match the output of Open Zaak byte for byte
+    GEOMETRY_RENDERING: str = "python"
+    EXPORT_PARTITION_SIZE: int = 500
+    # seconds between the checks of the connection listening for changes, and
+    # to wait for their answer before reconnecting
+    CHANGE_KEEPALIVE_INTERVAL: float = 10
+    CHANGE_KEEPALIVE_TIMEOUT: float = 5
+    RESPONSE_CACHE_TTL: int = 60
+    RESPONSE_CACHE_SIZE: int = 256
+    ZAAK_CACHE_TTL: int = 300
+    ZAAK_CACHE_SIZE: int = 10_000
+    BULK_MAX_UUIDS: int = 100
+    ZAAKTYPE_CATALOG_TTL: int = 3600
+    ZAKEN_PROJECTION: bool = False
+    PROJECTION_BATCH_SIZE: int = 500
+    # value of the `X-Admin-Token` header of requests to the admin routes,
+    # which do not exist when it is empty
+    ADMIN_TOKEN: str = ""
+    # share of the requests profiled, and the `X-Profile` header value which
+    # profiles a request on demand (disabled when empty)
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_TOKEN: str = ""
+    PROFILE_INTERVAL: float = 0.001
+    PROFILE_STORE_SIZE: int = 20
+    # directory the profiles are written to as well, when set
+    PROFILE_DIR: str = ""
 
     @computed_field
     @property
@@ -0,0 +1,125 @@
+import json
+from enum import Enum
+from typing import Optional
+
+from fastapi import Query
+from sqlalchemy import Table, func, literal_column, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from src.core.cache import TTLCache
+from src.core.changes import change_listener
+from src.core.config import settings
+
+
+class CountMode(str, Enum):
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    CACHED = "cached"
+
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kwargs) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kwargs)
+
+
+count_cache = TTLCache(maxsize=settings.COUNT_CACHE_SIZE, ttl=settings.COUNT_CACHE_TTL)
+change_listener.subscribe(count_cache.clear)
+
+
+def create_count_query(query: Select) -> Select:
+    """
+    Count the rows matched by `query` without its eager loads and ordering.
+    """
+    return query.with_only_columns(func.count(), maintain_column_froms=True).order_by(
+        None
+    )
+
+
+def get_filter_signature(query: Select) -> tuple:
+    compiled = create_count_query(query).compile(dialect=postgresql.dialect())
+    return compiled.string, tuple(sorted(compiled.params.items(), key=str))
+
+
+async def count_exact(session: AsyncSession, query: Select) -> int:
+    return await session.scalar(create_count_query(query))
+
+
+async def count_estimated(session: AsyncSession, query: Select) -> int:
+    """
+    Use the planner statistics instead of scanning the table: `pg_class.reltuples`
+    for an unfiltered table and the row estimate of `EXPLAIN` otherwise.
+    """
+    froms = query.get_final_froms()
+    if query.whereclause is None and len(froms) == 1 and isinstance(froms[0], Table):
+        estimate = await session.scalar(
+            text(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:t AS regclass)"
+            ),
+            {"t": froms[0].fullname},
+        )
+    else:
+        rows = query.with_only_columns(literal_column("1"), maintain_column_froms=True)
+        plan = await session.scalar(Explain(rows.order_by(None)))
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = plan[0]["Plan"]["Plan Rows"]
+
+    # tables that were never analyzed report -1
+    if estimate is None or estimate < 0:
+        return await count_exact(session, query)
+    return int(estimate)
+
+
+async def count_cached(session: AsyncSession, query: Select) -> int:
+    """
+    `count_exact` behind `count_cache`, which every write to the tables of the
+    API clears. The cache is bypassed while those writes cannot be noticed.
+    """
+    if not change_listener.connected:
+        return await count_exact(session, query)
+
+    key = get_filter_signature(query)
+    total = count_cache.get(key)
+    if total is None:
+        version = count_cache.version
+        total = await count_exact(session, query)
+        if count_cache.version == version:
+            count_cache.set(key, total)
+    return total
+
+
+COUNT_STRATEGIES = {
+    CountMode.EXACT: count_exact,
+    CountMode.ESTIMATED: count_estimated,
+    CountMode.CACHED: count_cached,
+}
+
+
+async def count(session: AsyncSession, query: Select, mode: CountMode) -> int:
+    return await COUNT_STRATEGIES[mode](session, query)
+
+
+class CountModeParam:
+    """
+    Dependency resolving the count mode of a route: the `countMode` query
+    parameter wins over the route default, which wins over `settings.COUNT_MODE`.
+    """
+
+    def __init__(self, default: Optional[CountMode] = None):
+        self.default = default
+
+    def __call__(
+        self, count_mode: Optional[CountMode] = Query(None, alias="countMode")
+    ) -> CountMode:
+        return count_mode or self.default or CountMode(settings.COUNT_MODE)
@@ -1,14 +1,123 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from functools import cache
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.util import await_only
 
 from .config import settings
+from .pool import MeteredPool
 
-engine = create_async_engine(
-    str(settings.SQLALCHEMY_DATABASE_URI), echo=False, future=True
+# `statement_timeout` in milliseconds of the connections checked out in this
+# context, None for the default of the server
+statement_timeout: ContextVar[Optional[int]] = ContextVar(
+    "statement_timeout", default=None
 )
 
+
+def apply_statement_timeout(dbapi_connection, connection_record, connection_proxy):
+    """
+    Set the `statement_timeout` of the context on a checked out connection, when
+    its last checkout used another one.
+
+    It is sent on the asyncpg connection itself, outside any transaction, so a
+    rollback of the session does not undo it.
+    """
+    timeout = statement_timeout.get()
+    if connection_record.info.get("statement_timeout") == timeout:
+        return
+    query = (
+        "RESET statement_timeout"
+        if timeout is None
+        else f"SET statement_timeout = {int(timeout)}"
+    )
+    await_only(connection_record.driver_connection.execute(query))
+    connection_record.info["statement_timeout"] = timeout
+
+
+def create_engine(url: str) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        echo=False,
+        future=True,
+        poolclass=MeteredPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE
+        },
+    )
+    event.listen(engine.sync_engine, "checkout", apply_statement_timeout)
+    return engine
+
+
+engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+
 async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+
+@cache
+def autocommit(engine: AsyncEngine) -> AsyncEngine:
+    return engine.execution_options(isolation_level="AUTOCOMMIT")
+
+
+class ReadSession(AsyncSession):
+    """
+    Session of read-only requests, giving its connection back to the pool after
+    every statement. `AsyncSession` buffers the results, so the connection is
+    only checked out while a query runs, not while the response is serialized.
+
+    Bound to an `autocommit` engine, no BEGIN and COMMIT are sent; with READ
+    COMMITTED every statement had a snapshot of its own anyway.
+
+    `scalars` runs through `execute`. A `stream` needs the connection while its
+    result is iterated, so it keeps it until the session ends: streams are read
+    with an `async_session` of their own, see `src.api.export`.
+    """
+
+    @asynccontextmanager
+    async def released(self):
+        try:
+            yield
+        except BaseException:
+            await self.rollback()
+            raise
+        # ends the transaction of the session, keeping the loaded objects
+        await self.commit()
+
+    async def execute(self, *args, **kwargs):
+        async with self.released():
+            return await super().execute(*args, **kwargs)
+
+    async def scalar(self, *args, **kwargs):
+        async with self.released():
+            return await super().scalar(*args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        async with self.released():
+            return await super().get(*args, **kwargs)
+
+    async def get_one(self, *args, **kwargs):
+        async with self.released():
+            return await super().get_one(*args, **kwargs)
+
+    async def refresh(self, *args, **kwargs):
+        async with self.released():
+            return await super().refresh(*args, **kwargs)
+
+    async def run_sync(self, *args, **kwargs):
+        async with self.released():
+            return await super().run_sync(*args, **kwargs)
+
+
+read_session = sessionmaker(class_=ReadSession, expire_on_commit=False)
+
 Base = declarative_base()
 
 
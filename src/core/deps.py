@@ -1,15 +1,13 @@
-from collections.abc import Generator
 from typing import Annotated
 
 from fastapi import Depends
-from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.database import engine
+from src.core.database import get_session
+from src.core.replicas import get_read_session
 
-
-async def get_db() -> Generator[AsyncSession, None, None]:
-    async with AsyncSession(engine) as session:
-        yield session
-
-
-SessionDep = Annotated[AsyncSession, Depends(get_db)]
+# dependencies of a request declaring the same session dependency share the
+# session, and with it the pooled connection
+SessionDep = Annotated[AsyncSession, Depends(get_session)]
+# session of read-only routes, bound to a replica when one is healthy
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_session)]
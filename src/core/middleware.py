@@ -1,27 +1,364 @@
+import asyncio
 import contextvars
 import inspect
+import random
+import re
+import secrets
+import time
+import uuid
+from collections.abc import Iterable
 from functools import wraps
 from typing import Optional
+from urllib.parse import parse_qsl
 
 from fastapi import Request
 from pyinstrument import Profiler
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.cache import TTLCache
+from src.core.changes import change_listener
+from src.core.config import settings
+from src.core.profiling import Profile, profile_store
 
 request_contextvar: contextvars.ContextVar[Optional[Request]] = contextvars.ContextVar(
     "request", default=None
 )
+request_id_contextvar: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "request_id", default=None
+)
+
+# correlation IDs accepted from clients, others are replaced by a new one
+REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9._-]{1,128}")
+
+
+def with_header(message: Message, name: bytes, value: bytes) -> Message:
+    # a copy, as the headers of cached responses are sent again
+    return {**message, "headers": [*message.get("headers", []), (name, value)]}
 
 
-class RequestContextMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        token = request_contextvar.set(request)
+class RequestContextMiddleware:
+    """
+    Pure ASGI middleware setting the `Request` in `request_contextvar` while the
+    app handles it. The body of a `StreamingResponse` is sent from a task
+    started within, which inherits the context.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = request_contextvar.set(Request(scope, receive))
         try:
-            response = await call_next(request)
-            return response
+            await self.app(scope, receive, send)
         finally:
             request_contextvar.reset(token)
 
 
+class RequestIdMiddleware:
+    """
+    Pure ASGI middleware giving every request a correlation ID: its
+    `X-Request-ID` header, or a new one when it has none or an invalid one. The
+    ID is set in `request_id_contextvar` and returned in `X-Request-ID`.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get("x-request-id", "")
+        if not REQUEST_ID_PATTERN.fullmatch(request_id):
+            request_id = uuid.uuid4().hex
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message = with_header(message, b"x-request-id", request_id.encode())
+            await send(message)
+
+        token = request_id_contextvar.set(request_id)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_contextvar.reset(token)
+
+
+class TimingMiddleware:
+    """
+    Pure ASGI middleware adding a `Server-Timing` header with the time the app
+    took to start the response.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                duration = (time.perf_counter() - start) * 1000
+                message = with_header(
+                    message, b"server-timing", f"app;dur={duration:.1f}".encode()
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def get_route_key(
+    scope: Scope, route_names: set[str], vary: tuple[str, ...]
+) -> Optional[tuple]:
+    """
+    Key of a GET request of the routes named `route_names`: the URL with its
+    query parameters sorted, and the request headers in `vary`.
+    """
+    if scope["type"] != "http" or scope["method"] != "GET":
+        return None
+    if not any(
+        route.matches(scope)[0] == Match.FULL
+        for route in scope["app"].routes
+        if getattr(route, "name", None) in route_names
+    ):
+        return None
+
+    headers = Headers(scope=scope)
+    query = parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)
+    return (
+        scope["scheme"],
+        headers.get("host"),
+        scope.get("root_path", ""),
+        scope["path"],
+        tuple(sorted(query)),
+        *(headers.get(header, "").strip().upper() for header in vary),
+    )
+
+
+response_cache = TTLCache(
+    maxsize=settings.RESPONSE_CACHE_SIZE, ttl=settings.RESPONSE_CACHE_TTL
+)
+change_listener.subscribe(response_cache.clear)
+
+
+class ResponseCacheMiddleware:
+    """
+    Serve the GET requests of the routes named `route_names` from
+    `response_cache`, keyed on the URL with its query parameters sorted and the
+    request headers in `vary`.
+
+    Every write to the tables of the API clears the cache of each worker, see
+    `src.core.changes.ChangeListener`. The cache is bypassed while the listener
+    is not connected, and responses computed across a clear are not stored.
+    """
+
+    def __init__(
+        self, app: ASGIApp, route_names: Iterable[str], vary: Iterable[str] = ()
+    ):
+        self.app = app
+        self.route_names = set(route_names)
+        self.vary = tuple(vary)
+
+    def get_key(self, scope: Scope) -> Optional[tuple]:
+        if not change_listener.connected:
+            return None
+        # answered without a body by the ETag of the route
+        if scope["type"] == "http" and "if-none-match" in Headers(scope=scope):
+            return None
+        return get_route_key(scope, self.route_names, self.vary)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        key = self.get_key(scope)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+
+        cached = response_cache.get(key)
+        if cached is not None:
+            status, headers, body = cached
+            await send(
+                {"type": "http.response.start", "status": status, "headers": headers}
+            )
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        version = response_cache.version
+        start: Optional[Message] = None
+        chunks: list[bytes] = []
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if (
+                    not message.get("more_body", False)
+                    and start["status"] == 200
+                    and response_cache.version == version
+                ):
+                    response_cache.set(
+                        key, (start["status"], start["headers"], b"".join(chunks))
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class Flight:
+    def __init__(self):
+        self.done = asyncio.Event()
+        # status, headers and body of the complete response
+        self.response: Optional[tuple[int, list, bytes]] = None
+
+
+class SingleFlightMiddleware:
+    """
+    Let concurrent identical GET requests of the routes named `route_names`
+    share one response. The first request runs the route; requests arriving
+    while it runs wait for it, and are sent a copy of its status, headers and
+    body.
+
+    Requests are identical when their URL, query parameters sorted, and the
+    request headers in `vary` and `If-None-Match` match, and no change was
+    notified since the first one started. Nothing is kept once the response is
+    complete. When the first request fails, the others run the route
+    themselves.
+    """
+
+    def __init__(
+        self, app: ASGIApp, route_names: Iterable[str], vary: Iterable[str] = ()
+    ):
+        self.app = app
+        self.route_names = set(route_names)
+        self.vary = (*vary, "If-None-Match")
+        self.flights: dict[tuple, Flight] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        key = get_route_key(scope, self.route_names, self.vary)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = (*key, change_listener.generation)
+        flight = self.flights.get(key)
+        if flight is not None:
+            await flight.done.wait()
+            if flight.response is None:
+                await self.app(scope, receive, send)
+                return
+            status, headers, body = flight.response
+            await send(
+                {"type": "http.response.start", "status": status, "headers": headers}
+            )
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        flight = self.flights[key] = Flight()
+        start: Optional[Message] = None
+        chunks: list[bytes] = []
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    flight.response = (
+                        start["status"],
+                        start["headers"],
+                        b"".join(chunks),
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            del self.flights[key]
+            flight.done.set()
+
+
+class ProfilerMiddleware:
+    """
+    Pure ASGI middleware profiling whole requests with pyinstrument, including
+    their awaits on the database and the rendering of the response: a share
+    `sample_rate` of the requests, and those with an `X-Profile` header equal to
+    `token`. Paths starting with one of `exclude` are only profiled on demand.
+
+    Profiles are kept in `profile_store`, and their ID is returned in
+    `X-Profile-ID`.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: float = 0.0,
+        token: str = "",
+        interval: float = 0.001,
+        exclude: Iterable[str] = (),
+    ):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.token = token
+        self.interval = interval
+        self.exclude = tuple(exclude)
+
+    def should_profile(self, scope: Scope) -> bool:
+        if self.token:
+            header = Headers(scope=scope).get("x-profile", "")
+            if header and secrets.compare_digest(header, self.token):
+                return True
+        return (
+            self.sample_rate > 0
+            and not scope["path"].startswith(self.exclude)
+            and random.random() < self.sample_rate
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+        status: Optional[int] = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message = with_header(message, b"x-profile-id", profile_id.encode())
+            await send(message)
+
+        profiler = Profiler(interval=self.interval, async_mode="enabled")
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            session = profiler.stop()
+            profile_store.add(
+                Profile(
+                    profile_id,
+                    scope["method"],
+                    scope["path"],
+                    status,
+                    request_id_contextvar.get(),
+                    session,
+                )
+            )
+
+
 def profile_html(filename_prefix="profile"):
     def decorator(func):
         if inspect.iscoroutinefunction(func):
@@ -34,7 +371,10 @@ def profile_html(filename_prefix="profile"):
                 result = await func(*args, **kwargs)
 
                 profiler.stop()
-                _save_profile(profiler, filename_prefix, func.__name__)
+                # rendering and writing the file would block the event loop
+                await asyncio.to_thread(
+                    _save_profile, profiler, filename_prefix, func.__name__
+                )
                 return result
 
             return async_wrapper
@@ -1,26 +1,44 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
-from typing import Optional
+from collections.abc import Awaitable, Sequence
+from typing import Any, Callable, Optional
 
 from fastapi import Query
+from fastapi_pagination.api import (
+    apply_items_transformer,
+    create_page,
+    request,
+    resolve_params,
+)
+from fastapi_pagination.bases import AbstractParams
+from fastapi_pagination.cursor import CursorPage
 from fastapi_pagination.customization import (
     CustomizedPage,
+    UseIncludeTotal,
     UseParamsFields,
+    UseQuotedCursor,
 )
 from fastapi_pagination.default import Page as BasePage
+from fastapi_pagination.ext.sqlalchemy import paginate as sqlalchemy_paginate
+from fastapi_pagination.links.bases import create_links
 from fastapi_pagination.links.default import TAny, resolve_default_links
 from pydantic import Field
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from src.core.counting import CountMode, count
 
 
 class CustomBasePage(BasePage):
-    items: Sequence[TAny] = Field(alias="results")
+    items: list[TAny] = Field(alias="results")
     total: int = Field(alias="count")
     size: int = Field(exclude=True)
     page: int = Field(exclude=True)
     pages: int = Field(exclude=True)
     previous: Optional[str] = Field(default=None)
     next: Optional[str] = Field(default=None)
+    # whether a next page exists, when the count is approximate
+    has_next: Optional[bool] = Field(default=None, exclude=True)
 
     def __init__(self, **data):
         super().__init__(**data)
@@ -28,11 +46,122 @@ class CustomBasePage(BasePage):
 
         self.previous = getattr(links, "prev", None)
         self.next = getattr(links, "next", None)
+        if self.has_next is not None:
+            links = create_links(
+                first={"page": 1},
+                last={"page": self.page},
+                next={"page": self.page + 1} if self.has_next else None,
+                prev=None,
+                only_path=True,
+            )
+            self.next = getattr(links, "next", None)
+
+    @classmethod
+    def create(cls, items, params, *, total=None, count=None, **kwargs):
+        return super().create(
+            items, params, total=count if total is None else total, **kwargs
+        )
+
+
+def resolve_cursor_link(cursor: Optional[str]) -> Optional[str]:
+    if cursor is None:
+        return None
+    return str(request().url.include_query_params(cursor=cursor))
+
+
+class CustomCursorBasePage(CursorPage):
+    """
+    Keyset page in the same shape as `CustomBasePage`: the opaque cursor is only
+    exposed through the absolute `next`/`previous` links, like DRF's
+    `CursorPagination`.
+    """
+
+    items: list[TAny] = Field(alias="results")
+    total: Optional[int] = Field(default=None, alias="count")
+    current_page: Optional[str] = Field(default=None, exclude=True)
+    current_page_backwards: Optional[str] = Field(default=None, exclude=True)
+    previous_page: Optional[str] = Field(default=None, exclude=True)
+    next_page: Optional[str] = Field(default=None, exclude=True)
+    previous: Optional[str] = Field(default=None)
+    next: Optional[str] = Field(default=None)
+
+    def __init__(self, **data):
+        super().__init__(**data)
+
+        self.previous = resolve_cursor_link(self.previous_page)
+        self.next = resolve_cursor_link(self.next_page)
+
+    @classmethod
+    def create(cls, items, params, *, total=None, count=None, **kwargs):
+        return super().create(
+            items, params, total=count if total is None else total, **kwargs
+        )
 
 
 Page = CustomizedPage[
     CustomBasePage[TAny],
+    UseIncludeTotal(False),
     UseParamsFields(
         size=Query(100, ge=1, le=1000, alias="pageSize"),
     ),
 ]
+
+KeysetPage = CustomizedPage[
+    CustomCursorBasePage[TAny],
+    UseIncludeTotal(False),
+    UseQuotedCursor(False),
+    UseParamsFields(
+        size=Query(100, ge=1, le=1000, alias="pageSize"),
+    ),
+]
+
+
+Loader = Callable[[AsyncSession, Select, int, int], Awaitable[Sequence[Any]]]
+
+
+async def load_items(
+    session: AsyncSession, query: Select, limit: int, offset: int
+) -> Sequence[Any]:
+    result = await session.execute(query.limit(limit).offset(offset))
+    return result.unique().scalars().all()
+
+
+async def paginate(
+    session: AsyncSession,
+    query: Select,
+    params: Optional[AbstractParams] = None,
+    *,
+    count_mode: CountMode = CountMode.EXACT,
+    loader: Optional[Loader] = None,
+    **kwargs: Any,
+) -> Any:
+    """
+    Paginate `query`, filling the `count` of the page with the given count strategy
+    instead of the eager-loaded `SELECT count(*)` of fastapi-pagination.
+
+    A `loader` takes over fetching the items of a limit-offset page from the
+    unpaginated `query`. With an approximate count such a page is fetched with
+    one row more, which tells whether there is a next page; the count is not
+    used for the links then.
+    """
+    params = resolve_params(params)
+    total = await count(session, query, count_mode)
+    raw_params = params.to_raw_params()
+    approximate = count_mode != CountMode.EXACT and raw_params.type == "limit-offset"
+    if loader is None and approximate:
+        loader = load_items
+    if loader is None:
+        return await sqlalchemy_paginate(
+            session, query, params, additional_data={"count": total}, **kwargs
+        )
+
+    raw_params = raw_params.as_limit_offset()
+    limit, offset = raw_params.limit, raw_params.offset
+    has_next = None
+    if approximate:
+        items = await loader(session, query, limit + 1, offset)
+        items, has_next = items[:limit], len(items) > limit
+    else:
+        items = await loader(session, query, limit, offset)
+    items = await apply_items_transformer(items, kwargs.get("transformer"), async_=True)
+    return create_page(items, params=params, count=total, has_next=has_next)
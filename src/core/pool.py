@@ -0,0 +1,88 @@
+import bisect
+import os
+import time
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# upper bounds in seconds of the buckets of the checkout wait histogram
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def as_dict(self) -> dict[str, Any]:
+        """
+        Cumulative counts per upper bound, the way Prometheus exposes them.
+        """
+        bounds = [str(bound) for bound in self.buckets] + ["+Inf"]
+        cumulative, total = {}, 0
+        for bound, count in zip(bounds, self.counts):
+            total += count
+            cumulative[bound] = total
+        return {"buckets": cumulative, "count": total, "sum": self.sum}
+
+
+class MeteredPool(AsyncAdaptedQueuePool):
+    """
+    Queue pool recording how long checkouts wait for a connection, including
+    the time to open a new one, how long connections stay checked out, and how
+    many checkouts time out.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_times = Histogram(WAIT_BUCKETS)
+        self.hold_times = Histogram(WAIT_BUCKETS)
+        self.timeouts = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.wait_times.observe(time.perf_counter() - start)
+        record.info["checked_out_at"] = time.perf_counter()
+        return record
+
+    def _do_return_conn(self, record):
+        checked_out_at = record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            self.hold_times.observe(time.perf_counter() - checked_out_at)
+        super()._do_return_conn(record)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.wait_times, pool.hold_times = self.wait_times, self.hold_times
+        pool.timeouts = self.timeouts
+        return pool
+
+
+def get_pool_metrics(pool: MeteredPool) -> dict[str, Any]:
+    """
+    Metrics of the pool of this worker process. Every uvicorn worker has a pool
+    of its own, opening up to `pool_size + max_overflow` connections.
+    """
+    return {
+        "pid": os.getpid(),
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "timeouts": pool.timeouts,
+        "wait_seconds": pool.wait_times.as_dict(),
+        "hold_seconds": pool.hold_times.as_dict(),
+    }
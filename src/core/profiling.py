@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import os
+from collections import OrderedDict
+from typing import Any, Literal, Optional
+
+from pyinstrument.renderers import HTMLRenderer, SpeedscopeRenderer
+from pyinstrument.session import Session
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ProfileFormat = Literal["html", "speedscope"]
+
+RENDERERS = {"html": HTMLRenderer, "speedscope": SpeedscopeRenderer}
+
+
+class Profile:
+    def __init__(
+        self,
+        id: str,
+        method: str,
+        path: str,
+        status: Optional[int],
+        request_id: Optional[str],
+        session: Session,
+    ):
+        self.id = id
+        self.method = method
+        self.path = path
+        self.status = status
+        self.request_id = request_id
+        self.session = session
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "request_id": self.request_id,
+            "start_time": self.session.start_time,
+            "duration": self.session.duration,
+            "samples": self.session.sample_count,
+        }
+
+    def render(self, format: ProfileFormat) -> str:
+        # CPU bound, keep it off the event loop
+        return RENDERERS[format]().render(self.session)
+
+    def write(self, directory: str) -> None:
+        path = os.path.join(directory, f"profile_{self.id}.html")
+        with open(path, "w") as f:
+            f.write(self.render("html"))
+
+
+class ProfileStore:
+    """
+    The last `maxsize` request profiles of this worker process, rendered on
+    demand. When `directory` is set every profile is written there as HTML as
+    well, in a thread.
+    """
+
+    def __init__(self, maxsize: int, directory: str = ""):
+        self.maxsize = maxsize
+        self.directory = directory
+        self.profiles: OrderedDict[str, Profile] = OrderedDict()
+        self._writes: set[asyncio.Task] = set()
+
+    def add(self, profile: Profile) -> None:
+        self.profiles[profile.id] = profile
+        while len(self.profiles) > self.maxsize:
+            self.profiles.popitem(last=False)
+
+        if self.directory:
+            task = asyncio.create_task(self.write(profile))
+            # the loop keeps weak references to tasks only
+            self._writes.add(task)
+            task.add_done_callback(self._writes.discard)
+
+    async def write(self, profile: Profile) -> None:
+        try:
+            await asyncio.to_thread(profile.write, self.directory)
+        except OSError as exc:
+            logger.warning("Could not write profile %s: %r", profile.id, exc)
+
+    def get(self, id: str) -> Optional[Profile]:
+        return self.profiles.get(id)
+
+    def list(self) -> list[Profile]:
+        # newest first
+        return list(reversed(self.profiles.values()))
+
+
+profile_store = ProfileStore(settings.PROFILE_STORE_SIZE, settings.PROFILE_DIR)
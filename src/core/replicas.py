@@ -0,0 +1,197 @@
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy import make_url, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.core.changes import change_listener
+from src.core.config import settings
+from src.core.database import autocommit, create_engine, engine, read_session
+
+logger = logging.getLogger(__name__)
+
+# seconds the replica is behind the primary; a replica which replayed all the
+# WAL it received is up to date, however long ago the last transaction was, as
+# long as it is still receiving it. NULL when it is not streaming from the
+# primary: it stopped at the last WAL it received. The status of the WAL
+# receiver is only visible to roles with pg_read_all_stats.
+LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (
+            SELECT FROM pg_stat_wal_receiver WHERE status = 'streaming'
+        ) THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE coalesce(
+            extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END::float
+    """
+)
+
+
+# position in the WAL the primary wrote up to, as a number of bytes
+PRIMARY_POSITION_QUERY = text(
+    "SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), '0/0')::bigint"
+)
+
+# position in the WAL a replica replayed up to; a server which is not in
+# recovery has replayed all it wrote
+REPLAY_POSITION_QUERY = text(
+    """
+    SELECT pg_wal_lsn_diff(
+        coalesce(pg_last_wal_replay_lsn(), pg_current_wal_lsn()), '0/0'
+    )::bigint
+    """
+)
+
+
+class Replica:
+    def __init__(self, url: str):
+        self.engine = create_engine(
+            make_url(url)
+            .set(drivername="postgresql+asyncpg")
+            .render_as_string(hide_password=False)
+        )
+        self.healthy = False
+        self.lag: Optional[float] = None
+        # WAL position it was last seen to have replayed
+        self.position = 0
+
+    async def get_position(self) -> int:
+        async with self.engine.connect() as connection:
+            self.position = await connection.scalar(REPLAY_POSITION_QUERY)
+        return self.position
+
+
+class ReplicaSet:
+    """
+    Routes the sessions of read-only routes to the healthy replica with the
+    fewest checked-out connections, taking turns between equals.
+
+    Replicas are checked every `interval` seconds and skipped when they cannot
+    be reached, are not streaming from the primary, or lag more than `max_lag`
+    seconds behind; without a healthy replica reads go to the primary.
+
+    The caches cleared by a change notification must not be refilled from a
+    replica which has not replayed the change yet. So after a notification the
+    WAL position of the primary is read once, and a replica serves reads again
+    once it has replayed up to there, which is looked up when it is picked.
+    Until the position is known reads go to the primary.
+    """
+
+    def __init__(self, urls: list[str], max_lag: float, interval: float):
+        self.replicas = [Replica(url) for url in urls]
+        self.max_lag = max_lag
+        self.interval = interval
+        self.turn = 0
+        # WAL position replicas must have replayed, None while it is read
+        self.required: Optional[int] = 0
+        self.changed: Optional[asyncio.Event] = None
+        self._tasks: list[asyncio.Task] = []
+        change_listener.subscribe(self.on_change)
+
+    def on_change(self) -> None:
+        if not self.replicas:
+            return
+        self.required = None
+        if self.changed is not None:
+            self.changed.set()
+
+    async def read_required(self) -> None:
+        """
+        Set `required` to the WAL position of the primary. A change notified
+        while it is read may have been written after it, so it is read again.
+        """
+        while True:
+            await self.changed.wait()
+            self.changed.clear()
+            try:
+                async with engine.connect() as connection:
+                    position = await connection.scalar(PRIMARY_POSITION_QUERY)
+            except Exception as exc:
+                logger.warning("Cannot read the WAL position of the primary: %r", exc)
+                await asyncio.sleep(self.interval)
+                self.changed.set()
+                continue
+            if not self.changed.is_set():
+                self.required = position
+
+    async def check(self, replica: Replica) -> None:
+        try:
+            async with asyncio.timeout(self.interval):
+                async with replica.engine.connect() as connection:
+                    lag = await connection.scalar(LAG_QUERY)
+                    replica.position = await connection.scalar(REPLAY_POSITION_QUERY)
+            if lag is None:
+                raise ConnectionError("not streaming from the primary")
+        except Exception as exc:
+            if replica.healthy or replica.lag is None:
+                logger.warning("Replica %s is unavailable: %r", replica.engine.url, exc)
+            replica.healthy, replica.lag = False, None
+            return
+        replica.lag = lag
+        replica.healthy = lag <= self.max_lag
+
+    async def check_all(self) -> None:
+        await asyncio.gather(*(self.check(replica) for replica in self.replicas))
+
+    async def start(self) -> None:
+        if not self.replicas:
+            return
+        self.changed = asyncio.Event()
+        if self.required is None:
+            self.changed.set()
+        await self.check_all()
+        self._tasks = [
+            asyncio.create_task(self.run()),
+            asyncio.create_task(self.read_required()),
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.check_all()
+
+    def get_replica(self) -> Optional[Replica]:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        self.turn = (self.turn + 1) % len(healthy)
+        healthy = healthy[self.turn :] + healthy[: self.turn]
+        return min(healthy, key=lambda replica: replica.engine.pool.checkedout())
+
+    async def get_engine(self) -> AsyncEngine:
+        replica = self.get_replica()
+        required = self.required
+        if replica is None or required is None:
+            return engine
+        if replica.position < required:
+            try:
+                async with asyncio.timeout(self.interval):
+                    await replica.get_position()
+            except Exception as exc:
+                logger.warning("Replica %s is unavailable: %r", replica.engine.url, exc)
+                return engine
+            if replica.position < required:
+                return engine
+        return replica.engine
+
+
+replica_set = ReplicaSet(
+    settings.DB_REPLICAS, settings.REPLICA_MAX_LAG, settings.REPLICA_CHECK_INTERVAL
+)
+
+
+async def get_read_session():
+    bind = autocommit(await replica_set.get_engine())
+    async with read_session(bind=bind) as session:
+        yield session
@@ -0,0 +1,28 @@
+from typing import Any, Optional
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+
+class PydanticResponse(JSONResponse):
+    """
+    JSON response of a pydantic model, or of content validated with `adapter`,
+    serialized to bytes in one pass by pydantic-core.
+
+    Returned from a route, it bypasses the `response_model` handling of FastAPI,
+    which serializes the validated content to Python objects first and then
+    encodes those with the `json` module.
+    """
+
+    def __init__(
+        self, content: Any, adapter: Optional[TypeAdapter] = None, **kwargs: Any
+    ):
+        self.adapter = adapter
+        super().__init__(content, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        if self.adapter is not None:
+            return self.adapter.dump_json(content, by_alias=True)
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content, by_alias=True)
+        return super().render(content)
@@ -0,0 +1,44 @@
+import asyncio
+import logging
+
+from sqlalchemy import Index
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.schema import CreateIndex
+
+import src.api.components.catalogi.models.zaaktype  # noqa: F401
+import src.api.components.zaken.models.identification  # noqa: F401
+import src.api.components.zaken.models.zaken  # noqa: F401
+from src.core.database import Base, engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def get_managed_indexes() -> list[Index]:
+    """
+    Open Zaak owns the schema, so only the indexes declared with
+    `info={"managed": True}` are created by this service.
+    """
+    return [
+        index
+        for table in Base.metadata.sorted_tables
+        for index in sorted(table.indexes, key=lambda index: index.name)
+        if index.info.get("managed")
+    ]
+
+
+async def create_indexes(db_engine: AsyncEngine) -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    async with db_engine.connect() as connection:
+        connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        for index in get_managed_indexes():
+            logger.info("Creating index %s", index.name)
+            await connection.execute(CreateIndex(index, if_not_exists=True))
+
+
+def main() -> None:
+    asyncio.run(create_indexes(engine))
+
+
+if __name__ == "__main__":
+    main()
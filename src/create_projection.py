@@ -0,0 +1,41 @@
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.api.components.zaken.projection import (
+    get_projection_ddl,
+    get_projection_drop_ddl,
+    projection,
+)
+from src.core.config import settings
+from src.core.database import engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def create_projection(db_engine: AsyncEngine) -> None:
+    async with db_engine.begin() as connection:
+        logger.info("Creating %s", projection.name)
+        await connection.run_sync(projection.create, checkfirst=True)
+        for statement in get_projection_ddl():
+            await connection.execute(statement)
+
+
+async def drop_projection_triggers(db_engine: AsyncEngine) -> None:
+    async with db_engine.begin() as connection:
+        logger.info("%s is disabled, dropping its triggers", projection.name)
+        for statement in get_projection_drop_ddl():
+            await connection.execute(statement)
+
+
+def main() -> None:
+    if settings.ZAKEN_PROJECTION:
+        asyncio.run(create_projection(engine))
+    else:
+        asyncio.run(drop_projection_triggers(engine))
+
+
+if __name__ == "__main__":
+    main()
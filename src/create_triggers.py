@@ -0,0 +1,30 @@
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+import src.api.components.catalogi.models.zaaktype  # noqa: F401
+import src.api.components.zaken.models.identification  # noqa: F401
+import src.api.components.zaken.models.zaken  # noqa: F401
+from src.core.changes import changes, get_tracked_tables, get_tracking_ddl
+from src.core.database import engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def create_triggers(db_engine: AsyncEngine) -> None:
+    async with db_engine.begin() as connection:
+        await connection.run_sync(changes.create, checkfirst=True)
+        for statement in get_tracking_ddl():
+            await connection.execute(statement)
+    for table in get_tracked_tables():
+        logger.info("Tracking changes of %s", table.name)
+
+
+def main() -> None:
+    asyncio.run(create_triggers(engine))
+
+
+if __name__ == "__main__":
+    main()
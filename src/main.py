@@ -1,13 +1,61 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi_pagination import add_pagination
 
+from src.api.components.catalogi.catalog import zaaktype_catalog
+from src.api.components.zaken.projection import projector
+from src.api.conditional import VARY
 from src.api.router import api_router
+from src.api.urls import url_templates
+from src.core.changes import change_listener
 from src.core.config import settings
-from src.core.middleware import RequestContextMiddleware
+from src.core.middleware import (
+    ProfilerMiddleware,
+    RequestContextMiddleware,
+    RequestIdMiddleware,
+    ResponseCacheMiddleware,
+    SingleFlightMiddleware,
+    TimingMiddleware,
+)
+from src.core.replicas import replica_set
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await change_listener.start()
+    await replica_set.start()
+    await zaaktype_catalog.start()
+    if settings.ZAKEN_PROJECTION:
+        await projector.start()
+    yield
+    await projector.stop()
+    await zaaktype_catalog.stop()
+    await replica_set.stop()
+    await change_listener.stop()
+
 
-app = FastAPI(title=settings.PROJECT_NAME)
+app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
 app.include_router(api_router)
+url_templates.compile(app.routes)
 
 add_pagination(app)
 
 app.add_middleware(RequestContextMiddleware)
+app.add_middleware(
+    SingleFlightMiddleware, route_names=("zaken-list", "zaak-detail"), vary=VARY
+)
+app.add_middleware(
+    ResponseCacheMiddleware, route_names=("zaken-list", "zaak-detail"), vary=VARY
+)
+# outside the cache and the shared flights, which send the headers of another
+# request again
+app.add_middleware(TimingMiddleware)
+app.add_middleware(
+    ProfilerMiddleware,
+    sample_rate=settings.PROFILE_SAMPLE_RATE,
+    token=settings.PROFILE_TOKEN,
+    interval=settings.PROFILE_INTERVAL,
+    exclude=("/_admin",),
+)
+app.add_middleware(RequestIdMiddleware)
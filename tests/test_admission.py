@@ -0,0 +1,103 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from src.core.admission import Limiter
+from src.core.config import settings
+from src.core.database import async_session, engine
+from src.main import app
+from tests.utils import DatabaseTestCase, get_admission
+
+LIST = "/zaken/api/v1/zaken?pageSize=100&page=5"
+# an unknown entity tag bypasses the response cache
+NO_CACHE = {"If-None-Match": '"admission"'}
+
+
+class TestLimiter(unittest.IsolatedAsyncioTestCase):
+    async def test_limit(self):
+        limiter = Limiter(2, 0, 1)
+        self.assertTrue(await limiter.acquire())
+        self.assertTrue(await limiter.acquire())
+        self.assertFalse(await limiter.acquire())
+        limiter.release()
+        self.assertTrue(await limiter.acquire())
+
+    async def test_queue(self):
+        limiter = Limiter(1, 2, 1)
+        await limiter.acquire()
+        waiting = [asyncio.create_task(limiter.acquire()) for _ in range(2)]
+        await asyncio.sleep(0)
+        # the queue is full
+        self.assertFalse(await limiter.acquire())
+
+        limiter.release()
+        self.assertTrue(await waiting[0])
+        self.assertFalse(waiting[1].done())
+        limiter.release()
+        self.assertTrue(await waiting[1])
+        self.assertEqual(limiter.active, 1)
+
+    async def test_timeout(self):
+        limiter = Limiter(1, 1, 0.01)
+        await limiter.acquire()
+        self.assertFalse(await limiter.acquire())
+        self.assertFalse(limiter.waiters)
+
+        limiter.release()
+        self.assertEqual(limiter.active, 0)
+
+    async def test_cancelled(self):
+        limiter = Limiter(1, 1, 1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+        self.assertFalse(limiter.waiters)
+
+
+class TestAdmission(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = self.enterContext(TestClient(app))
+
+    def test_over_capacity(self):
+        admission = get_admission("zaken-list")
+        with mock.patch.object(admission, "limiter", Limiter(0, 0, 0)):
+            response = self.client.get(LIST, headers=NO_CACHE)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(
+            response.headers["Retry-After"], str(settings.ADMISSION_RETRY_AFTER)
+        )
+        self.assertEqual(self.client.get(LIST).status_code, 200)
+
+    def test_statement_timeout(self):
+        admission = get_admission("zaken-list")
+        with mock.patch.object(admission, "statement_timeout", 1):
+            response = self.client.get(LIST, headers=NO_CACHE)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(admission.limiter.active, 0)
+
+        async def get_statement_timeouts() -> set[str]:
+            # checks out every pooled connection at once
+            sessions = [async_session() for _ in range(engine.pool.checkedin())]
+            try:
+                return {
+                    await session.scalar(text("SHOW statement_timeout"))
+                    for session in sessions
+                }
+            finally:
+                for session in sessions:
+                    await session.close()
+
+        # connections of other requests and background tasks are not affected
+        self.assertEqual(self.client.get(LIST, headers=NO_CACHE).status_code, 200)
+        self.assertNotIn("1ms", self.client.portal.call(get_statement_timeouts))
+
+
+if __name__ == "__main__":
+    unittest.main()
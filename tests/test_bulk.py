@@ -0,0 +1,72 @@
+import asyncio
+import time
+import unittest
+import uuid
+
+import requests
+
+from src.core.config import settings
+from tests.utils import touch_zaak
+
+BASE = "http://localhost:8001/zaken/api/v1"  # FastApi
+BULK = BASE + "/zaken/_bulk"
+# an unknown entity tag bypasses the response cache of the detail route
+NO_CACHE = {"If-None-Match": '"benchmark"'}
+
+
+class TestBulk(unittest.TestCase):
+    def setUp(self):
+        self.zaken = requests.get(BASE + "/zaken?pageSize=100").json()["results"]
+
+    def test_request_order(self):
+        zaken = self.zaken[::-3]
+        unknown = str(uuid.uuid4())
+        uuids = [zaak["uuid"] for zaak in zaken]
+        uuids.insert(2, unknown)
+
+        response = requests.post(BULK, json={"uuids": uuids})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["results"], zaken[:2] + [None] + zaken[2:])
+        self.assertEqual(data["notFound"], [unknown])
+
+    def test_duplicates(self):
+        zaak = self.zaken[0]
+        response = requests.post(BULK, json={"uuids": [zaak["uuid"]] * 2})
+        self.assertEqual(response.json()["results"], [zaak, zaak])
+
+    def test_limit(self):
+        uuids = [str(uuid.uuid4()) for _ in range(settings.BULK_MAX_UUIDS + 1)]
+        response = requests.post(BULK, json={"uuids": uuids})
+        self.assertEqual(response.status_code, 422)
+        response = requests.post(BULK, json={"uuids": []})
+        self.assertEqual(response.status_code, 422)
+
+    def clear_caches(self) -> None:
+        # every write clears the caches of the server, once it is notified
+        asyncio.run(touch_zaak())
+        time.sleep(0.2)
+
+    def test_benchmark(self):
+        uuids = [zaak["uuid"] for zaak in self.zaken]
+
+        self.clear_caches()
+        start = time.perf_counter()
+        for zaak in self.zaken:
+            requests.get(zaak["url"], headers=NO_CACHE)
+        sequential = time.perf_counter() - start
+
+        self.clear_caches()
+        start = time.perf_counter()
+        response = requests.post(BULK, json={"uuids": uuids})
+        bulk = time.perf_counter() - start
+        self.assertEqual(response.json()["results"], self.zaken)
+
+        print(
+            f"{len(uuids)} zaken: sequential detail {sequential * 1000:.0f} ms, "
+            f"bulk {bulk * 1000:.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import unittest
+
+import asyncpg
+import httpx
+from fastapi.testclient import TestClient
+
+from src.api.components.catalogi.catalog import zaaktype_catalog
+from src.api.components.zaken.projection import refresh_stale
+from src.core.changes import change_listener
+from src.core.database import async_session
+from src.main import app
+from tests.utils import (
+    DSN,
+    AsyncDatabaseTestCase,
+    DatabaseTestCase,
+    touch_zaaktype,
+    wait_for,
+)
+
+
+class TestZaakTypeCatalog(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = self.enterContext(TestClient(app))
+        self.assertTrue(wait_for(lambda: change_listener.connected))
+
+    def test_zaken(self):
+        self.assertTrue(zaaktype_catalog.by_id)
+        zaken = self.client.get("/zaken/api/v1/zaken?pageSize=100").json()["results"]
+        urls = {
+            self.client.get(f"/catalogi/api/v1/zaaktypen/{zaaktype.uuid}").json()["url"]
+            for zaaktype in zaaktype_catalog.by_id.values()
+        }
+        for zaak in zaken:
+            self.assertIn(zaak["zaaktype"], urls)
+
+    def test_not_found(self):
+        response = self.client.get(
+            "/catalogi/api/v1/zaaktypen/00000000-0000-0000-0000-000000000000"
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_refresh_on_change(self):
+        zaaktype_catalog.by_id = {}
+        asyncio.run(touch_zaaktype())
+        self.assertTrue(wait_for(lambda: zaaktype_catalog.by_id))
+
+    def test_refresh_on_miss(self):
+        loaded = len(zaaktype_catalog.by_id)
+        zaaktype_catalog.by_id, zaaktype_catalog.by_uuid = {}, {}
+        response = self.client.get("/zaken/api/v1/zaken?pageSize=1&fields=zaaktype")
+        self.assertIsNotNone(response.json()["results"][0]["zaaktype"])
+        self.assertTrue(wait_for(lambda: len(zaaktype_catalog.by_id) == loaded))
+
+
+class TestCreatedZaakType(AsyncDatabaseTestCase):
+    """
+    Runs without the lifespan of the app, so the catalog is not refreshed when
+    the zaaktype is created.
+    """
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        await zaaktype_catalog.refresh()
+        self.addAsyncCleanup(zaaktype_catalog.refresh)
+        self.connection = await asyncpg.connect(DSN)
+        self.addAsyncCleanup(self.connection.close)
+
+        await self.connection.execute(
+            "CREATE TEMPORARY TABLE new_zaaktype AS "
+            "SELECT * FROM catalogi_zaaktype ORDER BY id LIMIT 1"
+        )
+        self.zaaktype_id, self.zaaktype_uuid = await self.connection.fetchrow(
+            "UPDATE new_zaaktype SET "
+            "id = (SELECT max(id) + 1 FROM catalogi_zaaktype), "
+            "uuid = gen_random_uuid() RETURNING id, uuid"
+        )
+        await self.connection.execute(
+            "INSERT INTO catalogi_zaaktype SELECT * FROM new_zaaktype"
+        )
+        self.addAsyncCleanup(
+            self.connection.execute,
+            "DELETE FROM catalogi_zaaktype WHERE id = $1",
+            self.zaaktype_id,
+        )
+
+        self.zaak_id, self.zaak_uuid, zaaktype_id = await self.connection.fetchrow(
+            "SELECT identificatie_ptr_id, uuid, _zaaktype_id FROM zaken_zaak "
+            "ORDER BY identificatie_ptr_id DESC LIMIT 1"
+        )
+        # renders the documents of the projection the writes made stale
+        self.addAsyncCleanup(self.refresh_projection)
+        self.addAsyncCleanup(self.set_zaaktype, zaaktype_id)
+        await self.set_zaaktype(self.zaaktype_id)
+
+    async def set_zaaktype(self, zaaktype_id: int) -> None:
+        await self.connection.execute(
+            "UPDATE zaken_zaak SET _zaaktype_id = $1 WHERE identificatie_ptr_id = $2",
+            zaaktype_id,
+            self.zaak_id,
+        )
+
+    async def refresh_projection(self) -> None:
+        async with async_session() as session:
+            while await refresh_stale(session, 500):
+                pass
+
+    def forget(self) -> None:
+        zaaktype_catalog.by_id.pop(self.zaaktype_id, None)
+        zaaktype_catalog.by_uuid.pop(self.zaaktype_uuid, None)
+
+    async def test_rendered_url(self):
+        self.assertNotIn(self.zaaktype_id, zaaktype_catalog.by_id)
+        url = f"http://test/catalogi/api/v1/zaaktypen/{self.zaaktype_uuid}"
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            for path in (
+                f"/zaken/api/v1/zaken/{self.zaak_uuid}",
+                f"/zaken/api/v1/zaken?zaaktype={url}",
+                f"/zaken/api/v1/zaken?zaaktype={url}&loadStrategy=aggregated",
+                f"/zaken/api/v1/zaken?zaaktype={url}&loadStrategy=core",
+                f"/zaken/api/v1/zaken-keyset-page?zaaktype={url}",
+                f"/zaken/api/v1/zaken-export?zaaktype={url}",
+            ):
+                with self.subTest(path):
+                    self.forget()
+                    response = await client.get(path)
+                    self.assertEqual(response.status_code, 200)
+                    data = (
+                        json.loads(response.content.splitlines()[0])
+                        if "export" in path
+                        else response.json()
+                    )
+                    zaak = data["results"][0] if "results" in data else data
+                    self.assertEqual(zaak["zaaktype"], url)
+                    self.assertIn(self.zaaktype_id, zaaktype_catalog.by_id)
+
+            self.forget()
+            response = await client.get(
+                f"/zaken/api/v1/zaken?zaaktype={url}&expand=zaaktype"
+            )
+            self.assertEqual(response.status_code, 200)
+            (zaak,) = response.json()["results"]
+            self.assertEqual(zaak["_expand"]["zaaktype"]["url"], url)
+
+    async def test_deleted(self):
+        async with async_session() as session:
+            await zaaktype_catalog.ensure(session, [self.zaaktype_id, -1])
+        self.assertIn(self.zaaktype_id, zaaktype_catalog.by_id)
+        self.assertNotIn(-1, zaaktype_catalog.by_id)
+        self.assertIsNone(zaaktype_catalog.get(-1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import asyncio
+import statistics
+import time
+import unittest
+
+import requests
+
+from tests.utils import touch_zaak
+
+BASE = "http://localhost:8001/zaken/api/v1"  # FastApi
+LIST = BASE + "/zaken?pageSize=100"
+ROUNDS = 20
+
+
+class TestConditionalRequests(unittest.TestCase):
+    def get_etag(self, url: str, **headers) -> str:
+        response = requests.get(url, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        return response.headers["ETag"]
+
+    def test_not_modified(self):
+        etag = self.get_etag(LIST)
+        response = requests.get(LIST, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response.headers["ETag"], etag)
+
+        response = requests.get(LIST, headers={"If-None-Match": f'"other", {etag}'})
+        self.assertEqual(response.status_code, 304)
+
+    def test_representations(self):
+        etag = self.get_etag(LIST)
+        self.assertNotEqual(etag, self.get_etag(LIST + "&page=2"))
+        self.assertNotEqual(etag, self.get_etag(LIST, **{"Accept-Crs": "EPSG:28992"}))
+        self.assertNotEqual(etag, self.get_etag(BASE + "/zaken-keyset-page"))
+
+        response = requests.get(LIST + "&page=2", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_modified(self):
+        etag = self.get_etag(LIST)
+
+        asyncio.run(touch_zaak())
+
+        response = requests.get(LIST, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_timing(self):
+        etag = self.get_etag(LIST)
+        timings = {"200": [], "304": []}
+        for _ in range(ROUNDS):
+            for name, headers in (("200", {}), ("304", {"If-None-Match": etag})):
+                start = time.perf_counter()
+                response = requests.get(LIST, headers=headers)
+                timings[name].append(time.perf_counter() - start)
+                self.assertEqual(response.status_code, int(name))
+
+        for name, values in timings.items():
+            print(f"{name}: median {statistics.median(values) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    unittest.main()
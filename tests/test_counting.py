@@ -0,0 +1,138 @@
+import unittest
+from unittest import mock
+
+import httpx
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.components.zaken.models.zaken import Zaak
+from src.api.components.zaken.queries import BASE_QUERY
+from src.core.counting import (
+    CountMode,
+    count,
+    count_cache,
+    create_count_query,
+    get_filter_signature,
+)
+from src.core.changes import change_listener
+from src.core.database import engine
+from src.main import app
+from tests.utils import AsyncDatabaseTestCase
+
+LIST = "/zaken/api/v1/zaken?pageSize=1"
+
+
+def compile_query(query) -> str:
+    return " ".join(str(query.compile(dialect=postgresql.dialect())).split())
+
+
+class TestCountQuery(unittest.TestCase):
+    def test_unfiltered(self):
+        self.assertEqual(
+            compile_query(create_count_query(BASE_QUERY)),
+            "SELECT count(*) AS count_1 FROM zaken_zaak",
+        )
+
+    def test_filtered(self):
+        query = BASE_QUERY.where(Zaak.archiefstatus == "gearchiveerd")
+        self.assertEqual(
+            compile_query(create_count_query(query)),
+            "SELECT count(*) AS count_1 FROM zaken_zaak "
+            "WHERE zaken_zaak.archiefstatus = %(archiefstatus_1)s",
+        )
+
+
+class TestCountStrategies(AsyncDatabaseTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.session = AsyncSession(engine)
+        self.addAsyncCleanup(self.session.close)
+        # planner statistics for the estimate
+        await self.session.execute(text("ANALYZE zaken_zaak"))
+        self.total = await self.session.scalar(select(func.count()).select_from(Zaak))
+        count_cache.clear()
+
+    async def test_exact(self):
+        self.assertEqual(
+            await count(self.session, BASE_QUERY, CountMode.EXACT), self.total
+        )
+
+    async def test_estimated(self):
+        estimate = await count(self.session, BASE_QUERY, CountMode.ESTIMATED)
+        self.assertAlmostEqual(estimate, self.total, delta=self.total * 0.1)
+
+        query = BASE_QUERY.where(Zaak.archiefstatus == "gearchiveerd")
+        estimate = await count(self.session, query, CountMode.ESTIMATED)
+        self.assertGreaterEqual(estimate, 0)
+        self.assertLessEqual(estimate, self.total)
+
+    async def test_cached(self):
+        with mock.patch.object(change_listener, "connected", True):
+            total = await count(self.session, BASE_QUERY, CountMode.CACHED)
+        self.assertEqual(total, self.total)
+        self.assertEqual(count_cache.get(get_filter_signature(BASE_QUERY)), total)
+
+    async def test_cached_disconnected(self):
+        count_cache.set(get_filter_signature(BASE_QUERY), self.total + 1)
+        with mock.patch.object(change_listener, "connected", False):
+            total = await count(self.session, BASE_QUERY, CountMode.CACHED)
+        self.assertEqual(total, self.total)
+
+    async def test_list(self):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            for mode in CountMode:
+                with self.subTest(mode):
+                    response = await client.get(f"{LIST}&countMode={mode.value}")
+                    self.assertEqual(response.status_code, 200)
+                    self.assertAlmostEqual(
+                        response.json()["count"], self.total, delta=self.total * 0.1
+                    )
+
+
+class TestApproximateLinks(AsyncDatabaseTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        async with AsyncSession(engine) as session:
+            self.total = await session.scalar(select(func.count()).select_from(Zaak))
+        self.client = await self.enterAsyncContext(
+            httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://test"
+            )
+        )
+
+    async def get_page(self, page: int, load_strategy: str) -> dict:
+        response = await self.client.get(
+            f"/zaken/api/v1/zaken?pageSize=50&page={page}"
+            f"&countMode=estimated&loadStrategy={load_strategy}"
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    async def test_links_from_rows(self):
+        last = -(-self.total // 50)
+        for estimate in (1, self.total * 10):
+
+            async def estimated(session, query, mode):
+                return estimate
+
+            for load_strategy in ("selectin", "aggregated", "core"):
+                with (
+                    self.subTest(estimate=estimate, load_strategy=load_strategy),
+                    mock.patch("src.core.pagination.count", estimated),
+                ):
+                    page = await self.get_page(last - 1, load_strategy)
+                    self.assertEqual(page["count"], estimate)
+                    self.assertEqual(len(page["results"]), 50)
+                    self.assertTrue(page["next"].endswith(f"page={last}"))
+                    self.assertTrue(page["previous"].endswith(f"page={last - 2}"))
+
+                    page = await self.get_page(last, load_strategy)
+                    self.assertEqual(len(page["results"]), self.total - 50 * (last - 1))
+                    self.assertIsNone(page["next"])
+
+
+if __name__ == "__main__":
+    unittest.main()
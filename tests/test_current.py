@@ -0,0 +1,47 @@
+import unittest
+
+from sqlalchemy import desc, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.components.zaken.models.zaken import Resultaat, Status
+from src.api.components.zaken.queries import QUERY
+from src.core.database import engine
+from tests.utils import AsyncDatabaseTestCase
+
+
+class TestCurrentStatus(AsyncDatabaseTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.session = AsyncSession(engine)
+
+    async def asyncTearDown(self):
+        await self.session.close()
+
+    async def test_only_latest_is_loaded(self):
+        zaken = (await self.session.scalars(QUERY.limit(100))).all()
+        ids = [zaak.identificatie_ptr_id for zaak in zaken]
+
+        for model in (Status, Resultaat):
+            loaded = [
+                obj
+                for obj in self.session.identity_map.values()
+                if isinstance(obj, model)
+            ]
+            self.assertLessEqual(len(loaded), len(zaken), model)
+
+        latest = select(Status.uuid).order_by(desc(Status.datum_status_gezet))
+        for zaak in zaken[:10]:
+            expected = await self.session.scalar(
+                latest.where(Status.zaak_id == zaak.identificatie_ptr_id).limit(1)
+            )
+            self.assertEqual(zaak.current_status_uuid, expected)
+
+        # the page has a status history, which is not loaded
+        history = await self.session.scalar(
+            select(func.count()).where(Status.zaak_id.in_(ids))
+        )
+        self.assertGreater(history, len(zaken))
+
+
+if __name__ == "__main__":
+    unittest.main()
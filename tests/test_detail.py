@@ -0,0 +1,91 @@
+import asyncio
+import statistics
+import time
+import unittest
+from unittest import mock
+
+import requests
+from fastapi.testclient import TestClient
+
+from src.api.components.zaken import detail
+from src.api.components.zaken.detail import zaak_cache
+from src.core.changes import change_listener
+from src.main import app
+from tests.utils import DatabaseTestCase, touch_zaak, wait_for
+
+BASE = "http://localhost:8001/zaken/api/v1"  # FastApi
+ROUNDS = 50
+
+
+class TestDetail(unittest.TestCase):
+    def setUp(self):
+        self.zaken = requests.get(BASE + "/zaken?pageSize=100").json()["results"]
+
+    def test_same_as_list(self):
+        for zaak in self.zaken[::10]:
+            with self.subTest(uuid=zaak["uuid"]):
+                response = requests.get(zaak["url"])
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), zaak)
+
+    def test_crs(self):
+        response = requests.get(
+            self.zaken[0]["url"], headers={"Accept-Crs": "EPSG:28992"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["Content-Crs"], "EPSG:28992")
+
+    def test_not_found(self):
+        response = requests.get(BASE + "/zaken/00000000-0000-0000-0000-000000000000")
+        self.assertEqual(response.status_code, 404)
+        response = requests.get(BASE + "/zaken/invalid")
+        self.assertEqual(response.status_code, 422)
+
+    def test_timing(self):
+        urls = [zaak["url"] for zaak in self.zaken]
+        # an unknown entity tag bypasses the response cache
+        headers = {"If-None-Match": '"timing"'}
+        timings = []
+        for url in (urls * (ROUNDS // len(urls) + 1))[:ROUNDS]:
+            start = time.perf_counter()
+            requests.get(url, headers=headers)
+            timings.append(time.perf_counter() - start)
+        print(f"detail: median {statistics.median(timings) * 1000:.1f} ms")
+
+
+class TestZaakCache(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = self.enterContext(TestClient(app))
+        self.assertTrue(wait_for(lambda: change_listener.connected))
+
+        zaak = self.client.get("/zaken/api/v1/zaken?pageSize=1").json()["results"][0]
+        self.path = f"/zaken/api/v1/zaken/{zaak['uuid']}"
+        # bypasses the response cache in front of the route
+        self.headers = {"If-None-Match": '"test"'}
+
+    def get(self, **headers):
+        response = self.client.get(self.path, headers={**self.headers, **headers})
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_hit(self):
+        with mock.patch.object(
+            detail, "load_documents", wraps=detail.load_documents
+        ) as load_documents:
+            first = self.get()
+            second = self.get()
+            self.get(**{"Accept-Crs": "EPSG:28992"})
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(load_documents.call_count, 2)
+
+    def test_invalidation(self):
+        self.get()
+        self.assertEqual(len(zaak_cache), 1)
+
+        asyncio.run(touch_zaak())
+        self.assertTrue(wait_for(lambda: len(zaak_cache) == 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from src.core.database import engine
+from src.main import app
+from tests.utils import DatabaseTestCase
+
+LIST = "/zaken/api/v1/zaken?pageSize={size}&page=2&expand={expand}"
+
+EXPAND = (
+    "zaaktype,status,resultaat,rollen,eigenschappen,hoofdzaak,deelzaken,"
+    "zaakinformatieobjecten,zaakobjecten"
+)
+
+
+class TestExpand(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = self.enterContext(TestClient(app))
+
+        self.statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute", self.count)
+        self.addCleanup(
+            event.remove, engine.sync_engine, "before_cursor_execute", self.count
+        )
+
+    def count(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def fetch(self, url):
+        self.statements.clear()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.text)
+        return response.json(), len(self.statements)
+
+    def test_expand(self):
+        data, _ = self.fetch(LIST.format(size=10, expand=EXPAND))
+        for zaak in data["results"]:
+            expanded = zaak["_expand"]
+            self.assertEqual(expanded["zaaktype"]["url"], zaak["zaaktype"])
+            self.assertEqual([rol["url"] for rol in expanded["rollen"]], zaak["rollen"])
+            self.assertEqual(
+                expanded["status"] and expanded["status"]["url"], zaak["status"]
+            )
+            self.assertEqual(
+                [deelzaak["url"] for deelzaak in expanded["deelzaken"]],
+                zaak["deelzaken"],
+            )
+
+    def test_query_count_does_not_depend_on_page_size(self):
+        for strategy in ("selectin", "aggregated", "core"):
+            url = LIST + f"&loadStrategy={strategy}"
+            _, small = self.fetch(url.format(size=10, expand=EXPAND))
+            _, large = self.fetch(url.format(size=100, expand=EXPAND))
+            # up to one extra query per relation that is only present on one page
+            self.assertLessEqual(large - small, 2, strategy)
+
+    def test_invalid_expand(self):
+        response = self.client.get(LIST.format(size=10, expand="foo"))
+        self.assertEqual(response.status_code, 400)
+
+        url = LIST.format(size=10, expand="rollen") + "&fields=url"
+        self.assertEqual(self.client.get(url).status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
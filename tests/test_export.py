@@ -0,0 +1,77 @@
+import json
+import tracemalloc
+import unittest
+
+import requests
+from starlette.requests import Request
+
+from src.api.components.zaken.queries import QUERY
+from src.api.components.zaken.schemas import ZaakSchema
+from src.api.export import ExportFormat, stream_items
+from src.core.middleware import request_contextvar
+from src.main import app  # noqa: F401, compiles the URL templates
+from tests.utils import AsyncDatabaseTestCase
+
+EXPORT = "http://localhost:8001/zaken/api/v1/zaken-export"  # FastApi
+LIST = "http://localhost:8001/zaken/api/v1/zaken?pageSize=100"
+
+
+class TestExport(unittest.TestCase):
+    def test_ndjson(self):
+        response = requests.get(EXPORT, stream=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["Content-Type"], "application/x-ndjson")
+        zaken = [json.loads(line) for line in response.iter_lines()]
+
+        page = requests.get(LIST).json()
+        self.assertEqual(len(zaken), page["count"])
+        self.assertEqual(zaken[:100], page["results"])
+
+    def test_json(self):
+        ndjson = requests.get(EXPORT + "?archiefstatus=gearchiveerd")
+        response = requests.get(EXPORT + "?archiefstatus=gearchiveerd&format=json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(), [json.loads(line) for line in ndjson.iter_lines()]
+        )
+
+
+class TestExportMemory(AsyncDatabaseTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        request = Request(
+            {
+                "type": "http",
+                "scheme": "http",
+                "server": ("testserver", 80),
+                "root_path": "",
+                "path": "/",
+                "query_string": b"",
+                "headers": [(b"host", b"testserver")],
+            }
+        )
+        token = request_contextvar.set(request)
+        self.addCleanup(request_contextvar.reset, token)
+
+    async def get_peak_memory(self, partition_size):
+        tracemalloc.start()
+        self.addCleanup(tracemalloc.stop)
+        async for _ in stream_items(
+            QUERY, ZaakSchema, ExportFormat.NDJSON, partition_size
+        ):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak
+
+    async def test_memory_is_bounded_by_partition(self):
+        # warm up the compiled query caches
+        await self.get_peak_memory(50)
+
+        partitioned = await self.get_peak_memory(50)
+        at_once = await self.get_peak_memory(100_000)
+        self.assertLess(partitioned, at_once / 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
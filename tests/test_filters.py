@@ -0,0 +1,131 @@
+import inspect
+import unittest
+from datetime import date
+
+import requests
+from sqlalchemy import select
+
+from src.api.components.catalogi.models.zaaktype import ZaakType
+from src.api.components.zaken.filters import get_filters
+from src.api.components.zaken.models.constants import Archiefnominatie, Archiefstatus
+from src.api.components.zaken.models.identification import ZaakIdentificatie
+from src.api.components.zaken.models.zaken import Zaak
+from src.api.components.zaken.queries import BASE_QUERY
+from src.core.counting import Explain, create_count_query
+from src.core.database import engine
+from tests.utils import AsyncDatabaseTestCase
+
+LIST = "http://localhost:8001/zaken/api/v1/zaken?pageSize=100"  # FastApi
+ZAAKTYPE_URL = "http://localhost:8001/catalogi/api/v1/zaaktypen/{uuid}"
+
+FILTERS = dict.fromkeys(inspect.signature(get_filters).parameters)
+
+
+def get_scans(plan):
+    if "Relation Name" in plan:
+        yield plan["Relation Name"], plan["Node Type"]
+    for child in plan.get("Plans", ()):
+        yield from get_scans(child)
+
+
+class TestFilterPlans(AsyncDatabaseTestCase):
+    """
+    Run against the seeded (and analyzed) database with the indexes of
+    `python -m src.create_indexes`.
+    """
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.connection = await engine.connect()
+        zaak = (
+            await self.connection.execute(
+                select(
+                    Zaak.startdatum,
+                    ZaakType.uuid,
+                    ZaakIdentificatie.identificatie,
+                    ZaakIdentificatie.bronorganisatie,
+                )
+                .join(ZaakType, ZaakType.id == Zaak.zaaktype_id)
+                .join(
+                    ZaakIdentificatie,
+                    ZaakIdentificatie.id == Zaak.identificatie_ptr_id,
+                )
+                .limit(1)
+            )
+        ).one()
+        self.cases = {
+            "startdatum": {
+                "startdatum__gte": zaak.startdatum,
+                "startdatum__lte": zaak.startdatum,
+            },
+            "archiefstatus": {"archiefstatus": Archiefstatus.GEARCHIVEERD},
+            "archiefactiedatum": {
+                "archiefnominatie": Archiefnominatie.VERNIETIGEN,
+                "archiefactiedatum__lt": date(2000, 1, 1),
+            },
+            "zaaktype": {"zaaktype": ZAAKTYPE_URL.format(uuid=zaak.uuid)},
+            "identificatie": {
+                "identificatie": zaak.identificatie,
+                "bronorganisatie": zaak.bronorganisatie,
+            },
+        }
+
+    async def asyncTearDown(self):
+        await self.connection.close()
+
+    async def get_scans(self, statement):
+        plan = await self.connection.scalar(Explain(statement))
+        return list(get_scans(plan[0]["Plan"]))
+
+    async def test_filters_use_index_scans(self):
+        for name, params in self.cases.items():
+            query = BASE_QUERY.where(*get_filters(**{**FILTERS, **params}))
+            for statement in (query.limit(100), create_count_query(query)):
+                with self.subTest(name, statement=str(statement)):
+                    scans = await self.get_scans(statement)
+                    self.assertIn("zaken_zaak", dict(scans))
+                    for table, node_type in scans:
+                        if table in ("zaken_zaak", "zaken_zaakidentificatie"):
+                            self.assertNotEqual(node_type, "Seq Scan", table)
+
+
+class TestFilters(unittest.TestCase):
+    def fetch_results(self, query):
+        response = requests.get(LIST + query)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_filters_compose_with_ordering(self):
+        data = self.fetch_results(
+            "&archiefstatus=gearchiveerd&startdatum__gte=2024-01-01"
+            "&ordering=-startdatum"
+        )
+        startdatums = [zaak["startdatum"] for zaak in data["results"]]
+        self.assertEqual(startdatums, sorted(startdatums, reverse=True))
+        for zaak in data["results"]:
+            self.assertEqual(zaak["archiefstatus"], "gearchiveerd")
+            self.assertGreaterEqual(zaak["startdatum"], "2024-01-01")
+
+    def test_identificatie(self):
+        zaak = self.fetch_results("")["results"][0]
+        data = self.fetch_results(
+            f"&identificatie={zaak['identificatie']}"
+            f"&bronorganisatie={zaak['bronorganisatie']}"
+        )
+        self.assertEqual(data["count"], 1)
+        self.assertEqual(data["results"], [zaak])
+
+    def test_zaaktype(self):
+        zaak = self.fetch_results("")["results"][0]
+        data = self.fetch_results(f"&zaaktype={zaak['zaaktype']}")
+        self.assertTrue(data["count"])
+        for result in data["results"]:
+            self.assertEqual(result["zaaktype"], zaak["zaaktype"])
+
+    def test_invalid_zaaktype(self):
+        response = requests.get(LIST + "&zaaktype=foo")
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
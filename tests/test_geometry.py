@@ -0,0 +1,74 @@
+import json
+import unittest
+
+import requests
+import shapely
+from shapely.geometry import mapping
+
+from src.api.geometry import wkb_to_geojson
+
+LIST = "http://localhost:8001/zaken/api/v1/zaken?pageSize=100&fields=url,zaakgeometrie"  # FastApi
+
+WKT = (
+    "POINT (5 52)",
+    "POINT Z (5 52 3)",
+    "POINT EMPTY",
+    "LINESTRING (0 0, 1 1.123456789012345, 2 3)",
+    "POLYGON ((0 0, 1 0, 1 1, 0 1, 0 0), (0.2 0.2, 0.3 0.2, 0.3 0.3, 0.2 0.2))",
+    "POLYGON Z ((0 0 1, 1 0 1, 1 1 1, 0 0 1))",
+    "MULTIPOINT ((1 2), (3 4))",
+    "MULTILINESTRING ((0 0, 1 1), (2 2, 3 3))",
+    "MULTIPOLYGON (((0 0, 1 0, 1 1, 0 0)), ((5 5, 6 5, 6 6, 5 5)))",
+    "GEOMETRYCOLLECTION (POINT (1 2), LINESTRING (0 0, 1 1))",
+)
+
+
+class TestWKB(unittest.TestCase):
+    def test_same_as_shapely(self):
+        for wkt in WKT:
+            geometry = shapely.from_wkt(wkt)
+            expected = json.dumps(mapping(geometry))
+            for flavor, srid in (("iso", None), ("extended", None), ("extended", 4326)):
+                for byte_order in (0, 1):
+                    with self.subTest(wkt, flavor=flavor, byte_order=byte_order):
+                        data = shapely.to_wkb(
+                            shapely.set_srid(geometry, srid) if srid else geometry,
+                            byte_order=byte_order,
+                            flavor=flavor,
+                            include_srid=bool(srid),
+                        )
+                        self.assertEqual(json.dumps(wkb_to_geojson(data)), expected)
+                        self.assertEqual(
+                            json.dumps(wkb_to_geojson(data.hex())), expected
+                        )
+
+
+class TestGeometryRendering(unittest.TestCase):
+    def test_renderings_match(self):
+        responses = {
+            rendering: requests.get(LIST + f"&geometryRendering={rendering}")
+            for rendering in ("database", "python")
+        }
+        for response in responses.values():
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.headers["Content-Crs"], "EPSG:4326")
+        # byte for byte, as the parsed JSON does not tell 5 from 5.0; only the
+        # links of the pages name another rendering
+        self.assertEqual(
+            responses["database"].content.replace(
+                b"geometryRendering=database", b"geometryRendering=python"
+            ),
+            responses["python"].content,
+        )
+
+    def test_accept_crs(self):
+        response = requests.get(LIST, headers={"Accept-Crs": "EPSG:4326"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["Content-Crs"], "EPSG:4326")
+
+        response = requests.get(LIST, headers={"Accept-Crs": "EPSG:1234"})
+        self.assertEqual(response.status_code, 406)
+
+
+if __name__ == "__main__":
+    unittest.main()
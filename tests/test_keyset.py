@@ -0,0 +1,49 @@
+import unittest
+
+from fastapi.testclient import TestClient
+
+from src.main import app
+from tests.utils import DatabaseTestCase
+
+BASE = "http://testserver/zaken/api/v1"
+KEYSET = BASE + "/zaken-keyset-page?pageSize=50&ordering=-startdatum"
+OFFSET = BASE + "/zaken?pageSize=50&ordering=-startdatum&page={page}"
+PAGES = 3
+
+
+class TestKeysetPagination(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = self.enterContext(TestClient(app))
+
+    def get(self, url: str) -> dict:
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_same_as_offset(self):
+        url = KEYSET
+        for page in range(1, PAGES + 1):
+            with self.subTest(page=page):
+                keyset = self.get(url)
+                offset = self.get(OFFSET.format(page=page))
+                self.assertEqual(keyset["results"], offset["results"])
+                self.assertEqual(keyset["count"], offset["count"])
+                self.assertTrue(keyset["next"].startswith(KEYSET + "&cursor="))
+                url = keyset["next"]
+
+    def test_previous(self):
+        first = self.get(KEYSET)
+        self.assertIsNone(first["previous"])
+        second = self.get(first["next"])
+        self.assertEqual(self.get(second["previous"])["results"], first["results"])
+
+    def test_invalid(self):
+        response = self.client.get(KEYSET + "&cursor=invalid")
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(BASE + "/zaken-keyset-page?ordering=unknown")
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
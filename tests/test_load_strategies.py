@@ -0,0 +1,69 @@
+import statistics
+import time
+import unittest
+
+import requests
+
+LIST = "http://localhost:8001/zaken/api/v1/zaken?pageSize=100&page={page}&loadStrategy={strategy}"  # FastApi
+
+STRATEGIES = ("selectin", "aggregated", "core")
+FIELDS = (
+    "url,identificatie,bronorganisatie,status,resultaat",
+    "zaaktype,rollen,eigenschappen,hoofdzaak,deelzaken",
+    "relevanteAndereZaken,kenmerken,zaakinformatieobjecten,zaakobjecten",
+    "processobject,opschorting,verlenging,betalingsindicatieWeergave,startdatum",
+)
+PAGES = (1, 5, 10)
+ROUNDS = 10
+
+
+class TestLoadStrategies(unittest.TestCase):
+    def fetch_results(self, strategy, page, fields=None):
+        start = time.perf_counter()
+        url = LIST.format(page=page, strategy=strategy)
+        if fields:
+            url += f"&fields={fields}"
+        response = requests.get(url)
+        elapsed = time.perf_counter() - start
+        self.assertEqual(response.status_code, 200)
+        return response.json()["results"], elapsed
+
+    def test_compare_load_strategies(self):
+        timings = {strategy: [] for strategy in STRATEGIES}
+        for page in PAGES:
+            results = {}
+            for strategy in STRATEGIES:
+                for _ in range(ROUNDS):
+                    results[strategy], elapsed = self.fetch_results(strategy, page)
+                    timings[strategy].append(elapsed)
+
+            for strategy in STRATEGIES:
+                self.assertEqual(results["selectin"], results[strategy])
+
+        for strategy, values in timings.items():
+            print(
+                f"{strategy}: median {statistics.median(values) * 1000:.1f}ms, "
+                f"max {max(values) * 1000:.1f}ms over {len(values)} requests"
+            )
+
+    def test_sparse_fields(self):
+        for page in PAGES:
+            full, _ = self.fetch_results("selectin", page)
+            for fields in FIELDS:
+                names = fields.split(",")
+                expected = [
+                    {key: value for key, value in zaak.items() if key in names}
+                    for zaak in full
+                ]
+                for strategy in STRATEGIES:
+                    results, _ = self.fetch_results(strategy, page, fields)
+                    self.assertEqual(results, expected)
+
+    def test_invalid_fields(self):
+        url = LIST.format(page=1, strategy="selectin")
+        response = requests.get(url + "&fields=foo")
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
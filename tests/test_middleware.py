@@ -0,0 +1,141 @@
+import asyncio
+import time
+import unittest
+
+import httpx
+from fastapi import Request
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from src.core.middleware import (
+    RequestContextMiddleware,
+    RequestIdMiddleware,
+    TimingMiddleware,
+    request_contextvar,
+    request_id_contextvar,
+)
+from src.main import app
+from tests.utils import AsyncDatabaseTestCase
+
+LIST = "/zaken/api/v1/zaken?pageSize=1"
+REQUESTS = 2000
+
+
+class BaseHTTPRequestContextMiddleware(BaseHTTPMiddleware):
+    # the former implementation, kept to compare throughput
+    async def dispatch(self, request: Request, call_next):
+        token = request_contextvar.set(request)
+        try:
+            return await call_next(request)
+        finally:
+            request_contextvar.reset(token)
+
+
+async def context(request):
+    return PlainTextResponse(
+        f"{request_contextvar.get().url} {request_id_contextvar.get()}"
+    )
+
+
+async def stream(request):
+    async def body():
+        for _ in range(3):
+            await asyncio.sleep(0)
+            yield f"{request_contextvar.get().url}\n"
+
+    return StreamingResponse(body())
+
+
+def make_app(*middleware: type) -> Starlette:
+    return Starlette(
+        routes=[Route("/context", context), Route("/stream", stream)],
+        middleware=[Middleware(cls) for cls in middleware],
+    )
+
+
+class TestMiddleware(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = await self.enterAsyncContext(
+            httpx.AsyncClient(
+                transport=httpx.ASGITransport(
+                    app=make_app(
+                        RequestContextMiddleware, TimingMiddleware, RequestIdMiddleware
+                    )
+                ),
+                base_url="http://test",
+            )
+        )
+
+    async def test_request_id(self):
+        response = await self.client.get("/context", headers={"X-Request-ID": "abc-1"})
+        self.assertEqual(response.headers["X-Request-ID"], "abc-1")
+        self.assertEqual(response.text, "http://test/context abc-1")
+
+        generated = {
+            (await self.client.get("/context")).headers["X-Request-ID"]
+            for _ in range(2)
+        }
+        self.assertEqual(len(generated), 2)
+
+        response = await self.client.get(
+            "/context", headers={"X-Request-ID": "not valid"}
+        )
+        self.assertNotEqual(response.headers["X-Request-ID"], "not valid")
+        self.assertEqual(len(response.headers.get_list("X-Request-ID")), 1)
+
+    async def test_timing(self):
+        response = await self.client.get("/context")
+        self.assertRegex(response.headers["Server-Timing"], r"^app;dur=\d+\.\d$")
+
+    async def test_streaming(self):
+        response = await self.client.get("/stream")
+        self.assertEqual(response.text, "http://test/stream\n" * 3)
+        self.assertIsNone(request_contextvar.get())
+
+
+class TestAppMiddleware(AsyncDatabaseTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.client = await self.enterAsyncContext(
+            httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://test"
+            )
+        )
+
+    async def test_shared_responses(self):
+        # each of the requests sharing a response has its own ID
+        responses = await asyncio.gather(*(self.client.get(LIST) for _ in range(5)))
+        self.assertEqual({response.status_code for response in responses}, {200})
+        ids = [response.headers["X-Request-ID"] for response in responses]
+        self.assertEqual(len(set(ids)), 5)
+        for response in responses:
+            self.assertEqual(len(response.headers.get_list("Server-Timing")), 1)
+
+
+class TestThroughput(unittest.IsolatedAsyncioTestCase):
+    async def measure(self, *middleware: type) -> float:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=make_app(*middleware)),
+            base_url="http://test",
+        ) as client:
+            start = time.perf_counter()
+            for _ in range(REQUESTS):
+                await client.get("/context")
+            return REQUESTS / (time.perf_counter() - start)
+
+    async def test_throughput(self):
+        await self.measure(RequestContextMiddleware)
+        base_http = await self.measure(BaseHTTPRequestContextMiddleware)
+        pure_asgi = await self.measure(RequestContextMiddleware)
+        print(
+            f"request context: BaseHTTPMiddleware {base_http:.0f} req/s, "
+            f"pure ASGI {pure_asgi:.0f} req/s"
+        )
+        self.assertGreater(pure_asgi, base_http)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+import httpx
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.api.components.zaken.models.zaken import Zaak
+from src.core.config import settings
+from src.core.database import async_session, autocommit, engine, read_session
+from src.core.pool import Histogram, MeteredPool, get_pool_metrics
+from src.core.replicas import get_read_session
+from src.main import app
+from tests.utils import AsyncDatabaseTestCase, DatabaseTestCase
+
+LOAD_URL = "/zaken/api/v1/zaken?pageSize=100&loadStrategy=core"
+LOAD_REQUESTS = 20
+ADMIN_TOKEN = "admin secret"
+
+
+class TestHistogram(unittest.TestCase):
+    def test_cumulative(self):
+        histogram = Histogram((0.1, 1))
+        for value in (0.05, 0.1, 0.5, 2):
+            histogram.observe(value)
+        self.assertEqual(
+            histogram.as_dict(),
+            {"buckets": {"0.1": 2, "1": 3, "+Inf": 4}, "count": 4, "sum": 2.65},
+        )
+
+
+class TestPoolMetrics(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.enterContext(mock.patch.object(settings, "ADMIN_TOKEN", ADMIN_TOKEN))
+        self.client = self.enterContext(
+            TestClient(app, headers={"X-Admin-Token": ADMIN_TOKEN})
+        )
+
+    def get_metrics(self) -> dict:
+        response = self.client.get("/_admin/pool")
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_admin_token(self):
+        response = self.client.get("/_admin/pool", headers={"X-Admin-Token": ""})
+        self.assertEqual(response.status_code, 403)
+        with mock.patch.object(settings, "ADMIN_TOKEN", ""):
+            self.assertEqual(self.client.get("/_admin/pool").status_code, 404)
+
+    def test_settings(self):
+        metrics = self.get_metrics()
+        self.assertEqual(metrics["size"], settings.DB_POOL_SIZE)
+        self.assertEqual(metrics["max_overflow"], settings.DB_MAX_OVERFLOW)
+
+    def test_checkouts(self):
+        before = self.get_metrics()["wait_seconds"]["count"]
+        concurrency = settings.DB_POOL_SIZE + 2
+        held = asyncio.Event()
+
+        async def checkout() -> None:
+            async with async_session() as session:
+                await session.execute(text("SELECT 1"))
+                await held.wait()
+
+        async def checkouts() -> dict:
+            tasks = [asyncio.create_task(checkout()) for _ in range(concurrency)]
+            while engine.pool.checkedout() < concurrency:
+                await asyncio.sleep(0.01)
+            metrics = get_pool_metrics(engine.pool)
+            held.set()
+            await asyncio.gather(*tasks)
+            return metrics
+
+        metrics = self.client.portal.call(checkouts)
+        self.assertEqual(metrics["checked_out"], concurrency)
+        self.assertEqual(metrics["overflow"], 2)
+
+        metrics = self.get_metrics()
+        self.assertEqual(metrics["wait_seconds"]["count"] - before, concurrency)
+        self.assertEqual(metrics["checked_out"], 0)
+
+
+class TestReadSession(AsyncDatabaseTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.session = read_session(bind=autocommit(engine))
+        self.addAsyncCleanup(self.session.close)
+        self.uuid = await self.session.scalar(select(Zaak.uuid).limit(1))
+
+    async def test_released(self):
+        query = select(Zaak).where(Zaak.uuid == self.uuid)
+        zaak = await self.session.scalar(query)
+        # emitting their query despite the zaak being loaded
+        pk, reload = zaak.identificatie_ptr_id, {"populate_existing": True}
+        calls = {
+            "execute": lambda: self.session.execute(query),
+            "scalar": lambda: self.session.scalar(query),
+            "scalars": lambda: self.session.scalars(query),
+            "get": lambda: self.session.get(Zaak, pk, **reload),
+            "get_one": lambda: self.session.get_one(Zaak, pk, **reload),
+            "refresh": lambda: self.session.refresh(zaak),
+            "run_sync": lambda: self.session.run_sync(
+                lambda session: session.execute(query).all()
+            ),
+        }
+        for name, call in calls.items():
+            with self.subTest(name):
+                await call()
+                self.assertEqual(engine.pool.checkedout(), 0)
+
+
+class TestReadSessionLoad(unittest.IsolatedAsyncioTestCase):
+    """
+    Concurrent list requests against a pool of two connections, with sessions
+    holding their connection for the whole request and with `ReadSession`.
+    """
+
+    async def asyncSetUp(self):
+        self.engine = create_async_engine(
+            engine.url, poolclass=MeteredPool, pool_size=2, max_overflow=0
+        )
+        self.addAsyncCleanup(self.engine.dispose)
+        self.addCleanup(app.dependency_overrides.clear)
+
+    async def held_session(self):
+        async with async_session(bind=self.engine) as session:
+            yield session
+
+    async def lazy_session(self):
+        async with read_session(bind=autocommit(self.engine)) as session:
+            yield session
+
+    async def load(self, dependency) -> dict:
+        app.dependency_overrides[get_read_session] = dependency
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            # opens the connections of the pool
+            await client.get(LOAD_URL)
+            pool = self.engine.pool
+            pool.wait_times, pool.hold_times = Histogram(()), Histogram(())
+            start = time.perf_counter()
+            responses = await asyncio.gather(
+                *(
+                    client.get(f"{LOAD_URL}&page={n % 20 + 1}")
+                    for n in range(LOAD_REQUESTS)
+                )
+            )
+            elapsed = time.perf_counter() - start
+        self.assertTrue(all(response.status_code == 200 for response in responses))
+        return {
+            "elapsed": elapsed,
+            "checkouts": pool.wait_times.as_dict()["count"],
+            "wait": pool.wait_times.as_dict()["sum"],
+            "hold": pool.hold_times.as_dict()["sum"],
+        }
+
+    async def test_pool_usage(self):
+        held = await self.load(self.held_session)
+        lazy = await self.load(self.lazy_session)
+        for name, result in (("held", held), ("lazy", lazy)):
+            print(
+                f"{name}: {result['elapsed'] * 1000:.0f} ms for {LOAD_REQUESTS} "
+                f"requests, connections held "
+                f"{result['hold'] / LOAD_REQUESTS * 1000:.1f} ms per request, "
+                f"{result['checkouts']} checkouts waiting "
+                f"{result['wait'] / result['checkouts'] * 1000:.1f} ms on average"
+            )
+        self.assertLess(lazy["hold"], held["hold"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import httpx
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from src.core.config import settings
+from src.core.middleware import ProfilerMiddleware, RequestIdMiddleware
+from src.core.profiling import ProfileStore
+from src.main import app
+
+TOKEN = "secret"
+ADMIN_TOKEN = "admin secret"
+
+
+async def slow(request):
+    await asyncio.sleep(0.05)
+    return PlainTextResponse("ok")
+
+
+def make_client(**options) -> httpx.AsyncClient:
+    profiled = Starlette(
+        routes=[Route("/slow", slow), Route("/_admin/slow", slow)],
+        middleware=[
+            Middleware(RequestIdMiddleware),
+            Middleware(ProfilerMiddleware, **options),
+        ],
+    )
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=profiled), base_url="http://test"
+    )
+
+
+class TestProfiler(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.store = ProfileStore(2)
+        self.enterContext(mock.patch("src.core.middleware.profile_store", self.store))
+
+    async def test_token(self):
+        async with make_client(token=TOKEN) as client:
+            self.assertNotIn("X-Profile-ID", (await client.get("/slow")).headers)
+            response = await client.get("/slow", headers={"X-Profile": "other"})
+            self.assertNotIn("X-Profile-ID", response.headers)
+            response = await client.get(
+                "/slow", headers={"X-Profile": TOKEN, "X-Request-ID": "abc"}
+            )
+
+        profile = self.store.get(response.headers["X-Profile-ID"])
+        self.assertEqual(profile.path, "/slow")
+        self.assertEqual(profile.status, 200)
+        self.assertEqual(profile.request_id, "abc")
+        # the whole request, awaits included
+        self.assertGreaterEqual(profile.session.duration, 0.05)
+
+    async def test_without_token(self):
+        async with make_client() as client:
+            response = await client.get("/slow", headers={"X-Profile": ""})
+        self.assertNotIn("X-Profile-ID", response.headers)
+
+    async def test_sample_rate(self):
+        async with make_client(sample_rate=1, exclude=("/_admin",)) as client:
+            self.assertIn("X-Profile-ID", (await client.get("/slow")).headers)
+            self.assertNotIn("X-Profile-ID", (await client.get("/_admin/slow")).headers)
+
+    async def test_bounded(self):
+        async with make_client(sample_rate=1) as client:
+            responses = await asyncio.gather(*(client.get("/slow") for _ in range(3)))
+        ids = [response.headers["X-Profile-ID"] for response in responses]
+        self.assertEqual(len(set(ids)), 3)
+        self.assertEqual(len(self.store.list()), 2)
+
+    async def test_directory(self):
+        directory = self.enterContext(tempfile.TemporaryDirectory())
+        self.store.directory = directory
+        async with make_client(sample_rate=1) as client:
+            response = await client.get("/slow")
+        await asyncio.gather(*self.store._writes)
+        self.assertEqual(
+            os.listdir(directory), [f"profile_{response.headers['X-Profile-ID']}.html"]
+        )
+
+
+class TestProfileEndpoints(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        store = ProfileStore(2)
+        self.enterContext(mock.patch("src.core.middleware.profile_store", store))
+        self.enterContext(mock.patch("src.api.admin.profile_store", store))
+        async with make_client(token=TOKEN) as client:
+            response = await client.get("/slow", headers={"X-Profile": TOKEN})
+        self.profile_id = response.headers["X-Profile-ID"]
+
+        self.enterContext(mock.patch.object(settings, "ADMIN_TOKEN", ADMIN_TOKEN))
+        self.enterContext(mock.patch.object(settings, "PROFILE_TOKEN", TOKEN))
+        self.client = await self.enterAsyncContext(
+            httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app),
+                base_url="http://test",
+                headers={"X-Admin-Token": ADMIN_TOKEN},
+            )
+        )
+
+    async def test_list(self):
+        response = await self.client.get("/_admin/profiles")
+        self.assertEqual(response.status_code, 200)
+        (profile,) = response.json()
+        self.assertEqual(profile["id"], self.profile_id)
+        self.assertEqual(profile["path"], "/slow")
+
+    async def test_formats(self):
+        url = f"/_admin/profiles/{self.profile_id}"
+        response = await self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["Content-Type"].startswith("text/html"))
+
+        response = await self.client.get(url, params={"format": "speedscope"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("speedscope", json.loads(response.content)["$schema"])
+
+        response = await self.client.get(url, params={"format": "pdf"})
+        self.assertEqual(response.status_code, 422)
+
+    async def test_not_found(self):
+        response = await self.client.get("/_admin/profiles/unknown")
+        self.assertEqual(response.status_code, 404)
+
+    async def test_admin_token(self):
+        url = f"/_admin/profiles/{self.profile_id}"
+        for headers, status_code in (
+            ({"X-Admin-Token": ""}, 403),
+            ({"X-Admin-Token": TOKEN}, 403),
+            ({"X-Admin-Token": ADMIN_TOKEN}, 200),
+        ):
+            with self.subTest(headers):
+                for path in ("/_admin/profiles", url):
+                    response = await self.client.get(path, headers=headers)
+                    self.assertEqual(response.status_code, status_code)
+
+        with mock.patch.object(settings, "ADMIN_TOKEN", ""):
+            for path in ("/_admin/profiles", url):
+                response = await self.client.get(path)
+                self.assertEqual(response.status_code, 404)
+
+    async def test_profiling_disabled(self):
+        with mock.patch.object(settings, "PROFILE_TOKEN", ""):
+            response = await self.client.get("/_admin/profiles")
+            self.assertEqual(response.status_code, 404)
+            response = await self.client.get(f"/_admin/profiles/{self.profile_id}")
+            self.assertEqual(response.status_code, 404)
+
+            with mock.patch.object(settings, "PROFILE_SAMPLE_RATE", 0.1):
+                response = await self.client.get("/_admin/profiles")
+                self.assertEqual(response.status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+import statistics
+import time
+import unittest
+from unittest import mock
+
+import asyncpg
+import httpx
+
+from src.api.components.catalogi.catalog import zaaktype_catalog
+from src.api.components.zaken import projection as projection_module
+from src.api.components.zaken.projection import (
+    PROJECTION_SOURCES,
+    load_documents,
+    projection,
+    refresh_stale,
+)
+from src.api.components.zaken.queries import BASE_QUERY
+from src.core.config import settings
+from src.core.database import async_session, engine
+from src.create_projection import create_projection, drop_projection_triggers
+from src.main import app
+from tests.utils import AsyncDatabaseTestCase
+
+LIST = "/zaken/api/v1/zaken"
+PAGES = ["?pageSize=100", "?pageSize=100&page=3", "?pageSize=7&page=20"]
+ROUNDS = 10
+
+
+class TestProjection(AsyncDatabaseTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.enterContext(mock.patch.object(settings, "ZAKEN_PROJECTION", True))
+        self.client = await self.enterAsyncContext(
+            httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://test"
+            )
+        )
+        await zaaktype_catalog.refresh()
+        self.connection = await asyncpg.connect(
+            engine.url.set(drivername="postgresql").render_as_string(
+                hide_password=False
+            )
+        )
+        self.addAsyncCleanup(self.connection.close)
+        self.zaak_id = await self.connection.fetchval(
+            "SELECT max(identificatie_ptr_id) FROM zaken_zaak"
+        )
+
+    async def refresh(self) -> None:
+        async with async_session() as session:
+            while await refresh_stale(session, 500):
+                pass
+
+    async def is_stale(self, zaak_id: int) -> bool:
+        return await self.connection.fetchval(
+            f"SELECT stale FROM {projection.name} WHERE zaak_id = $1", zaak_id
+        )
+
+    async def get_results(self, query: str, load_strategy: str) -> list:
+        response = await self.client.get(f"{LIST}{query}&loadStrategy={load_strategy}")
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()["results"]
+
+    async def set_omschrijving(self, omschrijving: str) -> None:
+        await self.connection.execute(
+            "UPDATE zaken_zaak SET omschrijving = $1 WHERE identificatie_ptr_id = $2",
+            omschrijving,
+            self.zaak_id,
+        )
+
+    async def test_same_results(self):
+        await self.refresh()
+        for query in PAGES:
+            with self.subTest(query=query):
+                self.assertEqual(
+                    await self.get_results(query, "projection"),
+                    await self.get_results(query, "selectin"),
+                )
+
+    async def test_disabled(self):
+        settings.ZAKEN_PROJECTION = False
+        with mock.patch(
+            "src.api.components.zaken.router.paginate_projection"
+        ) as paginate_projection:
+            self.assertEqual(
+                await self.get_results(PAGES[0], "projection"),
+                await self.get_results(PAGES[0], "selectin"),
+            )
+        paginate_projection.assert_not_called()
+
+    async def test_stale(self):
+        await self.refresh()
+        # renders the restored document again
+        self.addAsyncCleanup(self.refresh)
+        (zaak,) = await self.get_results("?pageSize=1", "selectin")
+        self.addAsyncCleanup(self.set_omschrijving, zaak["omschrijving"])
+
+        await self.set_omschrijving("projection test")
+        self.assertTrue(await self.is_stale(self.zaak_id))
+        # stale documents are rendered when requested
+        (zaak,) = await self.get_results("?pageSize=1", "projection")
+        self.assertEqual(zaak["omschrijving"], "projection test")
+
+        await self.refresh()
+        self.assertFalse(await self.is_stale(self.zaak_id))
+        self.assertEqual(
+            await self.get_results("?pageSize=1", "projection"),
+            await self.get_results("?pageSize=1", "selectin"),
+        )
+
+    async def test_children(self):
+        await self.refresh()
+        self.addAsyncCleanup(self.refresh)
+        zaak_id = await self.connection.fetchval(
+            "SELECT max(zaak_id) FROM zaken_status"
+        )
+        await self.connection.execute(
+            "UPDATE zaken_status SET datum_status_gezet = datum_status_gezet "
+            "WHERE zaak_id = $1",
+            zaak_id,
+        )
+        self.assertTrue(await self.is_stale(zaak_id))
+
+    async def test_deleted_while_rendering(self):
+        await self.refresh()
+        self.addAsyncCleanup(self.refresh)
+        await self.connection.execute(
+            f"UPDATE {projection.name} SET stale = true WHERE zaak_id = $1",
+            self.zaak_id,
+        )
+        other = await self.connection.fetchval(
+            "SELECT uuid FROM zaken_zaak WHERE identificatie_ptr_id < $1 "
+            "ORDER BY identificatie_ptr_id DESC LIMIT 1",
+            self.zaak_id,
+        )
+
+        # the stale zaak is deleted before it is rendered again
+        async def render_documents(session, zaak_ids):
+            return {}
+
+        with mock.patch.object(projection_module, "render_documents", render_documents):
+            async with async_session() as session:
+                documents = await load_documents(session, BASE_QUERY, 2, 0)
+        self.assertEqual(len(documents), 1)
+        self.assertIn(str(other), documents[0])
+
+    async def test_triggers(self):
+        async def count_triggers() -> int:
+            return await self.connection.fetchval(
+                "SELECT count(*) FROM pg_trigger WHERE tgname LIKE '%\\_projection'"
+            )
+
+        self.addAsyncCleanup(create_projection, engine)
+        await drop_projection_triggers(engine)
+        self.assertEqual(await count_triggers(), 0)
+        await create_projection(engine)
+        self.assertEqual(await count_triggers(), len(PROJECTION_SOURCES) + 1)
+
+    async def test_timing(self):
+        await self.refresh()
+        timings = {"selectin": [], "projection": []}
+        for page in range(1, ROUNDS + 1):
+            for load_strategy in timings:
+                start = time.perf_counter()
+                await self.get_results(f"?pageSize=100&page={page}", load_strategy)
+                timings[load_strategy].append(time.perf_counter() - start)
+
+        for name, values in timings.items():
+            print(f"{name}: median {statistics.median(values) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+import asyncio
+import unittest
+
+import asyncpg
+from sqlalchemy import make_url
+
+from src.core.config import settings
+from src.core.database import engine
+from src.core.replicas import ReplicaSet
+from tests.utils import AsyncDatabaseTestCase, touch_zaak
+
+PRIMARY = engine.url.render_as_string(hide_password=False)
+UNREACHABLE = engine.url.set(port=1).render_as_string(hide_password=False)
+
+
+def asyncpg_dsn(url: str) -> str:
+    return (
+        make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+    )
+
+
+class TestReplicaSet(AsyncDatabaseTestCase):
+    async def make_replica_set(self, urls: list[str], max_lag: float = 5) -> ReplicaSet:
+        replica_set = ReplicaSet(urls, max_lag, interval=1)
+        for replica in replica_set.replicas:
+            self.addAsyncCleanup(replica.engine.dispose)
+        await replica_set.check_all()
+        return replica_set
+
+    async def test_no_replicas(self):
+        replica_set = await self.make_replica_set([])
+        self.assertIs(await replica_set.get_engine(), engine)
+
+    async def test_unreachable(self):
+        # a server which is not in recovery has no lag
+        replica_set = await self.make_replica_set([PRIMARY, UNREACHABLE])
+        healthy, unreachable = replica_set.replicas
+        self.assertTrue(healthy.healthy)
+        self.assertEqual(healthy.lag, 0)
+        self.assertFalse(unreachable.healthy)
+        for _ in range(3):
+            self.assertIs(await replica_set.get_engine(), healthy.engine)
+
+        replica_set = await self.make_replica_set([UNREACHABLE])
+        self.assertIs(await replica_set.get_engine(), engine)
+
+    async def test_least_connections(self):
+        replica_set = await self.make_replica_set([PRIMARY, PRIMARY])
+        first, second = replica_set.replicas
+        # equals take turns
+        engines = {await replica_set.get_engine() for _ in range(2)}
+        self.assertEqual(engines, {first.engine, second.engine})
+
+        async with first.engine.connect():
+            for _ in range(3):
+                self.assertIs(await replica_set.get_engine(), second.engine)
+
+    async def start(self, replica_set: ReplicaSet) -> None:
+        await replica_set.start()
+        self.addAsyncCleanup(replica_set.stop)
+
+    async def wait_for_required(self, replica_set: ReplicaSet) -> None:
+        async with asyncio.timeout(5):
+            while replica_set.required is None:
+                await asyncio.sleep(0.01)
+
+    async def test_primary_until_replayed(self):
+        replica_set = await self.make_replica_set([PRIMARY])
+        await self.start(replica_set)
+        (replica,) = replica_set.replicas
+
+        replica_set.on_change()
+        self.assertIs(await replica_set.get_engine(), engine)
+        await self.wait_for_required(replica_set)
+        self.assertIs(await replica_set.get_engine(), replica.engine)
+
+        # a replica behind the primary is asked for its position again
+        replica.position = 0
+        self.assertIs(await replica_set.get_engine(), replica.engine)
+        self.assertGreaterEqual(replica.position, replica_set.required)
+
+        replica_set.required = replica.position + 1
+        self.assertIs(await replica_set.get_engine(), engine)
+
+
+@unittest.skipUnless(settings.DB_REPLICAS, "needs a streaming replica")
+class TestReplicaLag(AsyncDatabaseTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.replica_set = ReplicaSet(settings.DB_REPLICAS[:1], 1, interval=1)
+        self.replica = self.replica_set.replicas[0]
+        self.addAsyncCleanup(self.replica.engine.dispose)
+
+        self.standby = await asyncpg.connect(asyncpg_dsn(settings.DB_REPLICAS[0]))
+        self.addAsyncCleanup(self.standby.close)
+
+    async def pause_replay(self) -> None:
+        await self.standby.execute("SELECT pg_wal_replay_pause()")
+        self.addAsyncCleanup(self.standby.execute, "SELECT pg_wal_replay_resume()")
+        while (
+            await self.standby.fetchval("SELECT pg_get_wal_replay_pause_state()")
+            != "paused"
+        ):
+            await asyncio.sleep(0.01)
+
+    async def test_lagging(self):
+        await self.replica_set.check_all()
+        self.assertTrue(self.replica.healthy)
+
+        await self.pause_replay()
+        await asyncio.sleep(1.5)
+        await touch_zaak()
+        await asyncio.sleep(0.2)
+
+        await self.replica_set.check_all()
+        self.assertGreater(self.replica.lag, 1)
+        self.assertFalse(self.replica.healthy)
+        self.assertIs(await self.replica_set.get_engine(), engine)
+
+    async def test_not_replayed(self):
+        # healthy however far behind, yet skipped until it replayed the change
+        replica_set = ReplicaSet(settings.DB_REPLICAS[:1], 60, interval=1)
+        (replica,) = replica_set.replicas
+        self.addAsyncCleanup(replica.engine.dispose)
+        await replica_set.start()
+        self.addAsyncCleanup(replica_set.stop)
+
+        await self.pause_replay()
+        await touch_zaak()
+        replica_set.on_change()
+        async with asyncio.timeout(5):
+            while replica_set.required is None:
+                await asyncio.sleep(0.01)
+        await replica_set.check_all()
+        self.assertTrue(replica.healthy)
+        self.assertIs(await replica_set.get_engine(), engine)
+
+        await self.standby.execute("SELECT pg_wal_replay_resume()")
+        async with asyncio.timeout(5):
+            while await replica_set.get_engine() is engine:
+                await asyncio.sleep(0.01)
+        self.assertGreaterEqual(replica.position, replica_set.required)
+
+    async def set_primary_conninfo(self, conninfo: str) -> None:
+        conninfo = conninfo.replace("'", "''")
+        await self.standby.execute(f"ALTER SYSTEM SET primary_conninfo = '{conninfo}'")
+        await self.standby.execute("SELECT pg_reload_conf()")
+
+    async def wait_for_streaming(self, streaming: bool) -> None:
+        async with asyncio.timeout(10):
+            while streaming != await self.standby.fetchval(
+                "SELECT EXISTS "
+                "(SELECT FROM pg_stat_wal_receiver WHERE status = 'streaming')"
+            ):
+                await asyncio.sleep(0.05)
+
+    async def test_not_streaming(self):
+        conninfo = await self.standby.fetchval("SHOW primary_conninfo")
+        self.addAsyncCleanup(self.wait_for_streaming, True)
+        self.addAsyncCleanup(self.set_primary_conninfo, conninfo)
+        # receives no more WAL, but replayed all it received
+        await self.set_primary_conninfo("")
+        await self.wait_for_streaming(False)
+
+        await self.replica_set.check_all()
+        self.assertIsNone(self.replica.lag)
+        self.assertFalse(self.replica.healthy)
+        self.assertIs(await self.replica_set.get_engine(), engine)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import asyncio
+import statistics
+import time
+import unittest
+from unittest import mock
+
+import asyncpg
+from fastapi.testclient import TestClient
+
+from src.core.changes import ChangeListener, change_listener
+from src.core.middleware import response_cache
+from src.core.responses import PydanticResponse
+from src.main import app
+from tests.utils import DatabaseTestCase, touch_zaak, wait_for
+
+LIST = "/zaken/api/v1/zaken?pageSize=100"
+ROUNDS = 20
+
+
+class TestResponseCache(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = self.enterContext(TestClient(app))
+        self.assertTrue(wait_for(lambda: change_listener.connected))
+
+        self.rendered = 0
+
+        def count(*args, **kwargs):
+            self.rendered += 1
+            return PydanticResponse(*args, **kwargs)
+
+        self.enterContext(
+            mock.patch("src.api.components.zaken.router.PydanticResponse", count)
+        )
+
+    def test_hit(self):
+        response = self.client.get(LIST + "&archiefstatus=nog_te_archiveren")
+        self.assertEqual(response.status_code, 200)
+        cached = self.client.get(
+            "/zaken/api/v1/zaken?archiefstatus=nog_te_archiveren&pageSize=100"
+        )
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(cached.headers["ETag"], response.headers["ETag"])
+        self.assertEqual(self.rendered, 1)
+
+    def test_vary(self):
+        self.client.get(LIST)
+        response = self.client.get(LIST, headers={"Accept-Crs": "EPSG:28992"})
+        self.assertEqual(response.headers["Content-Crs"], "EPSG:28992")
+        self.assertEqual(self.rendered, 2)
+
+    def test_not_cached(self):
+        response = self.client.get(LIST)
+        self.client.get(LIST, headers={"If-None-Match": response.headers["ETag"]})
+        self.client.get(LIST + "&archiefstatus=invalid")
+        self.client.get(LIST + "&archiefstatus=invalid")
+        self.assertEqual(len(response_cache), 1)
+
+    def test_invalidation(self):
+        response = self.client.get(LIST)
+        self.assertEqual(len(response_cache), 1)
+
+        asyncio.run(touch_zaak())
+        self.assertTrue(wait_for(lambda: len(response_cache) == 0))
+
+        fresh = self.client.get(LIST)
+        self.assertNotEqual(fresh.headers["ETag"], response.headers["ETag"])
+        self.assertEqual(self.rendered, 2)
+
+    def test_timing(self):
+        timings = {"miss": [], "hit": []}
+        for _ in range(ROUNDS):
+            for name in timings:
+                if name == "miss":
+                    response_cache.clear()
+                start = time.perf_counter()
+                self.client.get(LIST)
+                timings[name].append(time.perf_counter() - start)
+
+        for name, values in timings.items():
+            print(f"{name}: median {statistics.median(values) * 1000:.1f} ms")
+
+
+class TestChangeListener(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.listener = ChangeListener(
+            retry_interval=0.05, keepalive_interval=0.05, keepalive_timeout=0.05
+        )
+        self.flushed = 0
+
+        def flush():
+            self.flushed += 1
+
+        self.listener.subscribe(flush)
+        await self.listener.start()
+        self.addAsyncCleanup(self.listener.stop)
+
+    async def wait_for(self, condition, timeout: float = 5) -> None:
+        async with asyncio.timeout(timeout):
+            while not condition():
+                await asyncio.sleep(0.01)
+
+    async def test_half_open(self):
+        await self.wait_for(lambda: self.listener.connected)
+        self.assertEqual(self.flushed, 1)
+
+        async def unanswered(*args, **kwargs):
+            await asyncio.sleep(3600)
+
+        # a connection dropped without a FIN or RST never answers
+        with mock.patch.object(asyncpg.Connection, "fetchval", unanswered):
+            await self.wait_for(lambda: not self.listener.connected)
+            # flushed when lost, and again when connected
+            await self.wait_for(lambda: self.flushed >= 2)
+
+        await self.wait_for(lambda: self.listener.connected)
+        await asyncio.sleep(0.2)
+        self.assertTrue(self.listener.connected)
+
+
+if __name__ == "__main__":
+    unittest.main()
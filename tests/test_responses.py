@@ -0,0 +1,85 @@
+import asyncio
+import statistics
+import time
+import unittest
+from unittest import mock
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from src.core.middleware import request_contextvar
+from src.core.responses import PydanticResponse
+from src.main import app
+from tests.utils import DatabaseTestCase
+
+PATH = "/zaken/api/v1/zaken"
+ROUNDS = 50
+
+
+class TestPydanticResponse(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = self.enterContext(TestClient(app))
+
+        pages = []
+
+        def capture(content, *args, **kwargs):
+            pages.append(content)
+            return PydanticResponse(content, *args, **kwargs)
+
+        with mock.patch("src.api.components.zaken.router.PydanticResponse", capture):
+            self.response = self.client.get(PATH + "?pageSize=100")
+        self.assertEqual(self.response.status_code, 200)
+        self.page = pages[0]
+
+        # the hyperlinks are rendered from the request of the context
+        request = Request(
+            {
+                "type": "http",
+                "scheme": "http",
+                "server": ("testserver", 80),
+                "root_path": "",
+                "path": PATH,
+                "query_string": b"",
+                "headers": [(b"host", b"testserver")],
+            }
+        )
+        token = request_contextvar.set(request)
+        self.addCleanup(request_contextvar.reset, token)
+
+        route = next(route for route in app.routes if route.path == PATH)
+        self.response_field = route.response_field
+
+    def render_response_model(self) -> bytes:
+        """
+        The rendering of `self.page` by FastAPI from the `response_model`.
+        """
+        content = asyncio.run(
+            serialize_response(field=self.response_field, response_content=self.page)
+        )
+        return JSONResponse(content).body
+
+    def test_same_output(self):
+        self.assertEqual(self.response.content, self.render_response_model())
+
+    def test_items_per_second(self):
+        renderers = {
+            "response_model": self.render_response_model,
+            "PydanticResponse": lambda: PydanticResponse(self.page).body,
+        }
+        timings = {name: [] for name in renderers}
+        for _ in range(ROUNDS):
+            for name, render in renderers.items():
+                start = time.perf_counter()
+                render()
+                timings[name].append(time.perf_counter() - start)
+
+        for name, values in timings.items():
+            items_per_second = len(self.page.items) / statistics.median(values)
+            print(f"{name}: median {items_per_second:.0f} items/s")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+import httpx
+
+from src.api.components.zaken import router
+from src.core.admission import Limiter
+from src.core.changes import change_listener
+from src.core.responses import PydanticResponse
+from src.main import app
+from tests.utils import AsyncDatabaseTestCase, get_admission
+
+LIST = "/zaken/api/v1/zaken?pageSize=100"
+CONCURRENCY = 20
+
+
+class TestSingleFlight(AsyncDatabaseTestCase):
+    """
+    Runs without the lifespan of the app, so the response cache is bypassed.
+    """
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.client = await self.enterAsyncContext(
+            httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app, raise_app_exceptions=False),
+                base_url="http://test",
+            )
+        )
+
+        self.rendered = 0
+
+        def count(*args, **kwargs):
+            self.rendered += 1
+            return PydanticResponse(*args, **kwargs)
+
+        self.enterContext(mock.patch.object(router, "PydanticResponse", count))
+
+        # holds the routes until released
+        self.release = asyncio.Event()
+        paginate = router.count_paginate
+
+        async def held_paginate(*args, **kwargs):
+            await self.release.wait()
+            return await paginate(*args, **kwargs)
+
+        self.enterContext(mock.patch.object(router, "count_paginate", held_paginate))
+
+    async def start(self, url: str, count: int = CONCURRENCY, **headers) -> list:
+        tasks = [
+            asyncio.create_task(self.client.get(url, headers=headers))
+            for _ in range(count)
+        ]
+        # lets the requests reach the route
+        await asyncio.sleep(0.2)
+        return tasks
+
+    async def test_shared(self):
+        tasks = await self.start(LIST)
+        self.release.set()
+        responses = await asyncio.gather(*tasks)
+
+        self.assertEqual(self.rendered, 1)
+        self.assertEqual({response.status_code for response in responses}, {200})
+        self.assertEqual(len({response.content for response in responses}), 1)
+        self.assertEqual(len({response.headers["ETag"] for response in responses}), 1)
+
+        # nothing is kept once the response is complete
+        await self.client.get(LIST)
+        self.assertEqual(self.rendered, 2)
+
+    async def test_key(self):
+        tasks = await self.start(LIST)
+        tasks += await self.start(f"{LIST}&page=1", 1)
+        tasks += await self.start(LIST, 1, **{"Accept-Crs": "EPSG:28992"})
+        tasks += await self.start(LIST, 1, **{"If-None-Match": '"other"'})
+        self.release.set()
+        await asyncio.gather(*tasks)
+        self.assertEqual(self.rendered, 4)
+
+    async def test_change(self):
+        tasks = await self.start(LIST, 2)
+        change_listener.generation += 1
+        tasks += await self.start(LIST, 2)
+        self.release.set()
+        await asyncio.gather(*tasks)
+        self.assertEqual(self.rendered, 2)
+
+    async def test_failure(self):
+        paginate = router.count_paginate
+        calls = 0
+
+        async def failing_paginate(*args, **kwargs):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await self.release.wait()
+                raise RuntimeError("first request fails")
+            return await paginate(*args, **kwargs)
+
+        with mock.patch.object(router, "count_paginate", failing_paginate):
+            tasks = await self.start(LIST, 3)
+            self.release.set()
+            responses = await asyncio.gather(*tasks)
+        self.assertEqual(
+            sorted(response.status_code for response in responses), [200, 200, 500]
+        )
+
+
+class TestSingleFlightTiming(AsyncDatabaseTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.client = await self.enterAsyncContext(
+            httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://test"
+            )
+        )
+        # admits the whole burst of separate requests
+        self.enterContext(
+            mock.patch.object(
+                get_admission("zaken-list"), "limiter", Limiter(CONCURRENCY, 0, 0)
+            )
+        )
+
+    async def burst(self, urls: list[str]) -> float:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(self.client.get(url) for url in urls))
+        self.assertEqual({response.status_code for response in responses}, {200})
+        return time.perf_counter() - start
+
+    async def test_timing(self):
+        await self.client.get(LIST)
+        # distinct query parameters keep the requests apart
+        separate = await self.burst([f"{LIST}&n={n}" for n in range(CONCURRENCY)])
+        shared = await self.burst([LIST] * CONCURRENCY)
+        print(
+            f"{CONCURRENCY} concurrent requests: separate {separate * 1000:.0f} ms, "
+            f"shared {shared * 1000:.0f} ms"
+        )
+        self.assertLess(shared, separate)
+
+
+if __name__ == "__main__":
+    unittest.main()
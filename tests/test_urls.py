@@ -0,0 +1,66 @@
+import unittest
+import uuid
+
+from fastapi import Request
+from starlette.routing import NoMatchFound
+
+from src.api.urls import url_templates
+from src.main import app
+
+UUID = str(uuid.uuid4())
+
+ROUTES = (
+    ("zaak-detail", {"uuid": UUID}),
+    ("zaaktype-detail", {"uuid": UUID}),
+    ("eigenschappen-detail", {"zaak_uuid": UUID, "uuid": UUID}),
+    ("zaken-list", {}),
+)
+
+SCOPES = {
+    "host": {"headers": [(b"host", b"example.com")]},
+    "port": {"headers": [(b"host", b"example.com:8443")], "scheme": "https"},
+    "server": {"headers": [], "server": ("testserver", 8000)},
+    "root path": {"headers": [(b"host", b"example.com")], "root_path": "/api"},
+}
+
+
+def make_request(**scope) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/",
+            "root_path": "",
+            "query_string": b"",
+            "app": app,
+            "router": app.router,
+            **scope,
+        }
+    )
+
+
+class TestURLTemplates(unittest.TestCase):
+    def test_same_as_url_for(self):
+        for scope_name, scope in SCOPES.items():
+            for name, path_params in ROUTES:
+                with self.subTest(scope_name, name=name):
+                    request = make_request(**scope)
+                    self.assertEqual(
+                        url_templates.reverse(request, name, **path_params),
+                        str(request.url_for(name, **path_params)),
+                    )
+
+    def test_base_url_per_request(self):
+        request = make_request(**SCOPES["host"])
+        url_templates.reverse(request, "zaak-detail", uuid=UUID)
+        self.assertEqual(request.state.url_base, "http://example.com")
+
+    def test_unknown_name(self):
+        request = make_request(**SCOPES["host"])
+        with self.assertRaises(NoMatchFound):
+            url_templates.reverse(request, "unknown-detail", uuid=UUID)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import time
+import unittest
+
+import asyncpg
+
+from src.api.components.zaken.projection import projection
+from src.core.admission import Admission
+from src.core.database import engine
+from src.main import app
+
+DSN = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """
+    Test case using the engine of the app, whose pooled connections are bound
+    to the event loop of the test that opened them: they are dropped first.
+    """
+
+    def setUp(self):
+        super().setUp()
+        engine.sync_engine.dispose(close=False)
+
+
+class AsyncDatabaseTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    `DatabaseTestCase` running in an event loop of its own.
+    """
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        await engine.dispose(close=False)
+
+
+async def touch(table: str, key: str) -> None:
+    """
+    Write the first row of `table` by `key` without changing it, so the change
+    counter is bumped and the change listeners are notified as on any write.
+
+    The documents of the projection the write marks stale are marked fresh
+    again in the same transaction, as their zaken did not change.
+    """
+    connection = await asyncpg.connect(DSN)
+    try:
+        async with connection.transaction():
+            projected = await connection.fetchval(
+                "SELECT to_regclass($1) IS NOT NULL", projection.name
+            )
+            if projected:
+                await connection.execute(
+                    "CREATE TEMPORARY TABLE fresh ON COMMIT DROP AS "
+                    f"SELECT zaak_id FROM {projection.name} WHERE NOT stale"
+                )
+            await connection.execute(
+                f"UPDATE {table} SET {key} = {key} "
+                f"WHERE {key} = (SELECT min({key}) FROM {table})"
+            )
+            if projected:
+                await connection.execute(
+                    f"UPDATE {projection.name} SET stale = false FROM fresh "
+                    f"WHERE {projection.name}.zaak_id = fresh.zaak_id "
+                    f"AND {projection.name}.stale"
+                )
+    finally:
+        await connection.close()
+
+
+async def touch_zaak() -> None:
+    await touch("zaken_zaak", "identificatie_ptr_id")
+
+
+async def touch_zaaktype() -> None:
+    await touch("catalogi_zaaktype", "id")
+
+
+def wait_for(condition, timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def get_admission(name: str) -> Admission:
+    return next(
+        dependency.dependency
+        for route in app.routes
+        if route.name == name
+        for dependency in route.dependencies
+        if isinstance(dependency.dependency, Admission)
+    )